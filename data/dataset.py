@@ -0,0 +1,155 @@
+import bisect
+import glob
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from data.parquet_handler import Cancelled, data_columns, dictionary_columns, get_session, row_group_bytes
+from data.stats import footer_statistics, combine_statistics
+
+# Fragment footers and row groups are read on this many threads
+SCAN_THREADS = min(8, (os.cpu_count() or 1) * 2)
+
+def is_dataset_path(path):
+    return os.path.isdir(path) or glob.has_magic(path)
+
+def _glob_base_dir(pattern):
+    # Hive partitions are parsed relative to the last directory before any wildcard
+    parts = []
+    for part in pattern.replace('\\', '/').split('/'):
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    return '/'.join(parts) or '.'
+
+def _list_files(path):
+    if os.path.isdir(path):
+        return [os.path.join(root, name) for root, _, names in os.walk(path) for name in names]
+    return [p for p in glob.glob(path, recursive=True) if os.path.isfile(p)]
+
+def dataset_version(path):
+    """Cheap change detector for a dataset: file count, newest mtime and total size."""
+    stats = [os.stat(p) for p in _list_files(path)]
+    return (len(stats), max((s.st_mtime_ns for s in stats), default=0), sum(s.st_size for s in stats))
+
+class DatasetSession:
+    """A directory or glob of Parquet files, optionally Hive-partitioned, paged as one table.
+
+    Offers the same reading interface as ParquetSession. Row counts and the
+    row-group offset table come from the fragment footers, read in parallel;
+    no data pages are touched until a page is requested.
+    """
+    def __init__(self, path, read_dictionary=False, version=None):
+        self.file_path = path
+        self.memory_map = False
+        self.version = version if version is not None else dataset_version(path)
+        self._executor = ThreadPoolExecutor(max_workers=SCAN_THREADS, thread_name_prefix='fragment-scan')
+        self._dataset = self._discover(ds.ParquetFileFormat())
+
+        self.fragments = list(self._dataset.get_fragments())
+        # Parse every footer up front, in parallel; this is what makes pagination possible
+        self.fragment_metadata = list(self._executor.map(lambda fragment: fragment.metadata, self.fragments))
+
+        self.dictionary_columns = []
+        if read_dictionary and self.fragments:
+            self.dictionary_columns = dictionary_columns(self.fragment_metadata[0], self._dataset.schema)
+            if self.dictionary_columns:
+                read_options = ds.ParquetReadOptions(dictionary_columns=self.dictionary_columns)
+                self._dataset = self._discover(ds.ParquetFileFormat(read_options=read_options))
+                self.fragments = list(self._dataset.get_fragments())
+
+        self.schema = self._dataset.schema
+        self.columns = data_columns(self.schema)
+        self._row_groups = []
+        self.row_group_offsets = [0]
+        for index, metadata in enumerate(self.fragment_metadata):
+            for rg in range(metadata.num_row_groups):
+                self._row_groups.append((index, rg))
+                self.row_group_offsets.append(self.row_group_offsets[-1] + metadata.row_group(rg).num_rows)
+        self._column_statistics = None
+
+    def _discover(self, file_format):
+        if os.path.isdir(self.file_path):
+            return ds.dataset(self.file_path, format=file_format, partitioning='hive')
+        files = sorted(_list_files(self.file_path))
+        if not files:
+            raise FileNotFoundError(f"No files match {self.file_path}")
+        return ds.dataset(files, format=file_format, partitioning='hive',
+                          partition_base_dir=_glob_base_dir(self.file_path))
+
+    @property
+    def num_rows(self):
+        return self.row_group_offsets[-1]
+
+    @property
+    def num_row_groups(self):
+        return len(self._row_groups)
+
+    def column_statistics(self):
+        """Whole-dataset column statistics merged from every fragment footer."""
+        if self._column_statistics is None:
+            parts = [footer_statistics(metadata, self.columns) for metadata in self.fragment_metadata]
+            self._column_statistics = combine_statistics(parts, self.columns)
+        return self._column_statistics
+
+    def footer_metadata(self):
+        return self.fragment_metadata
+
+    def dataset(self):
+        return self._dataset
+
+    def read_range(self, offset, limit, columns=None, progress=None, cancel=None):
+        """Decode the row groups overlapping [offset, offset + limit), one fragment per thread."""
+        start = max(offset, 0)
+        stop = min(start + limit, self.num_rows)
+        names = self.columns if columns is None else columns
+        if start >= stop:
+            return pa.schema([self.schema.field(name) for name in names], metadata=self.schema.metadata).empty_table()
+        first = bisect.bisect_right(self.row_group_offsets, start) - 1
+        last = bisect.bisect_left(self.row_group_offsets, stop)
+        by_fragment = OrderedDict()
+        for index, rg in self._row_groups[first:last]:
+            by_fragment.setdefault(index, []).append(rg)
+
+        def read(item):
+            index, row_groups = item
+            if cancel is not None and cancel.is_set():
+                raise Cancelled()
+            fragment = self.fragments[index].subset(row_group_ids=row_groups)
+            table = fragment.to_table(columns=names, schema=self.schema)
+            if progress is not None:
+                metadata = self.fragment_metadata[index]
+                progress(len(row_groups), sum(row_group_bytes(metadata, rg, names) for rg in row_groups))
+            return table
+
+        table = pa.concat_tables(self._executor.map(read, by_fragment.items()))
+        return table.slice(start - self.row_group_offsets[first], stop - start)
+
+    def read_all(self):
+        return self._dataset.to_table(columns=self.columns)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+_datasets = {}
+_datasets_lock = threading.Lock()
+
+def open_source(path, memory_map=False, read_dictionary=False):
+    """Open a single Parquet file, a directory of them or a glob, reusing cached sessions."""
+    if not is_dataset_path(path):
+        return get_session(path, memory_map=memory_map, read_dictionary=read_dictionary)
+    key = (os.path.abspath(path), read_dictionary)
+    version = dataset_version(path)
+    with _datasets_lock:
+        cached = _datasets.get(key)
+        if cached is not None and cached.version == version:
+            return cached
+        if cached is not None:
+            cached.close()
+        session = DatasetSession(path, read_dictionary=read_dictionary, version=version)
+        _datasets[key] = session
+        return session
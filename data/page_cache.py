@@ -0,0 +1,118 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from data.parquet_handler import ParquetPage, page_key
+
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+# Row groups longer than this are split into several blocks for the continuous view
+MAX_BLOCK_ROWS = 65536
+
+def block_bounds(row_group_offsets, max_rows=MAX_BLOCK_ROWS):
+    """First row of every block plus the row count, aligned to row groups and split where they are long."""
+    bounds = [0]
+    for start, stop in zip(row_group_offsets, row_group_offsets[1:]):
+        bounds.extend(range(start + max_rows, stop, max_rows))
+        if stop > bounds[-1]:
+            bounds.append(stop)
+    return bounds
+
+class PageCache:
+    """LRU cache of ParquetPage objects bounded by the memory of their decoded columns.
+
+    The budget counts the Arrow arrays of each page only. The pandas frame a
+    window builds for pandas-only features (MainWindow.materialize_page) is
+    held by the window, not by the page, so it is not counted: at most one
+    such frame, for the page on screen, comes on top of max_bytes.
+    """
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._pages
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pages)
+
+    def page(self, session, offset, limit, count=True):
+        """Return the cached page for this range, creating an empty one on a miss.
+
+        Only lookups made with count=True (the page the user asked for) are
+        reflected in the hit/miss counters; prefetches are not.
+        """
+        key = page_key(session, offset, limit)
+        with self._lock:
+            page = self._pages.get(key)
+            if page is not None:
+                self._pages.move_to_end(key)
+                if count:
+                    self.hits += 1
+                return page
+            if count:
+                self.misses += 1
+            page = ParquetPage(session, offset, limit)
+            self._pages[key] = page
+        self.trim()
+        return page
+
+    def nbytes(self):
+        with self._lock:
+            return sum(page.nbytes() for page in self._pages.values())
+
+    def trim(self):
+        """Evict least recently used pages until the byte budget is met, always keeping the newest."""
+        with self._lock:
+            total = sum(page.nbytes() for page in self._pages.values())
+            while total > self.max_bytes and len(self._pages) > 1:
+                _, page = self._pages.popitem(last=False)
+                total -= page.nbytes()
+
+    def drop_path(self, file_path):
+        """Forget every page read from file_path, whatever its version; used once the file is rewritten."""
+        path = os.path.abspath(file_path)
+        with self._lock:
+            for key in [key for key in self._pages if key[0] == path]:
+                del self._pages[key]
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'pages': len(self._pages),
+                    'bytes': sum(page.nbytes() for page in self._pages.values())}
+
+class PagePrefetcher:
+    """Decodes the pages around the one on screen on a background thread."""
+    def __init__(self, cache, depth=1):
+        self.cache = cache
+        self.depth = depth
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='page-prefetch')
+        self._pending = []
+
+    def prefetch(self, session, offset, limit, columns):
+        """Queue pages N+1, N-1, N+2, N-2, ... up to depth, decoding only the given columns."""
+        for future in self._pending:
+            future.cancel()
+        self._pending = []
+        for distance in range(1, self.depth + 1):
+            for neighbour in (offset + distance * limit, offset - distance * limit):
+                if 0 <= neighbour < session.num_rows:
+                    self._pending.append(self._executor.submit(self._warm, session, neighbour, limit, list(columns)))
+
+    def _warm(self, session, offset, limit, columns):
+        self.cache.page(session, offset, limit, count=False).load(columns)
+        self.cache.trim()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,34 +1,283 @@
+import bisect
+import os
+import threading
+
 import pyarrow as pa
+import pyarrow.dataset as ds
 import pyarrow.parquet as pq
 import pandas as pd
 
-def load_parquet(file_path, offset=None, limit=None):
-    if offset is not None and limit is not None:
-        pf = pq.ParquetFile(file_path)
-        # Read the whole table into Arrow memory (efficient), then slice and convert to Pandas (expensive part minimized)
-        # For massive files larger than RAM, we would need iter_batches, but this suffices for V1 pagination
-        table = pf.read()
-        df = table.slice(offset, limit).to_pandas()
+from data.stats import footer_statistics
+
+def row_group_offsets(metadata):
+    """Return the first row of every row group, plus the total row count as a sentinel."""
+    offsets = [0]
+    for i in range(metadata.num_row_groups):
+        offsets.append(offsets[-1] + metadata.row_group(i).num_rows)
+    return offsets
+
+class Cancelled(Exception):
+    """Raised between row groups or batches when a long read is cancelled."""
+
+def row_group_bytes(metadata, rg, columns=None):
+    """Uncompressed size of a row group, or of just the given top-level columns in it."""
+    row_group = metadata.row_group(rg)
+    if columns is None:
+        return row_group.total_byte_size
+    wanted = set(columns)
+    return sum(row_group.column(i).total_uncompressed_size for i in range(row_group.num_columns)
+               if row_group.column(i).path_in_schema.split('.')[0] in wanted)
+
+def read_row_range(pf, offsets, offset, limit, columns=None, progress=None, cancel=None):
+    """Decode only the row groups that overlap [offset, offset + limit) and slice inside them.
+
+    With progress, row groups are decoded one at a time and progress(row_groups, nbytes)
+    is called after each; cancel is a threading.Event checked in between.
+    """
+    start = max(offset, 0)
+    stop = min(start + limit, offsets[-1])
+    if start >= stop:
+        schema = pf.schema_arrow
+        if columns is not None:
+            schema = pa.schema([schema.field(name) for name in columns], metadata=schema.metadata)
+        return schema.empty_table()
+    first = bisect.bisect_right(offsets, start) - 1
+    last = bisect.bisect_left(offsets, stop)
+    if progress is None and cancel is None:
+        table = pf.read_row_groups(range(first, last), columns=columns)
     else:
-        table = pq.read_table(file_path)
-        df = table.to_pandas()
-    
+        tables = []
+        for rg in range(first, last):
+            if cancel is not None and cancel.is_set():
+                raise Cancelled()
+            tables.append(pf.read_row_group(rg, columns=columns))
+            if progress is not None:
+                progress(1, row_group_bytes(pf.metadata, rg, columns))
+        table = pa.concat_tables(tables)
+    return table.slice(start - offsets[first], stop - start)
+
+def _to_pandas(table):
+    df = table.to_pandas()
     # Convert string dtypes to object for duckdb compatibility / general display
     for col in df.columns:
         if df[col].dtype == 'string':
             df[col] = df[col].astype('object')
     return df
 
-def get_row_count(file_path):
-    pf = pq.ParquetFile(file_path)
-    return pf.metadata.num_rows
+def data_columns(schema):
+    """Column names of an Arrow schema, without the index columns pandas stored alongside them."""
+    pandas_meta = schema.pandas_metadata or {}
+    index_columns = {c for c in pandas_meta.get('index_columns', []) if isinstance(c, str)}
+    return [name for name in schema.names if name not in index_columns]
+
+# A column chunk whose dictionary page takes less than this share of its bytes is low-cardinality
+DICTIONARY_SHARE_LIMIT = 0.5
+
+def dictionary_columns(metadata, schema):
+    """String columns that are compactly dictionary encoded in every row group.
+
+    Writers dictionary encode almost everything and silently fall back to plain pages
+    once a dictionary grows too big, so the size of the dictionary page relative to
+    the whole chunk is what tells a low-cardinality column apart.
+    """
+    if metadata.num_row_groups == 0:
+        return []
+    leaves = {metadata.schema.column(i).path: i for i in range(metadata.num_columns)}
+    result = []
+    for name in data_columns(schema):
+        field_type = schema.field(name).type
+        if name not in leaves or not (pa.types.is_string(field_type) or pa.types.is_large_string(field_type)):
+            continue
+        for rg in range(metadata.num_row_groups):
+            chunk = metadata.row_group(rg).column(leaves[name])
+            if not chunk.has_dictionary_page or chunk.total_compressed_size == 0:
+                break
+            dictionary_bytes = chunk.data_page_offset - chunk.dictionary_page_offset
+            if dictionary_bytes > DICTIONARY_SHARE_LIMIT * chunk.total_compressed_size:
+                break
+        else:
+            result.append(name)
+    return result
+
+class ParquetSession:
+    """An open Parquet file with its parsed footer, reused across page turns, stats and queries.
+
+    With read_dictionary, low-cardinality string columns are decoded as Arrow
+    dictionary arrays, which become pandas Categoricals.
+    """
+    def __init__(self, file_path, memory_map=False, read_dictionary=False):
+        stat = os.stat(file_path)
+        self.file_path = file_path
+        self.memory_map = memory_map
+        self.version = (stat.st_mtime_ns, stat.st_size)
+        self.parquet_file = pq.ParquetFile(file_path, memory_map=memory_map)
+        self.dictionary_columns = []
+        if read_dictionary:
+            self.dictionary_columns = dictionary_columns(self.parquet_file.metadata, self.parquet_file.schema_arrow)
+            if self.dictionary_columns:
+                # Reopen with the already parsed footer instead of reading it again
+                metadata = self.parquet_file.metadata
+                self.parquet_file.close()
+                self.parquet_file = pq.ParquetFile(file_path, memory_map=memory_map, metadata=metadata,
+                                                   read_dictionary=self.dictionary_columns)
+        self.metadata = self.parquet_file.metadata
+        self.schema = self.parquet_file.schema_arrow
+        self.columns = data_columns(self.schema)
+        self.row_group_offsets = row_group_offsets(self.metadata)
+        self._column_statistics = None
+        self._dataset = None
+        # ParquetFile readers are not safe to share between threads
+        self._lock = threading.Lock()
+
+    @property
+    def num_rows(self):
+        return self.metadata.num_rows
+
+    @property
+    def num_row_groups(self):
+        return self.metadata.num_row_groups
+
+    def column_statistics(self):
+        """Whole-file column statistics from the footer, computed once per session."""
+        if self._column_statistics is None:
+            self._column_statistics = footer_statistics(self.metadata, self.columns)
+        return self._column_statistics
+
+    def footer_metadata(self):
+        return [self.metadata]
+
+    def dataset(self):
+        """A pyarrow dataset over this file for filtered scans, created once per session."""
+        if self._dataset is None:
+            read_options = ds.ParquetReadOptions(dictionary_columns=self.dictionary_columns)
+            self._dataset = ds.dataset(self.file_path, format=ds.ParquetFileFormat(read_options=read_options))
+        return self._dataset
+
+    def read_range(self, offset, limit, columns=None, progress=None, cancel=None):
+        with self._lock:
+            return read_row_range(self.parquet_file, self.row_group_offsets, offset, limit, columns, progress, cancel)
+
+    def read_all(self):
+        with self._lock:
+            return self.parquet_file.read(use_pandas_metadata=True)
+
+    def close(self):
+        self.parquet_file.close()
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def get_session(file_path, memory_map=False, read_dictionary=False):
+    """Return the cached session for file_path, reopening it if the file changed on disk."""
+    key = (os.path.abspath(file_path), memory_map, read_dictionary)
+    stat = os.stat(file_path)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None or session.version != (stat.st_mtime_ns, stat.st_size):
+            if session is not None:
+                session.close()
+            session = ParquetSession(file_path, memory_map=memory_map, read_dictionary=read_dictionary)
+            _sessions[key] = session
+        return session
+
+def close_session(file_path):
+    """Drop every cached session for file_path so the file can be overwritten."""
+    path = os.path.abspath(file_path)
+    with _sessions_lock:
+        for key in [key for key in _sessions if key[0] == path]:
+            _sessions.pop(key).close()
+
+class ParquetPage:
+    """One page of a session whose columns are decoded on first use and then cached.
+
+    Columns are kept as Arrow arrays so the table can display them without a
+    pandas conversion; to_pandas() is only needed for pandas-specific features.
+    """
+    def __init__(self, session, offset, limit):
+        self.session = session
+        self.offset = offset
+        self.limit = limit
+        self.columns = list(session.columns)
+        self.num_rows = max(0, min(limit, session.num_rows - offset))
+        self._decoded = {}
+        self._nbytes = {}
+        # Pages may be warmed up by the prefetcher while the UI reads them
+        self._lock = threading.Lock()
+
+    @property
+    def key(self):
+        return page_key(self.session, self.offset, self.limit)
+
+    @property
+    def schema(self):
+        return self.session.schema
+
+    def is_loaded(self, name):
+        return name in self._decoded
+
+    def load(self, names, progress=None, cancel=None):
+        """Decode every column in names that is not cached yet, in a single read."""
+        with self._lock:
+            missing = [name for name in dict.fromkeys(names) if name not in self._decoded]
+            if not missing:
+                return []
+            table = self.session.read_range(self.offset, self.limit, columns=missing, progress=progress, cancel=cancel)
+            for name in missing:
+                self._decoded[name] = table.column(name).combine_chunks()
+                self._nbytes[name] = self._decoded[name].nbytes
+            return missing
+
+    def nbytes(self):
+        """Approximate memory held by the decoded columns, measured on the Arrow side."""
+        # Copy first: a prefetch thread may be adding columns meanwhile
+        return sum(self._nbytes.copy().values())
+
+    def column(self, name):
+        # Skip the lock when loaded; a prefetch may hold it while decoding other columns
+        if name not in self._decoded:
+            self.load([name])
+        return self._decoded[name]
+
+    def value(self, row, name):
+        return self.column(name)[row].as_py()
+
+    def to_table(self):
+        self.load(self.columns)
+        schema = pa.schema([self.schema.field(name) for name in self.columns], metadata=self.schema.metadata)
+        return pa.Table.from_arrays([self._decoded[name] for name in self.columns], schema=schema)
+
+    def to_pandas(self):
+        return _to_pandas(self.to_table()).reset_index(drop=True)
+
+def page_key(session, offset, limit):
+    return (os.path.abspath(session.file_path), session.version, tuple(session.dictionary_columns), offset, limit)
+
+def load_parquet(file_path, offset=None, limit=None, memory_map=False, columns=None, read_dictionary=False):
+    session = get_session(file_path, memory_map=memory_map, read_dictionary=read_dictionary)
+    if offset is not None and limit is not None:
+        # Map the page onto row groups so page latency depends on the page size, not the file size
+        table = session.read_range(offset, limit, columns=columns)
+    elif columns is not None:
+        table = session.read_range(0, session.num_rows, columns=columns)
+    else:
+        table = session.read_all()
+    return _to_pandas(table)
+
+def get_row_count(file_path, memory_map=False):
+    return get_session(file_path, memory_map=memory_map).num_rows
 
 def save_parquet(df, file_path):
+    close_session(file_path)
     table = pa.Table.from_pandas(df)
     pq.write_table(table, file_path)
 
+def get_field_metadata(schema, name):
+    """Header metadata taken from the Arrow schema alone, without decoding any data."""
+    field = schema.field(name)
+    return {'type': str(field.type), 'nullable': field.nullable}
+
 def get_metadata(df, col_index):
     col_name = df.columns[col_index]
     dtype = str(df[col_name].dtype)
     nullable = df[col_name].isnull().any()
-    return {'type': dtype, 'nullable': nullable}
\ No newline at end of file
+    return {'type': dtype, 'nullable': nullable}
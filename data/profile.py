@@ -0,0 +1,416 @@
+import json
+import math
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from data.sidecar import atomic_write, cache_dir, check_cancel, fingerprint, sidecar_path
+from utils.formatting import is_numeric
+
+# 2**14 registers per distinct-count sketch: a standard error of 1.04 / sqrt(2**14), about 0.8%.
+# At least 11, so the 64 - precision bits left for a register's rank fit a double exactly
+HLL_PRECISION = 14
+# Items per compactor of the quantile sketches; the rank error shrinks roughly as 1 / k
+KLL_K = 200
+# Counters kept by the heavy-hitter summaries, and how many of them are shown
+TOP_COUNTERS = 64
+TOP_VALUES = 10
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+# Row groups profiled at once, each into sketches of its own that are then merged
+PROFILE_THREADS = min(4, os.cpu_count() or 1)
+# Strings are hashed this many values, and about this many bytes, at a time
+HASH_SLICE_ROWS = 65536
+HASH_SLICE_BYTES = 256 * 1024
+FORMAT_VERSION = 1
+
+def profile_path(session, profile_dir=None):
+    return sidecar_path(session, profile_dir or cache_dir('profile'), '.profile.json')
+
+def profile_fingerprint(session):
+    return fingerprint(session, format=FORMAT_VERSION)
+
+def _mix(hashes):
+    # splitmix64's finalizer, so every input bit affects every output bit
+    hashes = hashes ^ (hashes >> np.uint64(30))
+    hashes = hashes * np.uint64(0xBF58476D1CE4E5B9)
+    hashes = hashes ^ (hashes >> np.uint64(27))
+    hashes = hashes * np.uint64(0x94D049BB133111EB)
+    return hashes ^ (hashes >> np.uint64(31))
+
+def _hash_slice(data, offsets):
+    # Every byte of the slice gets a uint64 term, hence the bounded slices
+    lengths = np.diff(offsets)
+    hashes = np.zeros(len(lengths), dtype=np.uint64)
+    total = int(offsets[-1] - offsets[0])
+    if total:
+        starts = offsets[:-1] - offsets[0]
+        positions = np.arange(total) - np.repeat(starts, lengths)
+        # Powers of an odd multiplier, wrapping around at 2**64 like the sum
+        powers = np.cumprod(np.full(int(lengths.max()), 0x100000001B3, dtype=np.uint64))
+        terms = (data[offsets[0]:offsets[-1]].astype(np.uint64) + np.uint64(1)) * powers[positions]
+        nonempty = lengths > 0
+        hashes[nonempty] = np.add.reduceat(terms, starts[nonempty])
+    return _mix(hashes ^ _mix(lengths.astype(np.uint64)))
+
+def _hash_binary(values):
+    """Polynomial hash of each (non-null) binary value, modulo 2**64.
+
+    Values are hashed HASH_SLICE_ROWS at a time, fewer when they hold more
+    than HASH_SLICE_BYTES, so the working arrays stay small on wide columns.
+    """
+    offsets = np.frombuffer(values.buffers()[1], dtype=np.int64)[values.offset:values.offset + len(values) + 1]
+    buffer = values.buffers()[2]
+    data = np.frombuffer(buffer, dtype=np.uint8) if buffer is not None else np.empty(0, dtype=np.uint8)
+    hashes = np.empty(len(values), dtype=np.uint64)
+    start = 0
+    while start < len(values):
+        stop = int(np.searchsorted(offsets, offsets[start] + HASH_SLICE_BYTES, side='right')) - 1
+        # At least one value, however long
+        stop = min(max(stop, start + 1), start + HASH_SLICE_ROWS, len(values))
+        hashes[start:stop] = _hash_slice(data, offsets[start:stop + 1])
+        start = stop
+    return hashes
+
+def hash_values(values):
+    """64-bit hashes of the values of an Arrow array without nulls, or None for types that can't be hashed."""
+    value_type = values.type
+    if pa.types.is_dictionary(value_type):
+        hashes = hash_values(values.dictionary)
+        return None if hashes is None else hashes[values.indices.to_numpy(zero_copy_only=False)]
+    try:
+        if pa.types.is_floating(value_type):
+            # + 0.0 turns -0.0 into 0.0, which is the same value
+            bits = (values.to_numpy(zero_copy_only=False).astype(np.float64) + 0.0).view(np.uint64)
+        elif pa.types.is_integer(value_type) or pa.types.is_boolean(value_type) or pa.types.is_temporal(value_type):
+            bits = values.to_numpy(zero_copy_only=False).astype(np.int64).view(np.uint64)
+        else:
+            # Strings and binary as they are; decimals and the rest by their text
+            if not (pa.types.is_string(value_type) or pa.types.is_large_string(value_type)
+                    or pa.types.is_binary(value_type) or pa.types.is_large_binary(value_type)):
+                values = pc.cast(values, pa.string())
+            return _hash_binary(pc.cast(values, pa.large_binary()))
+    except (pa.ArrowNotImplementedError, pa.ArrowInvalid, TypeError, ValueError):
+        return None
+    return _mix(bits)
+
+def _bit_length(values):
+    # Exact as long as the values fit in a double's 53-bit mantissa; frexp(0) gives 0
+    return np.frexp(values.astype(np.float64))[1]
+
+class HyperLogLog:
+    """Distinct-count sketch (Flajolet et al.): each register keeps the longest run of leading zeros
+    seen among the hashes routed to it. Merging takes the larger register of each pair."""
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self):
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add(self, hashes):
+        if not len(hashes):
+            return
+        rest_bits = 64 - self.precision
+        index = (hashes >> np.uint64(rest_bits)).astype(np.int64)
+        rest = hashes & np.uint64((1 << rest_bits) - 1)
+        np.maximum.at(self.registers, index, (rest_bits - _bit_length(rest) + 1).astype(np.uint8))
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Few values: counting empty registers is more accurate
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+class KllSketch:
+    """Quantile sketch (Karnin, Lang and Liberty) of floats.
+
+    Level h holds items that each stand for 2**h values. A level over its
+    capacity is sorted and every other item, from a random start, moves up a
+    level. Capacities shrink by 2/3 per level below the top, so the sketch
+    stays small while the rank error stays near 2.3 / k**0.97 (99% confidence).
+    """
+    def __init__(self, k=KLL_K, seed=0):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def rank_error(self):
+        return 2.296 / self.k ** 0.9723
+
+    def _capacity(self, level):
+        return max(int(math.ceil(self.k * (2 / 3) ** (len(self.levels) - level - 1))), 2)
+
+    def add(self, values):
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        self.n += other.n
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(self.levels[level])
+                # An odd item out stays behind for the next compaction
+                kept = items[len(items) - len(items) % 2:]
+                promoted = items[int(self._rng.integers(2)):len(items) - len(kept):2]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                self.levels[level] = kept
+            level += 1
+
+    def quantiles(self, fractions):
+        items = np.concatenate(self.levels)
+        if not len(items):
+            return [None] * len(fractions)
+        weights = np.concatenate([np.full(len(level_items), 2 ** level) for level, level_items in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        cumulative = np.cumsum(weights[order])
+        positions = np.searchsorted(cumulative, np.asarray(fractions) * cumulative[-1])
+        return items[order][np.minimum(positions, len(items) - 1)].tolist()
+
+class HeavyHitters:
+    """Misra-Gries summary of the most frequent values: at most `counters` values, each with a count that
+    is low by no more than `error`. Merging adds the counts and subtracts the (counters+1)-th largest."""
+    def __init__(self, counters=TOP_COUNTERS):
+        self.counters = counters
+        self.counts = {}
+        self.error = 0
+
+    def add(self, values):
+        """Count the values of an Arrow array without nulls."""
+        counted = pc.value_counts(values)
+        uniques, counts = counted.field('values'), counted.field('counts').to_numpy()
+        if pa.types.is_dictionary(uniques.type):
+            uniques = uniques.dictionary_decode()
+        # Values outside the batch's top counters+1 would be cut by the merge anyway, unless already counted
+        wanted = np.zeros(len(counts), dtype=bool)
+        if len(counts) > self.counters + 1:
+            wanted[np.argpartition(-counts, self.counters)[:self.counters + 1]] = True
+        else:
+            wanted[:] = True
+        if self.counts:
+            try:
+                wanted |= pc.is_in(uniques, value_set=pa.array(list(self.counts), type=uniques.type)).to_numpy(zero_copy_only=False)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                wanted[:] = True
+        positions = np.flatnonzero(wanted)
+        self._merge(dict(zip(uniques.take(pa.array(positions)).to_pylist(), counts[positions].tolist())), 0)
+
+    def merge(self, other):
+        self._merge(other.counts, other.error)
+
+    def _merge(self, counts, error):
+        merged = Counter(self.counts)
+        merged.update(counts)
+        self.error += error
+        if len(merged) > self.counters:
+            threshold = sorted(merged.values(), reverse=True)[self.counters]
+            merged = {value: count - threshold for value, count in merged.items() if count > threshold}
+            self.error += threshold
+        self.counts = dict(merged)
+
+    def top(self, count=TOP_VALUES):
+        return sorted(self.counts.items(), key=lambda item: -item[1])[:count]
+
+def _plain(value):
+    # Numbers stay numbers in the sidecar; everything else is kept as its text
+    if isinstance(value, (bool, int, float)) or value is None:
+        return value
+    return str(value)
+
+class ColumnSketch:
+    """Exact counts, min, max and mean plus the distinct, quantile and frequent-value sketches of a column."""
+    def __init__(self, value_type):
+        self.value_type = value_type
+        self.numeric = is_numeric(value_type)
+        self.count = self.nulls = 0
+        self.total = 0.0
+        self.min = self.max = None
+        self.distinct = HyperLogLog()
+        self.quantiles = KllSketch() if self.numeric else None
+        self.frequent = HeavyHitters()
+
+    def add(self, values):
+        """Add an Arrow array or chunked array of the column's values."""
+        chunks = values.chunks if isinstance(values, pa.ChunkedArray) else [values]
+        for chunk in chunks:
+            self.nulls += chunk.null_count
+            chunk = chunk.drop_null()
+            if not len(chunk):
+                continue
+            self.count += len(chunk)
+            self._add_bounds(chunk)
+            if self.numeric:
+                plain = chunk.dictionary_decode() if pa.types.is_dictionary(chunk.type) else chunk
+                numbers = plain.to_numpy(zero_copy_only=False).astype(np.float64)
+                numbers = numbers[~np.isnan(numbers)]
+                self.total += float(numbers.sum())
+                self.quantiles.add(numbers)
+            if self.distinct is not None:
+                hashes = hash_values(chunk)
+                if hashes is None:
+                    self.distinct = None
+                else:
+                    self.distinct.add(hashes)
+            if self.frequent is not None:
+                try:
+                    self.frequent.add(chunk)
+                except (pa.ArrowNotImplementedError, pa.ArrowInvalid, TypeError):
+                    self.frequent = None
+
+    def _add_bounds(self, chunk):
+        try:
+            bounds = pc.min_max(chunk)
+            self._bound(bounds['min'].as_py(), bounds['max'].as_py())
+        except (pa.ArrowNotImplementedError, pa.ArrowInvalid, TypeError):
+            pass
+
+    def _bound(self, low, high):
+        if low is None:
+            return
+        try:
+            self.min = low if self.min is None or low < self.min else self.min
+            self.max = high if self.max is None or high > self.max else self.max
+        except TypeError:
+            self.min = self.max = None
+
+    def merge(self, other):
+        self.count += other.count
+        self.nulls += other.nulls
+        self.total += other.total
+        self._bound(other.min, other.max)
+        if self.distinct is not None:
+            if other.distinct is None:
+                self.distinct = None
+            else:
+                self.distinct.merge(other.distinct)
+        if self.quantiles is not None:
+            self.quantiles.merge(other.quantiles)
+        if self.frequent is not None:
+            if other.frequent is None:
+                self.frequent = None
+            else:
+                self.frequent.merge(other.frequent)
+
+    def report(self):
+        """The column's profile as plain JSON-friendly values, with the error bound of each estimate."""
+        entry = {'type': str(self.value_type), 'count': self.count, 'nulls': self.nulls,
+                 'min': _plain(self.min), 'max': _plain(self.max)}
+        if self.numeric:
+            entry['mean'] = self.total / self.quantiles.n if self.quantiles.n else None
+            entry['quantiles'] = dict(zip((str(q) for q in QUANTILES), self.quantiles.quantiles(QUANTILES)))
+            entry['quantile_rank_error'] = self.quantiles.rank_error
+        if self.distinct is not None:
+            # Never more than the number of values, or than the integers between min and max
+            distinct = min(self.distinct.estimate(), self.count)
+            if isinstance(self.min, int) and isinstance(self.max, int) and not isinstance(self.min, bool):
+                distinct = min(distinct, self.max - self.min + 1)
+            entry['distinct'] = distinct
+            entry['distinct_error'] = self.distinct.relative_error
+        if self.frequent is not None:
+            entry['top'] = [[_plain(value), count] for value, count in self.frequent.top()]
+            entry['top_error'] = self.frequent.error
+        return entry
+
+class FileProfile:
+    """Whole-file profile from one pass over every row group, stored as a JSON sidecar.
+
+    Each row group is read from the session's dataset and profiled into
+    sketches of its own on a small thread pool, then merged into the running
+    totals, so the pass decodes row groups in parallel, costs one decode of the
+    file and memory that does not grow with it. Distinct counts come from
+    HyperLogLog, quantiles from KLL and frequent values from Misra-Gries,
+    each reported with its error bound.
+    """
+    def __init__(self, meta, columns, path=None):
+        self.meta = meta
+        self.columns = columns
+        self.path = path
+
+    def is_current(self, session):
+        return self.meta['fingerprint'] == profile_fingerprint(session)
+
+    @classmethod
+    def build(cls, session, path=None, progress=None, cancel=None):
+        """Profile every row group of session; progress(rows_done, num_rows) follows each one."""
+        started = time.time()
+        dataset = session.dataset()
+        # One fragment per row group; unlike session.read_range(), which holds the session's
+        # lock, fragments are decoded by the worker threads side by side
+        row_groups = [row_group for fragment in dataset.get_fragments() for row_group in fragment.split_by_row_group()]
+        sketches = {name: ColumnSketch(session.schema.field(name).type) for name in session.columns}
+
+        def profile(row_group):
+            check_cancel(cancel)
+            table = row_group.to_table(schema=dataset.schema, columns=session.columns)
+            part = {}
+            for name in session.columns:
+                check_cancel(cancel)
+                part[name] = ColumnSketch(session.schema.field(name).type)
+                part[name].add(table.column(name))
+            return table.num_rows, part
+
+        done = 0
+        with ThreadPoolExecutor(max_workers=PROFILE_THREADS, thread_name_prefix='profile') as executor:
+            # A bounded window, so only a few decoded row groups are held at once
+            for first in range(0, len(row_groups), PROFILE_THREADS * 2):
+                for rows, part in executor.map(profile, row_groups[first:first + PROFILE_THREADS * 2]):
+                    for name, sketch in part.items():
+                        sketches[name].merge(sketch)
+                    done += rows
+                    if progress is not None:
+                        progress(done, session.num_rows)
+        meta = {'fingerprint': profile_fingerprint(session), 'num_rows': session.num_rows,
+                'created': time.time(), 'seconds': time.time() - started}
+        profile = cls(meta, {name: sketch.report() for name, sketch in sketches.items()}, path)
+        if path is not None:
+            profile.save(path)
+        return profile
+
+    def save(self, path):
+        with atomic_write(path) as partial, open(partial, 'w', encoding='utf-8') as f:
+            json.dump({'meta': self.meta, 'columns': self.columns}, f)
+        self.path = path
+
+    @classmethod
+    def load(cls, session, path):
+        """The sidecar at path, or None when it is missing, unreadable or for another version of the file."""
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            profile = cls(data['meta'], data['columns'], path)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return profile if profile.is_current(session) else None
+
+def open_profile(session, profile_dir=None, build=False, progress=None, cancel=None):
+    """The saved profile of session, building (and saving) it when missing or stale if build is set."""
+    path = profile_path(session, profile_dir)
+    profile = FileProfile.load(session, path)
+    if profile is None and build:
+        profile = FileProfile.build(session, path, progress=progress, cancel=cancel)
+    return profile
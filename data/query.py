@@ -0,0 +1,204 @@
+import ast
+import io
+import os
+import re
+import tokenize
+from concurrent.futures import ThreadPoolExecutor
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from data.parquet_handler import Cancelled
+from data.spill import SpilledResult
+
+# Row groups are filtered on this many threads, and this many are in flight at once
+SCAN_THREADS = min(8, (os.cpu_count() or 1) * 2)
+SCAN_WINDOW = SCAN_THREADS * 2
+
+class UnsupportedQuery(ValueError):
+    """The pandas query uses syntax that has no pyarrow.dataset equivalent."""
+
+_COMPARISONS = {
+    ast.Eq: lambda a, b: a == b,
+    ast.NotEq: lambda a, b: a != b,
+    ast.Lt: lambda a, b: a < b,
+    ast.LtE: lambda a, b: a <= b,
+    ast.Gt: lambda a, b: a > b,
+    ast.GtE: lambda a, b: a >= b,
+}
+# Comparison to use when the literal is on the left: 5 < x  ->  x > 5
+_MIRRORED = {ast.Eq: ast.Eq, ast.NotEq: ast.NotEq, ast.Lt: ast.Gt, ast.LtE: ast.GtE, ast.Gt: ast.Lt, ast.GtE: ast.LtE}
+_NULL_CHECKS = {'isnull': True, 'isna': True, 'notnull': False, 'notna': False}
+
+def normalize_query(query):
+    """Canonical text for a query so equivalent spellings share cache entries."""
+    return re.sub(r'\s+', ' ', query).strip()
+
+def to_arrow_filter(query, columns):
+    """Translate a pandas df.query() expression into a pyarrow.dataset filter expression.
+
+    Supports comparisons (including chained ones), and/or/not, &/|/~, in/not in
+    with literal lists, and .isnull()/.notnull() on columns. Column names with
+    spaces can be quoted with backticks as in pandas.
+    """
+    quoted = {}
+    def _quote(match):
+        placeholder = f'__column_{len(quoted)}__'
+        quoted[placeholder] = match.group(1)
+        return placeholder
+    source = re.sub(r'`([^`]*)`', _quote, normalize_query(query))
+    try:
+        tree = ast.parse(_replace_booleans(source), mode='eval')
+    except (SyntaxError, tokenize.TokenError) as e:
+        raise UnsupportedQuery(f"Cannot parse query: {e.args[0]}")
+    return _Translator(columns, quoted).visit(tree.body)
+
+def _replace_booleans(source):
+    # Like pandas, & and | bind looser than comparisons: a < b & b < c means (a < b) and (b < c)
+    tokens = []
+    for token in tokenize.generate_tokens(io.StringIO(source).readline):
+        if token.type == tokenize.OP and token.string in ('&', '|'):
+            token = (tokenize.NAME, 'and' if token.string == '&' else 'or')
+        else:
+            token = (token.type, token.string)
+        tokens.append(token)
+    return tokenize.untokenize(tokens)
+
+class _Translator:
+    def __init__(self, columns, quoted):
+        self.columns = set(columns)
+        self.quoted = quoted
+
+    def visit(self, node):
+        method = getattr(self, f'visit_{type(node).__name__}', None)
+        if method is None:
+            raise UnsupportedQuery(f"Unsupported syntax: {type(node).__name__}")
+        return method(node)
+
+    def column(self, node):
+        if isinstance(node, ast.Name):
+            name = self.quoted.get(node.id, node.id)
+            if name in self.columns:
+                return pc.field(name)
+            raise UnsupportedQuery(f"Unknown column: {name}")
+        return None
+
+    def literal(self, node):
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub) and isinstance(node.operand, ast.Constant):
+            return -node.operand.value
+        if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+            return [self.literal(element) for element in node.elts]
+        raise UnsupportedQuery(f"Expected a literal value, got {type(node).__name__}")
+
+    def visit_BoolOp(self, node):
+        result = self.visit(node.values[0])
+        for value in node.values[1:]:
+            result = result & self.visit(value) if isinstance(node.op, ast.And) else result | self.visit(value)
+        return result
+
+    def visit_UnaryOp(self, node):
+        if isinstance(node.op, (ast.Not, ast.Invert)):
+            # pandas treats a comparison with a missing value as False, so negating it gives True
+            return ~pc.coalesce(self.visit(node.operand), pa.scalar(False))
+        raise UnsupportedQuery(f"Unsupported operator: {type(node.op).__name__}")
+
+    def visit_Compare(self, node):
+        result = None
+        left = node.left
+        for op, right in zip(node.ops, node.comparators):
+            term = self.compare(left, op, right)
+            result = term if result is None else result & term
+            left = right
+        return result
+
+    def compare(self, left, op, right):
+        field = self.column(left)
+        if isinstance(op, (ast.In, ast.NotIn)):
+            if field is None:
+                raise UnsupportedQuery("'in' needs a column on the left")
+            values = self.literal(right)
+            if not isinstance(values, list):
+                values = [values]
+            expression = field.isin(values)
+            return ~expression if isinstance(op, ast.NotIn) else expression
+        if type(op) not in _COMPARISONS:
+            raise UnsupportedQuery(f"Unsupported comparison: {type(op).__name__}")
+        if field is None:
+            field = self.column(right)
+            if field is None:
+                raise UnsupportedQuery("A comparison needs a column on one side")
+            op, value = _MIRRORED[type(op)](), self.literal(left)
+        else:
+            value = self.literal(right)
+        if value is None:
+            # pandas treats == None / != None as null checks
+            if isinstance(op, ast.Eq):
+                return field.is_null()
+            if isinstance(op, ast.NotEq):
+                return field.is_valid()
+        if isinstance(op, ast.NotEq):
+            # Missing values are "not equal" to anything in pandas
+            return (field != value) | field.is_null()
+        return _COMPARISONS[type(op)](field, value)
+
+    def visit_Call(self, node):
+        func = node.func
+        if isinstance(func, ast.Attribute) and func.attr in _NULL_CHECKS and not node.args:
+            field = self.column(func.value)
+            if field is not None:
+                return field.is_null() if _NULL_CHECKS[func.attr] else field.is_valid()
+        raise UnsupportedQuery("Only .isnull()/.notnull() calls on columns are supported")
+
+    def visit_Name(self, node):
+        # A bare boolean column
+        field = self.column(node)
+        return field == True
+
+def matching_row_groups(dataset, expression):
+    """One fragment per row group of dataset whose min/max statistics may match expression."""
+    return [row_group for fragment in dataset.get_fragments(filter=expression)
+            for row_group in fragment.split_by_row_group(expression, schema=dataset.schema)]
+
+class QueryResult(SpilledResult):
+    """The rows of a session matching a filter, paged like the session itself.
+
+    Row groups that may match are filtered on a thread pool and the matching
+    rows streamed, in file order, to a temporary Arrow IPC file that is read
+    back memory-mapped, so large results don't have to fit in memory.
+    progress(row_groups, nbytes) follows every row group, skipped ones included.
+    """
+    kind = 'query'
+
+    def __init__(self, session, query, expression, columns=None, progress=None, cancel=None):
+        super().__init__(session, columns)
+        self.query = normalize_query(query)
+        try:
+            self.spill(self._scan(session.dataset(), expression, len(session.row_group_offsets) - 1, progress, cancel))
+        except BaseException:
+            self.close()
+            raise
+
+    def _scan(self, dataset, expression, total, progress, cancel):
+        row_groups = matching_row_groups(dataset, expression)
+        if progress is not None and total > len(row_groups):
+            # Pruned by their statistics: scanned without being read
+            progress(total - len(row_groups), 0)
+
+        def scan(row_group):
+            if cancel is not None and cancel.is_set():
+                raise Cancelled()
+            table = row_group.to_table(schema=dataset.schema, columns=self.columns, filter=expression)
+            if progress is not None:
+                progress(1, sum(info.total_byte_size for info in row_group.row_groups))
+            return table
+
+        with ThreadPoolExecutor(max_workers=SCAN_THREADS, thread_name_prefix='query-scan') as executor:
+            for start in range(0, len(row_groups), SCAN_WINDOW):
+                for table in executor.map(scan, row_groups[start:start + SCAN_WINDOW]):
+                    yield from table.to_batches()
+
+def run_query(session, query, columns=None, progress=None, cancel=None):
+    """Filter the whole file behind session with a pandas-style query, pushed down into the scan."""
+    return QueryResult(session, query, to_arrow_filter(query, session.columns), columns, progress=progress, cancel=cancel)
@@ -0,0 +1,95 @@
+import os
+from collections import OrderedDict
+
+from data.query import to_arrow_filter
+
+DEFAULT_RESULT_CACHE_BYTES = 1024 * 1024 * 1024
+
+def result_key(session, kind, query, columns=None):
+    """Cache key of a query over session: the file and its version, the query text and the projected columns."""
+    # A filter is keyed on its translated expression, so k>5 and k > 5 share an entry
+    text = str(to_arrow_filter(query, session.columns)) if kind == 'query' else query.strip()
+    return (os.path.abspath(session.file_path), session.version, tuple(session.dictionary_columns),
+            kind, text, None if columns is None else tuple(columns))
+
+class ResultCache:
+    """LRU cache of whole-file query results, bounded by the size of their spill files.
+
+    Results are SpilledResult objects, already on disk as Arrow IPC and read
+    back memory-mapped, so a cached result costs disk and page cache rather
+    than heap. A result is closed when it is evicted, unless it is the one in
+    use (see use()), which is then closed once it is replaced.
+    """
+    def __init__(self, max_bytes=DEFAULT_RESULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.in_use = None
+        self._results = OrderedDict()
+
+    def __contains__(self, key):
+        return key in self._results
+
+    def __len__(self):
+        return len(self._results)
+
+    def get(self, key):
+        result = self._results.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self._results.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key, result):
+        """Cache result under key, dropping results of older versions of the same file."""
+        for old_key in [k for k in self._results if k[0] == key[0] and k[1] != key[1]]:
+            self._release(self._results.pop(old_key))
+        previous = self._results.pop(key, None)
+        if previous is not None and previous is not result:
+            self._release(previous)
+        self._results[key] = result
+        self.trim()
+
+    def use(self, result):
+        """Mark result (or None) as the one on screen, closing the previous one unless it is cached."""
+        previous, self.in_use = self.in_use, result
+        if previous is not None and previous is not result:
+            self.release(previous)
+
+    def release(self, result):
+        """Close a result nobody needs any more, unless the cache or the screen still holds it."""
+        if result is not self.in_use and not any(cached is result for cached in self._results.values()):
+            result.close()
+
+    def _release(self, result):
+        if result is not self.in_use:
+            result.close()
+
+    def drop_path(self, file_path):
+        """Forget the results of every query over file_path; used once the file is rewritten."""
+        path = os.path.abspath(file_path)
+        for key in [key for key in self._results if key[0] == path]:
+            self._release(self._results.pop(key))
+
+    def nbytes(self):
+        return sum(result.table.nbytes for result in self._results.values())
+
+    def trim(self):
+        """Evict least recently used results until the byte budget is met, always keeping the newest."""
+        total = self.nbytes()
+        while total > self.max_bytes and len(self._results) > 1:
+            _, result = self._results.popitem(last=False)
+            total -= result.table.nbytes
+            self._release(result)
+
+    def clear(self):
+        results, self._results = list(self._results.values()), OrderedDict()
+        for result in results:
+            self._release(result)
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'results': len(self._results), 'bytes': self.nbytes()}
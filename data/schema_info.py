@@ -0,0 +1,93 @@
+import pandas as pd
+
+from data.stats import _leaf_indices
+
+def _entry(type_name, nullable):
+    return {'type': type_name, 'nullable': nullable, 'logical_type': None, 'encodings': None,
+            'compression': None, 'compressed_size': None, 'uncompressed_size': None}
+
+def footer_column_info(schema, footers, statistics):
+    """Header metadata for every column from the Arrow schema and the Parquet footers alone.
+
+    'nullable' is whether the footer null counts show any nulls, falling back to the
+    schema's flag when a count is missing. Sizes add up across row groups and files.
+    """
+    leaves = [(metadata, _leaf_indices(metadata)) for metadata in footers]
+    result = {}
+    for name in schema.names:
+        field = schema.field(name)
+        null_count = statistics.get(name, {}).get('null_count')
+        entry = _entry(str(field.type), field.nullable if null_count is None else null_count > 0)
+        result[name] = entry
+        encodings, codecs = set(), set()
+        compressed = uncompressed = 0
+        found = False
+        for metadata, indices in leaves:
+            leaf = indices.get(name)
+            if leaf is None:
+                continue
+            found = True
+            column = metadata.schema.column(leaf)
+            if column.logical_type is not None and str(column.logical_type) != 'None':
+                entry['logical_type'] = str(column.logical_type)
+            for rg in range(metadata.num_row_groups):
+                chunk = metadata.row_group(rg).column(leaf)
+                encodings.update(chunk.encodings)
+                codecs.add(chunk.compression)
+                compressed += chunk.total_compressed_size
+                uncompressed += chunk.total_uncompressed_size
+        if found:
+            entry['encodings'] = ', '.join(sorted(encodings))
+            entry['compression'] = ', '.join(sorted(codecs))
+            entry['compressed_size'] = compressed
+            entry['uncompressed_size'] = uncompressed
+    return result
+
+def source_column_info(source):
+    """footer_column_info() for a ParquetSession or DatasetSession."""
+    return footer_column_info(source.schema, source.footer_metadata(), source.column_statistics())
+
+def frame_column_info(series):
+    """Header metadata for a column that only exists in memory; scans it once for nulls."""
+    return _entry(str(series.dtype), bool(series.isnull().any()))
+
+class SchemaMetadata:
+    """Per-column header metadata, built once per load and kept current by edits.
+
+    Hovering a header only looks an entry up. Entries that can't come from a footer
+    (new files, added columns) are computed from the frame the first time they are needed.
+    """
+    def __init__(self, columns=None):
+        # Copied so edits to one page never leak into the per-file entries
+        self.columns = {name: dict(entry) for name, entry in (columns or {}).items()}
+
+    def get(self, name, frame=None):
+        entry = self.columns.get(name)
+        if entry is None and frame is not None and name in frame.columns:
+            entry = self.columns[name] = frame_column_info(frame[name])
+        return entry
+
+    def record_value(self, name, value):
+        # Writing a value can only introduce nulls; overwriting one might not remove the last
+        entry = self.columns.get(name)
+        if entry is not None and pd.isna(value):
+            entry['nullable'] = True
+
+    def record_values(self, name, values):
+        entry = self.columns.get(name)
+        if entry is not None and pd.isna(values).any():
+            entry['nullable'] = True
+
+    def record_new_row(self):
+        for entry in self.columns.values():
+            entry['nullable'] = True
+
+    def add_column(self, name, series):
+        self.columns[name] = frame_column_info(series)
+
+    def pop_column(self, name):
+        return self.columns.pop(name, None)
+
+    def restore_column(self, name, entry):
+        if entry is not None:
+            self.columns[name] = entry
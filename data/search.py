@@ -0,0 +1,42 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from data.sidecar import check_cancel
+from utils.formatting import format_values
+
+class SearchIndex:
+    """Lowercased display text of every column of a page, built once and searched with Arrow kernels.
+
+    columns is a list of Arrow arrays or pandas Series, one per column, all the
+    same length. Searching matches the text shown in the table, so '3.0' finds a
+    float 3 the way the user sees it.
+    """
+    def __init__(self, columns, num_rows, cancel=None):
+        self.num_rows = num_rows
+        self.text = []
+        for values in columns:
+            check_cancel(cancel)
+            self.text.append(pc.utf8_lower(pa.array(format_values(values), type=pa.large_string())))
+
+    @classmethod
+    def from_frame(cls, df, cancel=None):
+        return cls([df.iloc[:, col] for col in range(len(df.columns))], len(df), cancel=cancel)
+
+    @classmethod
+    def from_page(cls, page, cancel=None):
+        """Index a ParquetPage, decoding whatever columns it hasn't yet"""
+        page.load(page.columns, cancel=cancel)
+        return cls([page.column(name) for name in page.columns], page.num_rows, cancel=cancel)
+
+    def search(self, text, cancel=None):
+        """Positions of the rows with a cell containing text (ignoring case), and one cell mask per column"""
+        pattern = text.lower()
+        masks = []
+        matched = np.zeros(self.num_rows, dtype=bool)
+        for column in self.text:
+            check_cancel(cancel)
+            mask = pc.match_substring(column, pattern).to_numpy(zero_copy_only=False)
+            masks.append(mask)
+            matched |= mask
+        return np.flatnonzero(matched), masks
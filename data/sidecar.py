@@ -0,0 +1,42 @@
+import contextlib
+import hashlib
+import os
+
+from data.parquet_handler import Cancelled
+
+def check_cancel(cancel):
+    """Raise Cancelled once the cancel event of a long-running build is set."""
+    if cancel is not None and cancel.is_set():
+        raise Cancelled()
+
+def cache_dir(name):
+    """Folder name under the cache root, $PARQUET_EXPLORER_CACHE or ~/.cache/parquet-explorer."""
+    root = os.environ.get('PARQUET_EXPLORER_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'parquet-explorer'))
+    return os.path.join(root, name)
+
+def sidecar_path(session, directory, suffix):
+    """Sidecar file for a session; one per file or dataset path, replaced when that changes."""
+    digest = hashlib.sha1(os.path.abspath(session.file_path).encode('utf-8')).hexdigest()
+    return os.path.join(directory, digest + suffix)
+
+def fingerprint(session, **settings):
+    """What a sidecar was built from; settings are those of the sidecar's own format."""
+    # session.version holds the mtime (and size), so touching the file invalidates its sidecars
+    return {'path': os.path.abspath(session.file_path), 'version': list(session.version),
+            'num_rows': session.num_rows, 'columns': list(session.columns), **settings}
+
+@contextlib.contextmanager
+def atomic_write(path):
+    """Yield a path to write beside path, renamed over it once the block succeeds.
+
+    A failed or cancelled write never leaves half a sidecar behind.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial = path + '.partial'
+    try:
+        yield partial
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(partial)
+        raise
+    os.replace(partial, path)
@@ -0,0 +1,125 @@
+import itertools
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from data.page_cache import block_bounds
+from data.parquet_handler import Cancelled
+from data.spill import SpilledResult, spill_path, write_spill, read_spill, remove_spill
+
+# Rows sorted in memory per run of the external sort, and rows taken from each run per merge step
+RUN_ROWS = 1000000
+MERGE_BATCH_ROWS = 8192
+
+def _key_array(values):
+    # Sort kernels want one plain array: no chunks, no dictionary
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks() if values.num_chunks else pa.array([], type=values.type)
+    if pa.types.is_dictionary(values.type):
+        values = values.dictionary_decode()
+    return values
+
+def _order(descending):
+    return 'descending' if descending else 'ascending'
+
+def sort_indices(values, descending=False):
+    """Stable permutation that sorts one column (Arrow array or pandas Series), nulls and NaN last."""
+    if not isinstance(values, (pa.Array, pa.ChunkedArray)):
+        try:
+            values = pa.Array.from_pandas(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Mixed Python objects have no Arrow type; order them by their text instead
+            values = pa.array(values.astype(str).where(values.notna(), None))
+    key = _key_array(values)
+    indices = pc.array_sort_indices(key, order=_order(descending), null_placement='at_end')
+    # Signed, so the positions mix with numpy arithmetic without turning into floats
+    return indices.to_numpy().astype(np.int64)
+
+def _run_bounds(row_group_offsets, max_rows):
+    # Runs end on row group boundaries where possible so no row group is decoded twice
+    bounds = [0]
+    previous = 0
+    for offset in block_bounds(row_group_offsets, max_rows)[1:]:
+        if offset - bounds[-1] > max_rows:
+            bounds.append(previous)
+        previous = offset
+    if previous > bounds[-1]:
+        bounds.append(previous)
+    return bounds
+
+def _plain(table):
+    # One chunk and one dictionary per column, so take() and filter() accept it
+    return table.unify_dictionaries().combine_chunks()
+
+class SortResult(SpilledResult):
+    """Every row of a session ordered by one column, using an external merge sort.
+
+    Runs of RUN_ROWS rows are sorted in memory and spilled to temporary Arrow IPC
+    files. The runs are then merged MERGE_BATCH_ROWS rows at a time into the
+    result's spill file, so memory use doesn't grow with the file. Nulls and NaN
+    go last.
+    """
+    kind = 'sort'
+
+    def __init__(self, session, column, descending=False, progress=None, cancel=None):
+        super().__init__(session)
+        self.sort_column = column
+        self.descending = descending
+        runs, null_runs = [], []
+        try:
+            bounds = _run_bounds(session.row_group_offsets, RUN_ROWS)
+            for start, stop in zip(bounds, bounds[1:]):
+                if cancel is not None and cancel.is_set():
+                    raise Cancelled()
+                table = _plain(session.read_range(start, stop - start, columns=self.columns,
+                                                  progress=progress, cancel=cancel))
+                nulls = pc.is_null(_key_array(table.column(column)), nan_is_null=True)
+                valid = table.filter(pc.invert(nulls))
+                order = pc.array_sort_indices(_key_array(valid.column(column)), order=_order(descending))
+                runs.append(self._spill_run(valid.take(order)))
+                if valid.num_rows < table.num_rows:
+                    null_runs.append(self._spill_run(table.filter(nulls)))
+            tail = itertools.chain.from_iterable(read_spill(path).to_batches() for path in null_runs)
+            self.spill(itertools.chain(self._merge(runs, cancel), tail))
+        except BaseException:
+            self.close()
+            raise
+        finally:
+            for path in runs + null_runs:
+                remove_spill(path)
+
+    def _spill_run(self, table):
+        path = spill_path('sort-run')
+        write_spill(path, self.schema, table.to_batches())
+        return path
+
+    def _merge(self, runs, cancel):
+        """Yield the rows of the sorted runs as sorted batches, one window per run at a time."""
+        tables = [read_spill(path) for path in runs]
+        positions = [0] * len(tables)
+        compare = pc.greater_equal if self.descending else pc.less_equal
+        while True:
+            if cancel is not None and cancel.is_set():
+                raise Cancelled()
+            active = [i for i, table in enumerate(tables) if positions[i] < table.num_rows]
+            if not active:
+                return
+            windows = {i: tables[i].slice(positions[i], MERGE_BATCH_ROWS) for i in active}
+            keys = {i: _key_array(window.column(self.sort_column)) for i, window in windows.items()}
+            # Every row up to the smallest of the windows' last keys can be emitted now
+            last_keys = pa.concat_arrays([key.slice(len(key) - 1, 1) for key in keys.values()])
+            bound = pc.max(last_keys) if self.descending else pc.min(last_keys)
+            heads = []
+            for i in active:
+                count = pc.sum(compare(keys[i], bound)).as_py() or 0
+                if count:
+                    heads.append(windows[i].slice(0, count))
+                    positions[i] += count
+            merged = _plain(pa.concat_tables(heads))
+            order = pc.array_sort_indices(_key_array(merged.column(self.sort_column)), order=_order(self.descending))
+            yield from merged.take(order).to_batches()
+
+def sort_source(session, column, descending=False, progress=None, cancel=None):
+    """Sort every row of session (a file, dataset or query result) by column."""
+    return SortResult(session, column, descending, progress=progress, cancel=cancel)
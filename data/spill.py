@@ -0,0 +1,77 @@
+import itertools
+import os
+import tempfile
+
+import pyarrow as pa
+
+_result_ids = itertools.count()
+
+def spill_path(kind):
+    fd, path = tempfile.mkstemp(suffix='.arrow', prefix=f'parquet-explorer-{kind}-')
+    os.close(fd)
+    return path
+
+def write_spill(path, schema, batches):
+    """Stream record batches into an Arrow IPC file at path."""
+    with pa.OSFile(path, 'wb') as sink:
+        # The stream format allows each batch to carry its own dictionaries
+        with pa.ipc.new_stream(sink, schema) as writer:
+            for batch in batches:
+                if batch.num_rows:
+                    writer.write_batch(batch)
+
+def read_spill(path):
+    """The table in a spill file, memory-mapped rather than read into memory."""
+    return pa.ipc.open_stream(pa.memory_map(path)).read_all()
+
+def remove_spill(path):
+    try:
+        os.unlink(path)
+    except OSError:
+        # Still memory-mapped by a page somewhere (Windows); the temp dir will reclaim it
+        pass
+
+class SpilledResult:
+    """Rows derived from a session, spilled to a temporary Arrow IPC file and read back memory-mapped.
+
+    Offers the reading interface of ParquetSession, so pages, the page cache and
+    the continuous view work on it unchanged. Subclasses call spill() once.
+    """
+    kind = 'result'
+
+    def __init__(self, session, columns=None, schema=None):
+        self.source = session
+        self.file_path = session.file_path
+        # Unique per result so cached pages never outlive the spill file they read from
+        self.version = (session.version, self.kind, next(_result_ids))
+        if schema is None:
+            # A subset of the session's columns
+            self.dictionary_columns = session.dictionary_columns
+            self.columns = list(columns or session.columns)
+            schema = pa.schema([session.schema.field(name) for name in self.columns], metadata=session.schema.metadata)
+        else:
+            # Columns computed from the session, such as the output of a SQL query
+            self.dictionary_columns = [field.name for field in schema if pa.types.is_dictionary(field.type)]
+            self.columns = list(schema.names)
+        self.schema = schema
+        self._spill_path = spill_path(self.kind)
+        self.table = self.schema.empty_table()
+        self.row_group_offsets = [0, 0]
+
+    def spill(self, batches):
+        write_spill(self._spill_path, self.schema, batches)
+        self.table = read_spill(self._spill_path)
+        self.row_group_offsets = [0, self.table.num_rows]
+
+    @property
+    def num_rows(self):
+        return self.table.num_rows
+
+    def read_range(self, offset, limit, columns=None, progress=None, cancel=None):
+        # Already in memory (mapped); there is nothing to report or cancel
+        table = self.table.slice(max(offset, 0), max(limit, 0))
+        return table if columns is None else table.select(columns)
+
+    def close(self):
+        self.table = self.table.schema.empty_table()
+        remove_spill(self._spill_path)
@@ -0,0 +1,118 @@
+import contextlib
+import os
+import re
+import threading
+
+from data.parquet_handler import Cancelled
+from data.spill import SpilledResult
+
+try:
+    import duckdb
+except ImportError:
+    # Optional: without it the query bar only takes pandas expressions
+    duckdb = None
+
+# The name the open file or dataset has in SQL queries
+TABLE_NAME = 'current'
+BATCH_ROWS = 65536
+# How often a running query is checked for cancellation and progress
+POLL_SECONDS = 0.1
+
+class SqlUnavailable(RuntimeError):
+    """SQL queries need the optional duckdb package."""
+
+def sql_available():
+    return duckdb is not None
+
+def is_sql(query):
+    """Whether the query bar text is SQL rather than a pandas expression."""
+    return re.match(r'\s*(select|with|from)\b', query, re.IGNORECASE) is not None
+
+def _quote(path):
+    return "'" + path.replace("'", "''") + "'"
+
+def connect(session):
+    """A DuckDB connection where TABLE_NAME reads the file or dataset behind session."""
+    if duckdb is None:
+        raise SqlUnavailable("SQL queries need the duckdb package: pip install duckdb")
+    connection = duckdb.connect()
+    connection.execute(f"SET threads TO {os.cpu_count() or 1}")
+    # Makes query_progress() report, without drawing a bar on stdout
+    connection.execute("SET enable_progress_bar = true")
+    connection.execute("SET enable_progress_bar_print = false")
+    if os.path.isfile(session.file_path):
+        # DuckDB's own Parquet reader scans row groups in parallel and skips unneeded columns
+        connection.execute(f"CREATE VIEW {TABLE_NAME} AS SELECT * FROM read_parquet({_quote(session.file_path)})")
+    else:
+        # Folders and globs keep the same files and Hive partition columns as the session
+        connection.register(TABLE_NAME, session.dataset())
+    return connection
+
+@contextlib.contextmanager
+def _monitor(connection, total, progress, cancel):
+    """Interrupt the query running on connection once cancel is set, and report its progress
+    as progress(row_groups, 0) out of the session's total row groups."""
+    done = threading.Event()
+    reported = [0]
+
+    def report(scanned):
+        if progress is not None and scanned > reported[0]:
+            progress(scanned - reported[0], 0)
+            reported[0] = scanned
+
+    def watch():
+        while not done.wait(POLL_SECONDS):
+            if cancel is not None and cancel.is_set():
+                connection.interrupt()
+                return
+            # A percentage of the scan, or -1 before DuckDB can tell
+            report(int(total * max(connection.query_progress(), 0) / 100))
+
+    watcher = threading.Thread(target=watch, name='sql-monitor', daemon=True)
+    watcher.start()
+    try:
+        yield
+    except duckdb.InterruptException:
+        raise Cancelled()
+    finally:
+        done.set()
+        watcher.join()
+    report(total)
+
+class SqlResult(SpilledResult):
+    """The output of a SQL query over a session, paged like the session itself.
+
+    DuckDB runs the query multi-threaded on the Parquet data; the output arrives
+    as Arrow record batches that are streamed to a temporary IPC file and read
+    back memory-mapped, so neither the input nor a large output goes through pandas.
+    Setting cancel interrupts DuckDB mid-query rather than waiting for it.
+    """
+    kind = 'sql'
+
+    def __init__(self, session, query, progress=None, cancel=None):
+        connection = connect(session)
+        try:
+            with _monitor(connection, len(session.row_group_offsets) - 1, progress, cancel):
+                executed = connection.execute(query)
+                # to_arrow_reader() replaced fetch_record_batch() in newer DuckDB releases
+                fetch = getattr(executed, 'to_arrow_reader', None) or executed.fetch_record_batch
+                reader = fetch(BATCH_ROWS)
+                super().__init__(session, schema=reader.schema)
+                self.query = query.strip()
+                try:
+                    self.spill(self._batches(reader, cancel))
+                except BaseException:
+                    self.close()
+                    raise
+        finally:
+            connection.close()
+
+    def _batches(self, reader, cancel):
+        for batch in reader:
+            if cancel is not None and cancel.is_set():
+                raise Cancelled()
+            yield batch
+
+def run_sql(session, query, progress=None, cancel=None):
+    """Run a SQL query against the file behind session, whose table is called TABLE_NAME."""
+    return SqlResult(session, query, progress=progress, cancel=cancel)
@@ -0,0 +1,254 @@
+from collections import Counter
+
+import pandas as pd
+
+from utils.formatting import is_numeric
+
+def _leaf_indices(metadata):
+    # Top-level (non-nested) columns map one-to-one onto a leaf column in the footer
+    return {metadata.schema.column(i).path: i for i in range(metadata.num_columns)}
+
+def footer_statistics(metadata, columns):
+    """Aggregate per-row-group min, max, null and distinct counts into whole-file numbers.
+
+    Values are None when at least one row group lacks the statistic, since a partial
+    aggregate would be wrong rather than approximate. Distinct counts only add up
+    to an upper bound across row groups, which is flagged by 'distinct_exact'.
+    """
+    leaves = _leaf_indices(metadata)
+    result = {}
+    for name in columns:
+        leaf = leaves.get(name)
+        entry = {'min': None, 'max': None, 'null_count': None,
+                 'distinct_count': None, 'distinct_exact': metadata.num_row_groups == 1}
+        result[name] = entry
+        if leaf is None or metadata.num_row_groups == 0:
+            continue
+
+        has_min_max = has_nulls = has_distinct = True
+        min_value = max_value = None
+        null_count = distinct_count = 0
+        for rg in range(metadata.num_row_groups):
+            stats = metadata.row_group(rg).column(leaf).statistics
+            if stats is None:
+                has_min_max = has_nulls = has_distinct = False
+                break
+            if has_min_max and stats.has_min_max:
+                try:
+                    if min_value is None or stats.min < min_value:
+                        min_value = stats.min
+                    if max_value is None or stats.max > max_value:
+                        max_value = stats.max
+                except TypeError:
+                    has_min_max = False
+            elif stats.num_values > 0:
+                # All-null row groups carry no min/max and don't affect the bounds
+                has_min_max = False
+            if has_nulls and stats.has_null_count:
+                null_count += stats.null_count
+            else:
+                has_nulls = False
+            if has_distinct and stats.has_distinct_count:
+                distinct_count += stats.distinct_count
+            else:
+                has_distinct = False
+
+        if has_min_max:
+            entry['min'], entry['max'] = min_value, max_value
+        if has_nulls:
+            entry['null_count'] = null_count
+        if has_distinct:
+            entry['distinct_count'] = distinct_count
+    return result
+
+def combine_statistics(parts, columns):
+    """Merge the footer_statistics() of several files into numbers for all of them."""
+    result = {}
+    for name in columns:
+        entries = [part.get(name) for part in parts]
+        combined = {'min': None, 'max': None, 'null_count': None,
+                    'distinct_count': None, 'distinct_exact': len(parts) == 1}
+        result[name] = combined
+        if not entries or any(entry is None for entry in entries):
+            continue
+        if all(entry['min'] is not None for entry in entries):
+            try:
+                bounds = min(entry['min'] for entry in entries), max(entry['max'] for entry in entries)
+                combined['min'], combined['max'] = bounds
+            except TypeError:
+                pass
+        if all(entry['null_count'] is not None for entry in entries):
+            combined['null_count'] = sum(entry['null_count'] for entry in entries)
+        if all(entry['distinct_count'] is not None for entry in entries):
+            combined['distinct_count'] = sum(entry['distinct_count'] for entry in entries)
+            combined['distinct_exact'] = combined['distinct_exact'] and entries[0]['distinct_exact']
+    return result
+
+def _is_missing(value):
+    # pd.isna() of a list or array is elementwise; only scalars can be missing
+    return value is None or (pd.api.types.is_scalar(value) and bool(pd.isna(value)))
+
+class RunningColumnStats:
+    """Summary of one column of the page, kept current one value at a time.
+
+    Numbers keep a count, mean and sum of squared deviations from the mean
+    (Welford's updates, run backwards to take a value away), so the mean and
+    standard deviation follow an edit in O(1) without the cancellation raw
+    sums of squares suffer when values sit far from zero. Min and max follow added values; taking
+    away the current min or max marks them stale, and they are recomputed from
+    the column the next time they are asked for. Other columns keep value
+    counts for the number of distinct values and the most frequent one.
+    """
+    def __init__(self, series):
+        self.numeric = is_numeric(series.dtype)
+        values = series.dropna()
+        self.rows = len(series)
+        self.count = len(values)
+        self.counts = None
+        self.mean = self.m2 = 0.0
+        self.min = self.max = None
+        self.stale = False
+        if self.numeric:
+            numbers = values.to_numpy(dtype=float)
+            if len(numbers):
+                self.mean = float(numbers.mean())
+                self.m2 = float(((numbers - self.mean) ** 2).sum())
+                self.min, self.max = float(numbers.min()), float(numbers.max())
+        else:
+            try:
+                counts = values.value_counts()
+            except TypeError:
+                # Lists and other unhashable values can't be counted
+                return
+            self.counts = Counter({value: int(n) for value, n in counts.items() if n})
+
+    def add(self, value):
+        self.rows += 1
+        if _is_missing(value):
+            return
+        self.count += 1
+        if self.numeric:
+            number = float(value)
+            delta = number - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (number - self.mean)
+            if not self.stale:
+                self.min = number if self.min is None else min(self.min, number)
+                self.max = number if self.max is None else max(self.max, number)
+        elif self.counts is not None:
+            try:
+                self.counts[value] += 1
+            except TypeError:
+                self.counts = None
+
+    def remove(self, value):
+        self.rows -= 1
+        if _is_missing(value):
+            return
+        self.count -= 1
+        if self.numeric:
+            number = float(value)
+            if self.count == 0:
+                # Start again from exact zeros rather than the rounding left over
+                self.mean = self.m2 = 0.0
+                self.min = self.max = None
+                self.stale = False
+                return
+            delta = number - self.mean
+            self.mean -= delta / self.count
+            self.m2 = max(self.m2 - delta * (number - self.mean), 0.0)
+            if number == self.min or number == self.max:
+                self.stale = True
+        elif self.counts is not None:
+            try:
+                self.counts[value] -= 1
+                if self.counts[value] <= 0:
+                    del self.counts[value]
+            except TypeError:
+                self.counts = None
+
+    def replace(self, old, new):
+        self.remove(old)
+        self.add(new)
+
+    def summary(self, series):
+        """The statistics as a dict; series is the column now, needed only for a stale min or max."""
+        if self.stale:
+            self.min, self.max = float(series.min()), float(series.max())
+            self.stale = False
+        entry = {'count': self.count, 'nulls': self.rows - self.count}
+        if self.numeric:
+            mean = self.mean if self.count else float('nan')
+            # Sample standard deviation, as in DataFrame.describe()
+            std = (self.m2 / (self.count - 1)) ** 0.5 if self.count > 1 else float('nan')
+            entry.update(mean=mean, std=std, min=self.min, max=self.max)
+        elif self.counts is not None:
+            top = self.counts.most_common(1)
+            entry.update(unique=len(self.counts), top=top[0][0] if top else None, freq=top[0][1] if top else None)
+        return entry
+
+class PageStatistics:
+    """RunningColumnStats for every column of the page, built on request and kept current by edits.
+
+    Each edit marks the columns it touches, so only their summaries are
+    recomputed the next time the Statistics dock is drawn.
+    """
+    def __init__(self):
+        self.columns = {}
+        self.built = False
+        self._summaries = {}
+
+    def build(self, frame):
+        self.columns = {name: RunningColumnStats(frame[name]) for name in frame.columns}
+        self._summaries = {}
+        self.built = True
+
+    def _changed(self, name):
+        self._summaries.pop(name, None)
+
+    def replace(self, name, old, new):
+        entry = self.columns.get(name)
+        if entry is not None:
+            entry.replace(old, new)
+            self._changed(name)
+
+    def replace_values(self, name, old_values, new_values):
+        entry = self.columns.get(name)
+        if entry is not None:
+            for old, new in zip(old_values, new_values):
+                entry.replace(old, new)
+            self._changed(name)
+
+    def add_row(self, row):
+        """row is a Series of the new row's values indexed by column name"""
+        for name, value in row.items():
+            if name in self.columns:
+                self.columns[name].add(value)
+                self._changed(name)
+
+    def remove_row(self, row):
+        for name, value in row.items():
+            if name in self.columns:
+                self.columns[name].remove(value)
+                self._changed(name)
+
+    def add_column(self, name, series):
+        if self.built:
+            self.columns[name] = RunningColumnStats(series)
+            self._changed(name)
+
+    def pop_column(self, name):
+        self._changed(name)
+        return self.columns.pop(name, None)
+
+    def restore_column(self, name, entry):
+        if entry is not None and self.built:
+            self.columns[name] = entry
+            self._changed(name)
+
+    def summary(self, name, series):
+        """The summary of a column, recomputed only when an edit touched it since last time"""
+        entry = self._summaries.get(name)
+        if entry is None and name in self.columns:
+            entry = self._summaries[name] = self.columns[name].summary(series)
+        return entry
@@ -0,0 +1,160 @@
+import json
+import os
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from data.page_cache import block_bounds
+from data.sidecar import atomic_write, cache_dir, check_cancel, fingerprint, sidecar_path
+from utils.formatting import format_values
+
+# Rows per posting: the index says which granules may hold a text, and those are scanned to confirm
+GRANULE_ROWS = 4096
+FORMAT_VERSION = 1
+
+def index_path(session, index_dir=None):
+    return sidecar_path(session, index_dir or cache_dir('text-index'), '.arrow')
+
+def index_fingerprint(session):
+    return fingerprint(session, granule_rows=GRANULE_ROWS, format=FORMAT_VERSION)
+
+def _lower_text(values):
+    return pc.utf8_lower(pa.array(format_values(values), type=pa.large_string()))
+
+def _lower(text):
+    return pc.utf8_lower(pa.scalar(text, type=pa.large_string())).as_py()
+
+def _trigram_keys(text, granules):
+    """Unique (trigram << 32 | granule) keys for every 3-byte window of every string in text."""
+    offsets = np.frombuffer(text.buffers()[1], dtype=np.int64)[text.offset:text.offset + len(text) + 1]
+    windows = np.maximum(np.diff(offsets) - 2, 0)
+    total = int(windows.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.uint64)
+    data = np.frombuffer(text.buffers()[2], dtype=np.uint8).astype(np.uint32)
+    owner = np.repeat(np.arange(len(windows)), windows)
+    positions = np.arange(total) - np.repeat(np.cumsum(windows) - windows, windows) + offsets[:-1][owner]
+    trigrams = (data[positions] << 16) | (data[positions + 1] << 8) | data[positions + 2]
+    return np.unique((trigrams.astype(np.uint64) << np.uint64(32)) | granules[owner].astype(np.uint64))
+
+def _pattern_trigrams(pattern):
+    data = np.frombuffer(pattern.encode('utf-8'), dtype=np.uint8).astype(np.uint32)
+    if len(data) < 3:
+        return None
+    return np.unique((data[:-2] << 16) | (data[1:-1] << 8) | data[2:])
+
+class TextIndex:
+    """Trigram index of the display text of every cell of a file, stored as an Arrow IPC sidecar.
+
+    For each 3-byte sequence of the lowercased text it lists the granules of
+    GRANULE_ROWS rows that contain it. find() intersects the lists for the
+    trigrams of a search text and scans only the granules left, so a search
+    touches a small part of the file instead of all of it.
+    """
+    def __init__(self, table, path=None):
+        self.table = table
+        self.path = path
+        self.meta = json.loads(table.schema.metadata[b'text_index'])
+        self._trigrams = table.column('trigram').to_numpy()
+        granules = table.column('granules').combine_chunks()
+        self._offsets = granules.offsets.to_numpy()
+        self._granules = granules.values.to_numpy()
+
+    @property
+    def nbytes(self):
+        return os.path.getsize(self.path) if self.path and os.path.exists(self.path) else self.table.nbytes
+
+    @property
+    def num_granules(self):
+        return -(-self.meta['num_rows'] // self.meta['granule_rows'])
+
+    def is_current(self, session):
+        return self.meta['fingerprint'] == index_fingerprint(session)
+
+    @classmethod
+    def build(cls, session, path=None, progress=None, cancel=None):
+        """Index every row group of session; progress(rows_done, num_rows) follows each block."""
+        keys = []
+        bounds = block_bounds(session.row_group_offsets)
+        for start, stop in zip(bounds, bounds[1:]):
+            check_cancel(cancel)
+            table = session.read_range(start, stop - start, cancel=cancel)
+            granules = (np.arange(start, stop) // GRANULE_ROWS).astype(np.uint32)
+            for column in table.columns:
+                check_cancel(cancel)
+                keys.append(_trigram_keys(_lower_text(column), granules))
+            if progress is not None:
+                progress(stop, session.num_rows)
+        keys = np.unique(np.concatenate(keys)) if keys else np.empty(0, dtype=np.uint64)
+        trigrams, first = np.unique((keys >> np.uint64(32)).astype(np.uint32), return_index=True)
+        offsets = np.append(first, len(keys)).astype(np.int64)
+        granules = pa.LargeListArray.from_arrays(pa.array(offsets), pa.array((keys & np.uint64(0xFFFFFFFF)).astype(np.uint32)))
+        meta = {'fingerprint': index_fingerprint(session), 'num_rows': session.num_rows, 'granule_rows': GRANULE_ROWS}
+        table = pa.table({'trigram': pa.array(trigrams), 'granules': granules},
+                         metadata={'text_index': json.dumps(meta)})
+        if path is not None:
+            with atomic_write(path) as partial, pa.OSFile(partial, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        return cls(table, path)
+
+    @classmethod
+    def load(cls, session, path):
+        """The sidecar at path, or None when it is missing, unreadable or for another version of the file."""
+        try:
+            index = cls(pa.ipc.open_file(pa.memory_map(path)).read_all(), path)
+        except (OSError, pa.ArrowInvalid, KeyError, TypeError, ValueError):
+            return None
+        return index if index.is_current(session) else None
+
+    def candidate_granules(self, pattern):
+        """Granules that contain every trigram of pattern (already lowercased)"""
+        trigrams = _pattern_trigrams(pattern)
+        if trigrams is None:
+            # Too short to look up: every granule is a candidate
+            return np.arange(self.num_granules, dtype=np.uint32)
+        found = np.searchsorted(self._trigrams, trigrams)
+        lists = []
+        for trigram, i in zip(trigrams, found):
+            if i >= len(self._trigrams) or self._trigrams[i] != trigram:
+                return np.empty(0, dtype=np.uint32)
+            lists.append(self._granules[self._offsets[i]:self._offsets[i + 1]])
+        lists.sort(key=len)
+        result = lists[0]
+        for granules in lists[1:]:
+            result = np.intersect1d(result, granules, assume_unique=True)
+        return result
+
+    def find(self, session, text, cancel=None):
+        """Sorted row numbers of the rows of session with a cell containing text, ignoring case"""
+        pattern = _lower(text)
+        candidates = self.candidate_granules(pattern).astype(np.int64)
+        granule_rows = self.meta['granule_rows']
+        bounds = np.asarray(block_bounds(session.row_group_offsets))
+        # The candidates overlapping each block; a granule can straddle two
+        first = np.searchsorted(candidates, bounds[:-1] // granule_rows)
+        last = np.searchsorted(candidates, (bounds[1:] - 1) // granule_rows, side='right')
+        rows = []
+        # One read per block with candidates, so no row group is decoded twice
+        for block in np.flatnonzero(last > first):
+            check_cancel(cancel)
+            start, stop = int(bounds[block]), int(bounds[block + 1])
+            table = session.read_range(start, stop - start, cancel=cancel)
+            for granule in candidates[first[block]:last[block]]:
+                low = max(int(granule) * granule_rows, start)
+                high = min(int(granule + 1) * granule_rows, stop)
+                window = table.slice(low - start, high - low)
+                matched = np.zeros(high - low, dtype=bool)
+                for column in window.columns:
+                    matched |= pc.match_substring(_lower_text(column), pattern).to_numpy(zero_copy_only=False)
+                rows.append(np.flatnonzero(matched) + low)
+        return np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+
+def open_index(session, index_dir=None, build=False, progress=None, cancel=None):
+    """The current sidecar index for session, building (and saving) it when missing or stale if build is set."""
+    path = index_path(session, index_dir)
+    index = TextIndex.load(session, path)
+    if index is None and build:
+        index = TextIndex.build(session, path, progress=progress, cancel=cancel)
+    return index
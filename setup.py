@@ -10,6 +10,10 @@ setup(
         "pyarrow>=10.0.0",
         "pandas>=1.5.0",
     ],
+    extras_require={
+        # SQL queries in the query bar
+        "sql": ["duckdb>=0.9.0"],
+    },
     entry_points={
         "console_scripts": [
             "parquet-explorer=main:main",
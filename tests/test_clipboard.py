@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.clipboard import coerce_texts, parse_tsv, to_tsv
+
+def test_tsv_round_trip():
+    columns = [['1', '2', '3'], ['a', '', 'c']]
+    text = to_tsv(columns, chunk_rows=2)
+    assert text == "1\ta\n2\t\n3\tc\n"
+    assert parse_tsv(text) == [['1', 'a'], ['2', ''], ['3', 'c']]
+    assert parse_tsv("x\r\ny\tz") == [['x', ''], ['y', 'z']]
+    assert to_tsv([]) == ""
+
+def test_coerce_texts():
+    assert coerce_texts(['1', '2'], np.dtype('int64')).tolist() == [1, 2]
+    floats = coerce_texts(['1.5', '', 'None'], np.dtype('float64'))
+    assert floats[0] == 1.5 and np.isnan(floats[1:]).all()
+    assert coerce_texts(['True', 'false'], np.dtype('bool')).tolist() == [True, False]
+    assert coerce_texts(['x', 'y'], pd.CategoricalDtype(['x'])).tolist() == ['x', 'y']
+    assert coerce_texts(['', 'text'], np.dtype('object')).tolist() == ['', 'text']
+    with pytest.raises(ValueError):
+        coerce_texts(['1', 'abc'], np.dtype('int64'))
+    with pytest.raises(ValueError):
+        coerce_texts(['1', ''], np.dtype('int64'))
+    with pytest.raises(ValueError):
+        coerce_texts(['1.5'], np.dtype('int64'))
+    with pytest.raises(ValueError):
+        coerce_texts(['yes'], np.dtype('bool'))
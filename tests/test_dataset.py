@@ -0,0 +1,41 @@
+from data.dataset import open_source
+from data.parquet_handler import ParquetPage
+from data.query import run_query
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import tempfile
+
+def test_hive_dataset_pages_and_prunes_partitions():
+    df = pd.DataFrame({'x': range(300), 'year': [2020 + i % 3 for i in range(300)]})
+
+    with tempfile.TemporaryDirectory() as root:
+        pq.write_to_dataset(pa.Table.from_pandas(df, preserve_index=False), root,
+                            partition_cols=['year'], row_group_size=40)
+        session = open_source(root)
+        assert open_source(root) is session
+        assert session.num_rows == 300
+        assert set(session.columns) == {'x', 'year'}
+        assert session.num_row_groups == 9
+
+        page = ParquetPage(session, offset=90, limit=60).to_pandas()
+        assert len(page) == 60
+        assert page['year'].nunique() == 2
+
+        result = run_query(session, "year == 2021 and x < 100")
+        assert result.num_rows == len(df.query("year == 2021 and x < 100"))
+        result.close()
+
+        stats = session.column_statistics()
+        assert stats['x']['min'] == 0 and stats['x']['max'] == 299
+        session.close()
+
+def test_glob_opens_matching_files_as_one_table():
+    with tempfile.TemporaryDirectory() as root:
+        for i in range(3):
+            pq.write_table(pa.table({'v': [i] * 10}), f"{root}/part-{i}.parquet")
+        pq.write_table(pa.table({'v': [99]}), f"{root}/other.parquet")
+        session = open_source(f"{root}/part-*.parquet")
+        assert session.num_rows == 30
+        assert sorted(set(session.read_range(0, 30).column('v').to_pylist())) == [0, 1, 2]
+        session.close()
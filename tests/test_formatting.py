@@ -0,0 +1,43 @@
+import pandas as pd
+import pyarrow as pa
+
+from utils.formatting import FormattedCellCache, format_values, is_numeric, sample_rows
+
+def test_format_values_matches_str():
+    df = pd.DataFrame({
+        'i': [1, 2, 3],
+        'f': [3.0, 1e-07, 2.5],
+        'b': [True, False, True],
+        's': ['a', 'x' * 60, 'c'],
+        'c': pd.Categorical(['u', 'v', 'u']),
+    })
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for name in df.columns:
+        expected = [str(df[name].iloc[i]) for i in range(len(df))]
+        assert format_values(df[name]) == expected
+        assert format_values(table.column(name)) == expected
+    assert format_values(pa.array([1, None])) == ['1', 'None']
+
+    values = list(df['s'])
+    cache = FormattedCellCache(lambda col, start, stop: pd.Series(values[start:stop]), block_rows=2)
+    assert cache.display_text(1, 0) == 'x' * 47 + '...'
+    assert cache.full_text(1, 0) == 'x' * 60
+    values[1] = 'edited'
+    assert cache.display_text(1, 0) == 'x' * 47 + '...'
+    cache.invalidate_cell(1, 0)
+    assert cache.display_text(1, 0) == 'edited'
+
+def test_is_numeric():
+    df = pd.DataFrame({'i': [1], 'f': [1.5], 'b': [True], 's': ['a'], 'c': pd.Categorical(['u'])})
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    expected = {'i': True, 'f': True, 'b': False, 's': False, 'c': False}
+    for name, numeric in expected.items():
+        assert is_numeric(df[name].dtype) == numeric
+        assert is_numeric(table.schema.field(name).type) == numeric
+
+def test_sample_rows():
+    assert sample_rows(5, 10).tolist() == [0, 1, 2, 3, 4]
+    rows = sample_rows(100000, 64)
+    assert len(set(rows.tolist())) == 64 and list(rows) == sorted(rows)
+    assert rows.min() >= 0 and rows.max() < 100000
+    assert (sample_rows(100000, 64) == rows).all()
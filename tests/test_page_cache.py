@@ -0,0 +1,50 @@
+from data.page_cache import PageCache, PagePrefetcher, block_bounds
+from data.parquet_handler import get_session, close_session, save_parquet, page_key
+import pandas as pd
+import tempfile
+import os
+
+def test_page_cache_counts_hits_and_respects_budget():
+    df = pd.DataFrame({'a': range(1000), 'b': [float(i) for i in range(1000)]})
+
+    with tempfile.NamedTemporaryFile(suffix='.parquet', delete=False) as f:
+        temp_file = f.name
+
+    try:
+        save_parquet(df, temp_file)
+        session = get_session(temp_file)
+        cache = PageCache(max_bytes=2500)
+
+        first = cache.page(session, 0, 100)
+        first.load(['a', 'b'])
+        assert cache.page(session, 0, 100) is first
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        # Each fully decoded page holds 1600 bytes, so only the newest one fits
+        cache.page(session, 100, 100).load(['a', 'b'])
+        cache.trim()
+        assert page_key(session, 0, 100) not in cache
+        assert page_key(session, 100, 100) in cache
+        assert cache.stats()['misses'] == 2
+
+        prefetcher = PagePrefetcher(cache, depth=1)
+        prefetcher.prefetch(session, 300, 100, ['a'])
+        for future in prefetcher._pending:
+            future.result()
+        prefetcher.shutdown()
+        assert cache.page(session, 400, 100, count=False).is_loaded('a')
+        assert cache.stats()['misses'] == 2
+
+        # Rewriting the file drops every page read from it
+        save_parquet(df.head(10), temp_file)
+        cache.drop_path(temp_file)
+        assert len(cache) == 0
+        close_session(temp_file)
+    finally:
+        os.unlink(temp_file)
+
+def test_block_bounds_follow_row_groups():
+    assert block_bounds([0, 100, 250]) == [0, 100, 250]
+    # Long row groups are split; blocks never cross a row group boundary
+    assert block_bounds([0, 100, 350], max_rows=100) == [0, 100, 200, 300, 350]
+    assert block_bounds([0]) == [0]
@@ -1,6 +1,8 @@
 import pytest
-from data.parquet_handler import load_parquet, save_parquet
+from data.parquet_handler import load_parquet, save_parquet, get_session, close_session, ParquetPage
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import tempfile
 import os
 
@@ -18,4 +20,91 @@ def test_parquet_handler():
         loaded_df = load_parquet(temp_file)
         pd.testing.assert_frame_equal(df, loaded_df)
     finally:
-        os.unlink(temp_file)
\ No newline at end of file
+        os.unlink(temp_file)
+
+def test_load_parquet_page_spans_row_groups():
+    df = pd.DataFrame({'a': range(100), 'b': [str(i) for i in range(100)]})
+    df['b'] = df['b'].astype('object')
+
+    with tempfile.NamedTemporaryFile(suffix='.parquet', delete=False) as f:
+        temp_file = f.name
+
+    try:
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), temp_file, row_group_size=10)
+        page = load_parquet(temp_file, offset=15, limit=20)
+        pd.testing.assert_frame_equal(page, df.iloc[15:35].reset_index(drop=True))
+
+        last_page = load_parquet(temp_file, offset=95, limit=20)
+        pd.testing.assert_frame_equal(last_page, df.iloc[95:].reset_index(drop=True))
+
+        assert len(load_parquet(temp_file, offset=100, limit=20)) == 0
+    finally:
+        os.unlink(temp_file)
+
+
+def test_session_is_reused_until_file_changes():
+    df = pd.DataFrame({'a': range(10)})
+
+    with tempfile.NamedTemporaryFile(suffix='.parquet', delete=False) as f:
+        temp_file = f.name
+
+    try:
+        save_parquet(df, temp_file)
+        session = get_session(temp_file)
+        assert get_session(temp_file) is session
+        assert session.num_rows == 10
+        assert session.row_group_offsets == [0, 10]
+
+        save_parquet(pd.concat([df, df]), temp_file)
+        reopened = get_session(temp_file)
+        assert reopened is not session
+        assert reopened.num_rows == 20
+        close_session(temp_file)
+    finally:
+        os.unlink(temp_file)
+
+
+def test_parquet_page_decodes_columns_on_demand():
+    df = pd.DataFrame({f'c{i}': range(i, i + 50) for i in range(5)})
+
+    with tempfile.NamedTemporaryFile(suffix='.parquet', delete=False) as f:
+        temp_file = f.name
+
+    try:
+        save_parquet(df, temp_file)
+        page = ParquetPage(get_session(temp_file), offset=10, limit=20)
+        assert page.columns == list(df.columns)
+        assert page.num_rows == 20
+        assert not page.is_loaded('c3')
+
+        assert page.load(['c3', 'c1']) == ['c3', 'c1']
+        assert page.load(['c3']) == []
+        assert page.column('c3').to_pylist() == list(range(13, 33))
+        assert not page.is_loaded('c0')
+
+        pd.testing.assert_frame_equal(page.to_pandas(), df.iloc[10:30].reset_index(drop=True))
+        close_session(temp_file)
+    finally:
+        os.unlink(temp_file)
+
+
+def test_read_dictionary_keeps_low_cardinality_strings_categorical():
+    table = pa.table({
+        'color': ['red', 'blue', 'green'] * 2000,
+        'label': [f'row-{i}' for i in range(6000)],
+    })
+
+    with tempfile.NamedTemporaryFile(suffix='.parquet', delete=False) as f:
+        temp_file = f.name
+
+    try:
+        pq.write_table(table, temp_file, row_group_size=2500)
+        df = load_parquet(temp_file, offset=2000, limit=1000, read_dictionary=True)
+        assert isinstance(df['color'].dtype, pd.CategoricalDtype)
+        assert df['label'].dtype == object
+        assert df['color'].tolist() == table.column('color').to_pylist()[2000:3000]
+
+        assert load_parquet(temp_file, offset=0, limit=10)['color'].dtype == object
+        close_session(temp_file)
+    finally:
+        os.unlink(temp_file)
@@ -0,0 +1,89 @@
+from data.parquet_handler import get_session, close_session
+from data.profile import HyperLogLog, KllSketch, HeavyHitters, hash_values, open_profile, profile_path
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import tempfile
+import os
+import tracemalloc
+
+def test_sketches_stay_within_their_error_bounds():
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 50000, 200000)
+    halves = np.array_split(values, 2)
+
+    # Merging the sketches of two halves is the same as sketching the whole
+    distinct = HyperLogLog()
+    distinct.add(hash_values(pa.array(halves[0])))
+    other = HyperLogLog()
+    other.add(hash_values(pa.array(halves[1])))
+    distinct.merge(other)
+    true_distinct = len(np.unique(values))
+    assert abs(distinct.estimate() - true_distinct) <= 3 * distinct.relative_error * true_distinct
+    # Strings hash alike whether or not they are dictionary encoded
+    text = pa.array(['a', '', 'bc', 'a', None]).drop_null()
+    assert hash_values(text).tolist() == hash_values(text.dictionary_encode()).tolist()
+
+    quantiles = KllSketch()
+    for part in np.array_split(values.astype(float), 20):
+        quantiles.add(part)
+    for fraction, value in zip((0.1, 0.5, 0.9), quantiles.quantiles((0.1, 0.5, 0.9))):
+        assert abs((values <= value).mean() - fraction) <= quantiles.rank_error
+
+    skewed = np.concatenate([np.full(5000, 7), np.full(3000, 8), rng.integers(100, 10**6, 50000)])
+    frequent = HeavyHitters(counters=16)
+    for part in np.array_split(rng.permutation(skewed), 5):
+        frequent.add(pa.array(part))
+    top = dict(frequent.top(2))
+    assert set(top) == {7, 8}
+    assert 5000 - frequent.error <= top[7] <= 5000
+    assert frequent.error <= len(skewed) / 17
+
+def test_profile_is_saved_as_a_sidecar():
+    n = 12000
+    df = pd.DataFrame({'id': np.arange(n), 'city': [['NY', 'LA', 'SF'][i % 3] for i in range(n)],
+                       'score': [None if i % 10 == 0 else i / 2 for i in range(n)]})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'data.parquet')
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, row_group_size=2500)
+        session = get_session(path)
+        profile_dir = os.path.join(tmp, 'profile')
+        assert open_profile(session, profile_dir) is None
+        profile = open_profile(session, profile_dir, build=True)
+        assert os.path.exists(profile_path(session, profile_dir))
+
+        city = profile.columns['city']
+        assert city['distinct'] == 3 and city['top_error'] == 0
+        assert dict(map(tuple, city['top'])) == {'NY': 4000, 'LA': 4000, 'SF': 4000}
+        score = profile.columns['score']
+        assert (score['count'], score['nulls']) == (10800, 1200)
+        assert (score['min'], score['max']) == (0.5, 5999.5)
+        assert abs(score['mean'] - df['score'].mean()) < 1e-6
+        median = score['quantiles']['0.5']
+        assert abs((df['score'].dropna() <= median).mean() - 0.5) <= score['quantile_rank_error']
+        assert abs(profile.columns['id']['distinct'] - n) <= 3 * profile.columns['id']['distinct_error'] * n
+
+        # Reused while the file is unchanged, dropped once it is rewritten
+        assert open_profile(session, profile_dir).columns == profile.columns
+        close_session(path)
+        os.utime(path, ns=(0, 0))
+        assert open_profile(get_session(path), profile_dir) is None
+        close_session(path)
+
+def test_hashing_wide_strings_keeps_memory_bounded():
+    rng = np.random.default_rng(0)
+    text = pa.array(['x' * int(length) + str(i) for i, length in enumerate(rng.integers(0, 8000, 4000))])
+
+    tracemalloc.start()
+    try:
+        hashes = hash_values(text)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    # Hashing every byte at once would take about 30 times the column's size
+    assert peak < text.nbytes / 2
+    # Slices are hashed independently of where they start
+    assert hashes[1000:3000].tolist() == hash_values(text.slice(1000, 2000)).tolist()
+    assert len(set(hashes.tolist())) == len(text)
@@ -0,0 +1,76 @@
+from data.query import to_arrow_filter, run_query, UnsupportedQuery
+from data.parquet_handler import get_session, close_session, Cancelled, ParquetPage
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+import tempfile
+import threading
+import os
+
+def test_to_arrow_filter_matches_pandas_query():
+    df = pd.DataFrame({
+        'age': [20, 30, 40, None, 50],
+        'city': ['NY', 'LA', 'NY', 'SF', None],
+        'home town': ['a', 'b', 'c', 'd', 'e'],
+    })
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    queries = [
+        "age > 25 or city == 'NY'",
+        "25 < age <= 40",
+        "city in ['LA', 'SF'] and not age >= 40",
+        "city.isnull() | (age == 20)",
+        "`home town` != 'c' & ~(city == 'LA')",
+    ]
+    for query in queries:
+        expected = df.query(query)
+        result = table.filter(to_arrow_filter(query, table.column_names)).to_pandas()
+        assert result['home town'].tolist() == expected['home town'].tolist(), query
+
+    with pytest.raises(UnsupportedQuery):
+        to_arrow_filter("age.mean() > 3", table.column_names)
+    with pytest.raises(UnsupportedQuery):
+        to_arrow_filter("missing > 3", table.column_names)
+
+def test_run_query_scans_whole_file_and_pages_result():
+    df = pd.DataFrame({'a': range(10000), 'b': [i % 7 for i in range(10000)]})
+
+    with tempfile.NamedTemporaryFile(suffix='.parquet', delete=False) as f:
+        temp_file = f.name
+
+    try:
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), temp_file, row_group_size=1000)
+        result = run_query(get_session(temp_file), "a >= 9000 and b == 3")
+        expected = df.query("a >= 9000 and b == 3").reset_index(drop=True)
+        assert result.num_rows == len(expected)
+
+        page = ParquetPage(result, offset=10, limit=20)
+        pd.testing.assert_frame_equal(page.to_pandas(), expected.iloc[10:30].reset_index(drop=True))
+        result.close()
+        close_session(temp_file)
+    finally:
+        os.unlink(temp_file)
+
+def test_run_query_reports_row_groups_and_cancels():
+    df = pd.DataFrame({'a': range(10000)})
+
+    with tempfile.NamedTemporaryFile(suffix='.parquet', delete=False) as f:
+        temp_file = f.name
+
+    try:
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), temp_file, row_group_size=1000)
+        session = get_session(temp_file)
+        scanned = []
+        result = run_query(session, "a >= 2500", progress=lambda row_groups, nbytes: scanned.append(row_groups))
+        # Two row groups are pruned by their statistics, the other eight are read
+        assert sum(scanned) == 10
+        assert result.read_range(0, 3).column('a').to_pylist() == [2500, 2501, 2502]
+        result.close()
+
+        cancel = threading.Event()
+        cancel.set()
+        with pytest.raises(Cancelled):
+            run_query(session, "a >= 2500", cancel=cancel)
+        close_session(temp_file)
+    finally:
+        os.unlink(temp_file)
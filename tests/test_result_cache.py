@@ -0,0 +1,49 @@
+from data.result_cache import ResultCache, result_key
+from data.query import run_query
+from data.parquet_handler import get_session, close_session, save_parquet
+import pandas as pd
+import tempfile
+import os
+
+def test_result_cache_reuses_results_and_closes_evicted_ones():
+    df = pd.DataFrame({'a': range(1000)})
+
+    with tempfile.NamedTemporaryFile(suffix='.parquet', delete=False) as f:
+        temp_file = f.name
+
+    try:
+        save_parquet(df, temp_file)
+        session = get_session(temp_file)
+        # Each result below holds 8 bytes per row: 500 rows is 4000 bytes
+        cache = ResultCache(max_bytes=6000)
+
+        key = result_key(session, 'query', "a >= 500")
+        assert key == result_key(session, 'query', "a>=500")
+        assert cache.get(key) is None
+        first = run_query(session, "a >= 500")
+        cache.put(key, first)
+        assert cache.get(key) is first
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        # On screen, so it survives eviction and is closed only once replaced
+        cache.use(first)
+        second = run_query(session, "a < 500")
+        cache.put(result_key(session, 'query', "a < 500"), second)
+        assert key not in cache
+        assert first.num_rows == 500
+        cache.use(second)
+        assert first.num_rows == 0
+        assert second.num_rows == 500
+
+        # A result the cache never held is closed as soon as it is released
+        third = run_query(session, "a < 10")
+        cache.release(third)
+        assert third.num_rows == 0
+
+        cache.use(None)
+        cache.clear()
+        assert second.num_rows == 0
+        assert cache.stats() == {'hits': 0, 'misses': 0, 'results': 0, 'bytes': 0}
+        close_session(temp_file)
+    finally:
+        os.unlink(temp_file)
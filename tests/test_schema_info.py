@@ -0,0 +1,39 @@
+from data.parquet_handler import get_session, close_session, save_parquet
+from data.schema_info import SchemaMetadata, source_column_info
+import pandas as pd
+import tempfile
+import os
+
+def test_column_info_comes_from_footer_and_tracks_edits():
+    df = pd.DataFrame({'a': range(100), 'b': [None if i % 10 == 0 else f"x{i}" for i in range(100)]})
+
+    with tempfile.NamedTemporaryFile(suffix='.parquet', delete=False) as f:
+        temp_file = f.name
+
+    try:
+        save_parquet(df, temp_file)
+        session = get_session(temp_file)
+        info = source_column_info(session)
+        assert info['a']['type'] == 'int64'
+        assert info['a']['nullable'] is False
+        assert info['b']['nullable'] is True
+        assert info['b']['logical_type'] == 'String'
+        assert info['a']['compressed_size'] > 0
+        assert info['a']['encodings']
+
+        metadata = SchemaMetadata(info)
+        metadata.record_value('a', None)
+        assert metadata.get('a')['nullable'] is True
+        assert info['a']['nullable'] is False
+
+        frame = pd.DataFrame({'new': [1.0, float('nan')]})
+        assert metadata.get('new') is None
+        assert metadata.get('new', frame)['nullable'] is True
+        entry = metadata.pop_column('a')
+        assert metadata.get('a') is None
+        metadata.restore_column('a', entry)
+        assert metadata.get('a')['type'] == 'int64'
+    finally:
+        close_session(temp_file)
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
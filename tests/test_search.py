@@ -0,0 +1,29 @@
+from data.parquet_handler import get_session, close_session, save_parquet, ParquetPage
+from data.search import SearchIndex
+import pandas as pd
+import tempfile
+import os
+
+def test_search_index_matches_displayed_text():
+    df = pd.DataFrame({'n': [1, 30, 3], 'f': [3.0, 0.5, None], 's': ['Alpha', 'beta', None]})
+    index = SearchIndex.from_frame(df)
+    positions, masks = index.search('3')
+    assert positions.tolist() == [0, 1, 2]
+    assert masks[0].tolist() == [False, True, True]
+    assert masks[1].tolist() == [True, False, False]
+    assert index.search('ALP')[0].tolist() == [0]
+    assert index.search('nan')[0].tolist() == [2]
+    assert index.search('missing')[0].tolist() == []
+
+    with tempfile.NamedTemporaryFile(suffix='.parquet', delete=False) as f:
+        temp_file = f.name
+    try:
+        save_parquet(df, temp_file)
+        session = get_session(temp_file)
+        page_index = SearchIndex.from_page(ParquetPage(session, 0, 3))
+        for text in ('3', 'alp', 'nan'):
+            assert page_index.search(text)[0].tolist() == index.search(text)[0].tolist()
+        close_session(temp_file)
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
@@ -0,0 +1,21 @@
+from data.sidecar import atomic_write, cache_dir
+import pytest
+import tempfile
+import os
+
+def test_cache_dir_nests_under_the_cache_root(monkeypatch):
+    monkeypatch.setenv('PARQUET_EXPLORER_CACHE', '/tmp/explorer-cache')
+    assert cache_dir('profile') == os.path.join('/tmp/explorer-cache', 'profile')
+
+def test_atomic_write_replaces_only_on_success():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sidecars', 'data.json')
+        with atomic_write(path) as partial, open(partial, 'w') as f:
+            f.write('first')
+        with pytest.raises(RuntimeError):
+            with atomic_write(path) as partial, open(partial, 'w') as f:
+                f.write('half')
+                raise RuntimeError('cancelled')
+        with open(path) as f:
+            assert f.read() == 'first'
+        assert os.listdir(os.path.dirname(path)) == ['data.json']
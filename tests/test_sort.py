@@ -0,0 +1,42 @@
+from data import sort
+from data.sort import sort_indices, sort_source
+from data.parquet_handler import get_session, close_session
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import tempfile
+import os
+
+def test_sort_indices_uses_native_types():
+    values = pd.Series([10, 9, None, 100], dtype='float64')
+    assert sort_indices(values).tolist() == [1, 0, 3, 2]
+    assert sort_indices(values, descending=True).tolist() == [3, 0, 1, 2]
+    assert sort_indices(pa.array(['b', 'a', None]).dictionary_encode()).tolist() == [1, 0, 2]
+    # Mixed objects fall back to ordering by text
+    assert sort_indices(pd.Series([2, 'a', None], dtype=object)).tolist() == [0, 1, 2]
+
+def test_external_sort_merges_spilled_runs(monkeypatch):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'k': rng.integers(0, 500, 5000).astype(float), 'i': range(5000)})
+    df.loc[[3, 70, 4000], 'k'] = np.nan
+
+    with tempfile.NamedTemporaryFile(suffix='.parquet', delete=False) as f:
+        temp_file = f.name
+
+    try:
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), temp_file, row_group_size=300)
+        # Several runs and many merge steps even for a small file
+        monkeypatch.setattr(sort, 'RUN_ROWS', 1000)
+        monkeypatch.setattr(sort, 'MERGE_BATCH_ROWS', 64)
+        for descending in (False, True):
+            result = sort_source(get_session(temp_file), 'k', descending=descending)
+            keys = result.table.column('k').to_pandas()
+            expected = df['k'].sort_values(ascending=not descending, na_position='last')
+            assert keys.tolist()[:-3] == expected.tolist()[:-3]
+            assert keys.iloc[-3:].isna().all()
+            assert sorted(result.table.column('i').to_pylist()) == list(range(5000))
+            result.close()
+        close_session(temp_file)
+    finally:
+        os.unlink(temp_file)
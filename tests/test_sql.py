@@ -0,0 +1,104 @@
+from data.parquet_handler import get_session, close_session, save_parquet, Cancelled
+from data.sql import SqlUnavailable, is_sql, run_sql, sql_available
+import pandas as pd
+import pytest
+import glob
+import tempfile
+import threading
+import os
+
+def test_is_sql():
+    assert is_sql("SELECT * FROM current")
+    assert is_sql("  with t as (select 1) select * from t")
+    assert is_sql("FROM current")
+    assert is_sql("from current where value > 3")
+    assert not is_sql("fromage == 'brie'")
+    assert not is_sql("selected > 3")
+    assert not is_sql("age > 25 or city == 'NY'")
+
+def test_sql_runs_against_the_file():
+    df = pd.DataFrame({'city': ['a', 'b', 'a', 'c'] * 25, 'value': range(100)})
+
+    with tempfile.NamedTemporaryFile(suffix='.parquet', delete=False) as f:
+        temp_file = f.name
+
+    try:
+        save_parquet(df, temp_file)
+        session = get_session(temp_file)
+        query = "SELECT city, sum(value) AS total FROM current WHERE value >= 10 GROUP BY city ORDER BY city"
+        if not sql_available():
+            with pytest.raises(SqlUnavailable):
+                run_sql(session, query)
+            return
+        result = run_sql(session, query)
+        try:
+            assert result.columns == ['city', 'total']
+            expected = df[df.value >= 10].groupby('city').value.sum()
+            assert result.read_range(0, 10).to_pydict() == {'city': list(expected.index), 'total': list(expected)}
+        finally:
+            result.close()
+        close_session(temp_file)
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+
+def test_sql_reports_progress_and_cancels():
+    if not sql_available():
+        pytest.skip("duckdb is not installed")
+    df = pd.DataFrame({'value': range(1000)})
+
+    with tempfile.NamedTemporaryFile(suffix='.parquet', delete=False) as f:
+        temp_file = f.name
+
+    try:
+        save_parquet(df, temp_file)
+        session = get_session(temp_file)
+        scanned = []
+        result = run_sql(session, "SELECT count(*) AS n FROM current",
+                         progress=lambda row_groups, nbytes: scanned.append(row_groups))
+        assert result.read_range(0, 1).to_pydict() == {'n': [1000]}
+        # Finishing counts every row group as scanned
+        assert sum(scanned) == len(session.row_group_offsets) - 1
+        result.close()
+
+        cancel = threading.Event()
+        cancel.set()
+        with pytest.raises(Cancelled):
+            run_sql(session, "SELECT * FROM current", cancel=cancel)
+        close_session(temp_file)
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+
+def test_sql_cancel_interrupts_a_running_query():
+    if not sql_available():
+        pytest.skip("duckdb is not installed")
+    import duckdb
+    df = pd.DataFrame({'value': range(1000)})
+    spills = lambda: set(glob.glob(os.path.join(tempfile.gettempdir(), 'parquet-explorer-sql-*')))
+
+    with tempfile.NamedTemporaryFile(suffix='.parquet', delete=False) as f:
+        temp_file = f.name
+
+    try:
+        save_parquet(df, temp_file)
+        session = get_session(temp_file)
+        before = spills()
+        # An aggregate is interrupted inside DuckDB; a plain select while its rows are spilled
+        for query in ("SELECT sum(a.value * b.range) AS total FROM current a, range(100000000) b",
+                      "SELECT a.value * b.range AS product FROM current a, range(100000000) b"):
+            cancel = threading.Event()
+            timer = threading.Timer(0.2, cancel.set)
+            timer.start()
+            try:
+                with pytest.raises(Cancelled) as raised:
+                    run_sql(session, query, cancel=cancel)
+            finally:
+                timer.cancel()
+            if query.startswith("SELECT sum"):
+                assert isinstance(raised.value.__context__, duckdb.InterruptException)
+            assert spills() == before
+        close_session(temp_file)
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
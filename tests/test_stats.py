@@ -0,0 +1,80 @@
+from data.stats import footer_statistics, PageStatistics
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import tempfile
+import os
+
+def test_footer_statistics_aggregates_row_groups():
+    df = pd.DataFrame({
+        'a': [5, 1, 9, 3, None, 7],
+        'b': ['m', 'z', 'a', 'q', 'k', None],
+    })
+
+    with tempfile.NamedTemporaryFile(suffix='.parquet', delete=False) as f:
+        temp_file = f.name
+
+    try:
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), temp_file, row_group_size=2)
+        stats = footer_statistics(pq.ParquetFile(temp_file).metadata, ['a', 'b'])
+
+        assert stats['a']['min'] == 1 and stats['a']['max'] == 9
+        assert stats['a']['null_count'] == 1
+        assert stats['b']['min'] == 'a' and stats['b']['max'] == 'z'
+        assert stats['b']['null_count'] == 1
+        assert not stats['a']['distinct_exact']
+    finally:
+        os.unlink(temp_file)
+
+def test_page_statistics_follow_edits():
+    df = pd.DataFrame({'a': [5.0, 1.0, 9.0, None], 'b': ['x', 'y', 'x', None]})
+    stats = PageStatistics()
+    stats.build(df)
+
+    def check():
+        for name in df.columns:
+            entry = stats.summary(name, df[name])
+            assert entry['count'] == df[name].count()
+            assert entry['nulls'] == df[name].isna().sum()
+        a = stats.summary('a', df['a'])
+        assert a['min'] == df['a'].min() and a['max'] == df['a'].max()
+        assert abs(a['mean'] - df['a'].mean()) < 1e-9
+        assert abs(a['std'] - df['a'].std()) < 1e-9
+        b = stats.summary('b', df['b'])
+        assert b['unique'] == df['b'].nunique()
+        assert b['freq'] == df['b'].value_counts().max()
+
+    check()
+    # Overwriting the max makes it stale; it is recomputed from the column
+    stats.replace('a', df.at[2, 'a'], 2.0)
+    df.at[2, 'a'] = 2.0
+    stats.replace('b', df.at[1, 'b'], 'x')
+    df.at[1, 'b'] = 'x'
+    check()
+
+    row = pd.Series({'a': 20.0, 'b': 'z'})
+    stats.add_row(row)
+    df = pd.concat([df, row.to_frame().T.astype({'a': float})], ignore_index=True)
+    check()
+
+    stats.remove_row(df.iloc[0])
+    df = df.drop(index=0).reset_index(drop=True)
+    check()
+
+def test_page_statistics_keep_precision_far_from_zero():
+    # Large values with a small spread cancel out in a raw sum of squares
+    df = pd.DataFrame({'a': [1.7e9 + i % 7 for i in range(1000)]})
+    stats = PageStatistics()
+    stats.build(df)
+    assert abs(stats.summary('a', df['a'])['std'] - df['a'].std()) < 1e-6
+
+    for i in range(0, 1000, 3):
+        stats.replace('a', df.at[i, 'a'], df.at[i, 'a'] + 0.5)
+        df.at[i, 'a'] += 0.5
+    stats.add_row(pd.Series({'a': 1.7e9 - 3.0}))
+    df = pd.concat([df, pd.DataFrame({'a': [1.7e9 - 3.0]})], ignore_index=True)
+    stats.remove_row(df.iloc[0])
+    df = df.drop(index=0)
+    entry = stats.summary('a', df['a'])
+    assert abs(entry['mean'] - df['a'].mean()) < 1e-6
+    assert abs(entry['std'] - df['a'].std()) < 1e-6
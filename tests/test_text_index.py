@@ -0,0 +1,36 @@
+from data.parquet_handler import get_session, close_session
+from data.text_index import open_index, index_path
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import tempfile
+import os
+
+def test_text_index_finds_rows_across_row_groups():
+    n = 20000
+    df = pd.DataFrame({'id': np.arange(n), 'name': [f"Item-{i % 997}" for i in range(n)],
+                       'note': [None if i % 5 else f"ünïcode {i}" for i in range(n)]})
+    text_df = df.astype(str).apply(lambda column: column.str.lower())
+    expected = lambda text: np.flatnonzero(text_df.apply(lambda column: column.str.contains(text.lower(), regex=False)).any(axis=1)).tolist()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'data.parquet')
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, row_group_size=3000)
+        session = get_session(path)
+        index_dir = os.path.join(tmp, 'index')
+        assert open_index(session, index_dir) is None
+        index = open_index(session, index_dir, build=True)
+        assert os.path.exists(index_path(session, index_dir)) and index.nbytes > 0
+
+        for text in ('item-996', 'ÜNÏCODE 1995', '1234', 'no such text'):
+            assert index.find(session, text).tolist() == expected(text)
+        # Too short for a trigram: every granule is scanned
+        assert index.find(session, 'm-7').tolist() == expected('m-7')
+
+        # Reused while the file is unchanged, dropped once it is rewritten
+        assert open_index(session, index_dir) is not None
+        close_session(path)
+        os.utime(path, ns=(0, 0))
+        assert open_index(get_session(path), index_dir) is None
+        close_session(path)
@@ -1,14 +1,35 @@
 from PyQt6.QtGui import QUndoCommand
 import pandas as pd
 
+def set_cell(df, row_label, col_name, value):
+    """Assign one cell, adding the value to a categorical column's categories if it is new"""
+    column = df[col_name]
+    if isinstance(column.dtype, pd.CategoricalDtype) and not pd.isna(value) and value not in column.cat.categories:
+        df[col_name] = column.cat.add_categories([value])
+    df.at[row_label, col_name] = value
+
+def set_block(df, row_labels, col_name, values):
+    """Assign values to one column at row_labels, adding new values to a categorical column's categories"""
+    column = df[col_name]
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        new = pd.Index(pd.unique(pd.Series(values))).dropna().difference(column.cat.categories)
+        if len(new):
+            df[col_name] = column.cat.add_categories(new)
+    df.loc[row_labels, col_name] = values
+
+def _row_frame(df, row):
+    """One-row frame to concat into df that keeps categorical columns categorical"""
+    categoricals = {col: dtype for col, dtype in df.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)}
+    return pd.DataFrame([row], columns=df.columns).astype(categoricals)
+
 class EditCommand(QUndoCommand):
     def __init__(self, main_window, index, old_value, new_value):
         super().__init__(f"Edit cell {index.row()},{index.column()}")
         self.mw = main_window
         # Store persistent identifiers
-        # index.row() is position in current view (filtered_df)
+        # index.row() is position in current view, which may be sorted
         # We need the actual dataframe index label
-        row_pos = index.row()
+        row_pos = self.mw.model.source_row(index.row())
         self.row_label = self.mw.filtered_df.index[row_pos]
         self.col_name = self.mw.filtered_df.columns[index.column()]
         
@@ -28,15 +49,52 @@ class EditCommand(QUndoCommand):
         # Here we access them via mw
         
         if self.row_label in self.mw.df.index:
-             self.mw.df.at[self.row_label, self.col_name] = value
+             old_value = self.mw.df.at[self.row_label, self.col_name]
+             set_cell(self.mw.df, self.row_label, self.col_name, value)
+             self.mw.schema_metadata.record_value(self.col_name, value)
+             # The value as stored, after any conversion to the column's dtype
+             self.mw.page_stats.replace(self.col_name, old_value, self.mw.df.at[self.row_label, self.col_name])
              
         if hasattr(self.mw.model, 'main_df') and self.mw.model.main_df is not None:
              # If main_df is different object
              if self.row_label in self.mw.model.main_df.index:
-                 self.mw.model.main_df.at[self.row_label, self.col_name] = value
+                 set_cell(self.mw.model.main_df, self.row_label, self.col_name, value)
 
         self.mw.refresh_view_for_cell(self.row_label, self.col_name)
 
+class PasteCommand(QUndoCommand):
+    def __init__(self, main_window, row_labels, values):
+        """row_labels is a pandas Index; values maps column names to arrays coerced to each column's dtype"""
+        super().__init__(f"Paste {len(row_labels)}x{len(values)} cells")
+        self.mw = main_window
+        self.row_labels = row_labels
+        self.new_values = values
+        self.old_values = {name: self.mw.df.loc[row_labels, name].to_numpy(copy=True) for name in values}
+
+    def redo(self):
+        self._update_dataframe(self.new_values)
+
+    def undo(self):
+        self._update_dataframe(self.old_values)
+
+    def _update_dataframe(self, values):
+        # A filtered view is a separate frame; keep it in step with the page
+        frames = [self.mw.df]
+        if self.mw.filtered_df is not self.mw.df:
+            frames.append(self.mw.filtered_df)
+        for df in frames:
+            keep = self.row_labels.isin(df.index)
+            labels = self.row_labels[keep]
+            for name, column in values.items():
+                if df is self.mw.df:
+                    old_column = df.loc[labels, name].to_numpy(copy=True)
+                set_block(df, labels, name, column[keep])
+                if df is self.mw.df:
+                    self.mw.page_stats.replace_values(name, old_column, df.loc[labels, name].to_numpy())
+        for name, column in values.items():
+            self.mw.schema_metadata.record_values(name, column)
+        self.mw.refresh_view_for_cells(self.row_labels, list(values))
+
 class AddRowCommand(QUndoCommand):
     def __init__(self, main_window, row_idx):
         super().__init__("Add Row")
@@ -50,18 +108,19 @@ class AddRowCommand(QUndoCommand):
         if self.new_row_data is not None:
              new_row = self.new_row_data
         
-        self.mw.df = pd.concat([self.mw.df.iloc[:self.row_idx], 
-                                pd.DataFrame([new_row], columns=self.mw.df.columns), 
-                                self.mw.df.iloc[self.row_idx:]]).reset_index(drop=True)
-        self.mw.filtered_df = self.mw.df # Simplified for now
-        self.mw.update_table()
+        df = pd.concat([self.mw.df.iloc[:self.row_idx], 
+                        _row_frame(self.mw.df, new_row), 
+                        self.mw.df.iloc[self.row_idx:]]).reset_index(drop=True)
+        self.mw.schema_metadata.record_new_row()
+        self.mw.page_stats.add_row(df.iloc[self.row_idx])
+        self.mw.rows_inserted(self.row_idx, 1, df)
 
     def undo(self):
         # Store data before deleting for redo
         self.new_row_data = self.mw.df.iloc[self.row_idx].copy()
-        self.mw.df = self.mw.df.drop(self.mw.df.index[self.row_idx]).reset_index(drop=True)
-        self.mw.filtered_df = self.mw.df
-        self.mw.update_table()
+        self.mw.page_stats.remove_row(self.new_row_data)
+        df = self.mw.df.drop(self.mw.df.index[self.row_idx]).reset_index(drop=True)
+        self.mw.rows_removed([self.row_idx], df)
 
 class DeleteRowCommand(QUndoCommand):
     def __init__(self, main_window, row_indices):
@@ -74,19 +133,19 @@ class DeleteRowCommand(QUndoCommand):
         self.deleted_data = []
         for idx in self.row_indices:
             self.deleted_data.append((idx, self.mw.df.iloc[idx].copy()))
+            self.mw.page_stats.remove_row(self.deleted_data[-1][1])
         
-        self.mw.df = self.mw.df.drop(self.mw.df.index[self.row_indices]).reset_index(drop=True)
-        self.mw.filtered_df = self.mw.df
-        self.mw.update_table()
+        df = self.mw.df.drop(self.mw.df.index[self.row_indices]).reset_index(drop=True)
+        self.mw.rows_removed(self.row_indices, df)
 
     def undo(self):
         # Restore in reverse order of deletion (which is chronological order of addition because we sorted reverse=True)
         for idx, row_data in reversed(self.deleted_data):
-             self.mw.df = pd.concat([self.mw.df.iloc[:idx], 
-                                    pd.DataFrame([row_data], columns=self.mw.df.columns), 
-                                    self.mw.df.iloc[idx:]]).reset_index(drop=True)
-        self.mw.filtered_df = self.mw.df
-        self.mw.update_table()
+             df = pd.concat([self.mw.df.iloc[:idx], 
+                             _row_frame(self.mw.df, row_data), 
+                             self.mw.df.iloc[idx:]]).reset_index(drop=True)
+             self.mw.page_stats.add_row(df.iloc[idx])
+             self.mw.rows_inserted(idx, 1, df)
 
 class AddColumnCommand(QUndoCommand):
     def __init__(self, main_window, col_name, dtype='object'):
@@ -96,14 +155,19 @@ class AddColumnCommand(QUndoCommand):
         self.dtype = dtype
 
     def redo(self):
-        self.mw.df[self.col_name] = pd.Series([None] * len(self.mw.df), dtype=self.dtype)
-        self.mw.filtered_df = self.mw.df
-        self.mw.update_table()
+        # A new frame rather than an in-place insert, so the model sees the column appear
+        df = self.mw.df.assign(**{self.col_name: pd.Series([None] * len(self.mw.df), dtype=self.dtype,
+                                                           index=self.mw.df.index)})
+        self.mw.schema_metadata.add_column(self.col_name, df[self.col_name])
+        self.mw.page_stats.add_column(self.col_name, df[self.col_name])
+        self.mw.column_inserted(len(df.columns) - 1, df)
 
     def undo(self):
-        self.mw.df = self.mw.df.drop(columns=[self.col_name])
-        self.mw.filtered_df = self.mw.df
-        self.mw.update_table()
+        position = self.mw.df.columns.get_loc(self.col_name)
+        df = self.mw.df.drop(columns=[self.col_name])
+        self.mw.schema_metadata.pop_column(self.col_name)
+        self.mw.page_stats.pop_column(self.col_name)
+        self.mw.column_removed(position, df)
 
 class DeleteColumnCommand(QUndoCommand):
     def __init__(self, main_window, col_indices):
@@ -112,16 +176,26 @@ class DeleteColumnCommand(QUndoCommand):
         self.col_indices = col_indices
         self.col_names = [self.mw.df.columns[i] for i in col_indices]
         self.deleted_data = {}
+        self.deleted_metadata = {}
+        self.deleted_stats = {}
+        self.positions = {}
 
     def redo(self):
         for name in self.col_names:
             self.deleted_data[name] = self.mw.df[name].copy()
-        self.mw.df = self.mw.df.drop(columns=self.col_names)
-        self.mw.filtered_df = self.mw.df
-        self.mw.update_table()
+            self.deleted_metadata[name] = self.mw.schema_metadata.pop_column(name)
+            self.deleted_stats[name] = self.mw.page_stats.pop_column(name)
+        # Right to left, so the positions of the columns still to go don't shift
+        for name in sorted(self.col_names, key=self.mw.df.columns.get_loc, reverse=True):
+            position = self.mw.df.columns.get_loc(name)
+            self.positions[name] = position
+            self.mw.column_removed(position, self.mw.df.drop(columns=[name]))
 
     def undo(self):
-        for name in self.col_names:
-            self.mw.df[name] = self.deleted_data[name]
-        self.mw.filtered_df = self.mw.df
-        self.mw.update_table()
+        # Left to right, back where each column was
+        for name in sorted(self.col_names, key=self.positions.get):
+            df = self.mw.df.copy(deep=False)
+            df.insert(self.positions[name], name, self.deleted_data[name])
+            self.mw.schema_metadata.restore_column(name, self.deleted_metadata[name])
+            self.mw.page_stats.restore_column(name, self.deleted_stats[name])
+            self.mw.column_inserted(self.positions[name], df)
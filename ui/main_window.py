@@ -2,14 +2,57 @@ from PyQt6.QtWidgets import *
 from PyQt6.QtCore import *
 from PyQt6.QtGui import *
 
+import bisect
+import weakref
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
-from ui.commands import EditCommand, AddRowCommand, DeleteRowCommand, AddColumnCommand, DeleteColumnCommand
+import pyarrow as pa
+from ui.commands import (EditCommand, PasteCommand, AddRowCommand, DeleteRowCommand, AddColumnCommand,
+                         DeleteColumnCommand, set_cell)
 from ui.styles import get_dark_stylesheet, get_light_stylesheet
 
 import os
-from data.parquet_handler import load_parquet, save_parquet, get_metadata, get_row_count
+from data.parquet_handler import save_parquet, get_metadata, get_field_metadata, Cancelled
+from data.dataset import open_source, is_dataset_path
+from data.page_cache import PageCache, PagePrefetcher, block_bounds
+from data.result_cache import ResultCache, result_key
+from data.query import run_query, to_arrow_filter, UnsupportedQuery
+from data.sql import SqlUnavailable, is_sql, run_sql
+from data.schema_info import SchemaMetadata, source_column_info
+from data.stats import PageStatistics
+from data.profile import open_profile
+from data.search import SearchIndex
+from data.text_index import open_index
+from data.sort import SortResult, sort_indices, sort_source
 from ui.visualization_widget import VisualizationWidget
 from ui.plot_config_widget import PlotConfigWidget
+from ui.workers import Worker
+from utils.formatting import (FormattedCellCache, MAX_DISPLAY_CHARS, format_bytes, format_values, is_numeric,
+                              sample_rows, truncate)
+from utils.timing import FrameTimer
+from utils.clipboard import coerce_texts, parse_tsv, to_tsv
+
+# Model role telling the delegate that a cell contains the search text
+SEARCH_MATCH_ROLE = Qt.ItemDataRole.UserRole + 1
+SEARCH_MATCH_COLOR = QColor(255, 193, 7, 90)
+# Keystrokes closer together than this start one search
+SEARCH_DELAY_MS = 250
+
+# Bounds for the widths estimated from a sample of each column
+MIN_COLUMN_WIDTH = 40
+MAX_COLUMN_WIDTH = 250
+
+class DataTableView(QTableView):
+    """Table view that times every repaint of its cells"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.frame_timer = FrameTimer()
+
+    def paintEvent(self, event):
+        self.frame_timer.start()
+        super().paintEvent(event)
+        self.frame_timer.stop()
 
 class StyledComboBox(QComboBox):
     """Custom combo box with visible dropdown arrow indicator"""
@@ -18,33 +61,72 @@ class StyledComboBox(QComboBox):
         super().paintEvent(event)
 
 class CustomDelegate(QStyledItemDelegate):
+    """Paints cells from pre-elided QStaticText layouts, cached per text, width and font"""
+    MARGIN = 4
+    MAX_LAYOUTS = 20000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._layouts = OrderedDict()
+
+    def layout(self, text, width, font):
+        """Static text for a cell, elided to width; laid out once and reused on every repaint"""
+        key = (text, width, font.key())
+        layout = self._layouts.get(key)
+        if layout is None:
+            layout = QStaticText(QFontMetrics(font).elidedText(text, Qt.TextElideMode.ElideRight, width))
+            layout.setTextFormat(Qt.TextFormat.PlainText)
+            layout.prepare(QTransform(), font)
+            self._layouts[key] = layout
+            if len(self._layouts) > self.MAX_LAYOUTS:
+                self._layouts.popitem(last=False)
+        else:
+            self._layouts.move_to_end(key)
+        return layout
+
+    def clear_cache(self):
+        self._layouts.clear()
+
     def paint(self, painter, option, index):
         """Custom painting for table cells with improved styling"""
-        painter.save()
-        
+        rect = option.rect
+        if painter.hasClipping() and not painter.clipBoundingRect().intersects(QRectF(rect)):
+            return  # Outside the area being repainted
+
         # Draw background
         if option.state & QStyle.StateFlag.State_Selected:
-            painter.fillRect(option.rect, option.palette.highlight())
+            painter.fillRect(rect, option.palette.highlight())
             text_color = option.palette.highlightedText().color()
         else:
             # Handle alternating background colors
             if index.row() % 2 == 1:
-                painter.fillRect(option.rect, option.palette.alternateBase())
+                painter.fillRect(rect, option.palette.alternateBase())
             else:
-                painter.fillRect(option.rect, option.palette.base())
+                painter.fillRect(rect, option.palette.base())
+            if index.model().data(index, SEARCH_MATCH_ROLE):
+                painter.fillRect(rect, SEARCH_MATCH_COLOR)
             text_color = option.palette.text().color()
-        
-        # Draw text
+
+        width = rect.width() - 2 * self.MARGIN
+        model = index.model()
+        text = model.data(index, Qt.ItemDataRole.DisplayRole)
+        if width <= 0 or not text:
+            return
+
+        # The painter is shared by every cell of the frame: only touch the state that differs
+        if painter.font() != option.font:
+            painter.setFont(option.font)
         painter.setPen(text_color)
-        painter.setFont(option.font)
-        
-        # Draw cell text with proper padding
-        text = str(index.data(Qt.ItemDataRole.DisplayRole) or "")
-        margin = 4
-        text_rect = option.rect.adjusted(margin, 0, -margin, 0)
-        painter.drawText(text_rect, Qt.TextFlag.TextDontClip | Qt.AlignmentFlag.AlignVCenter, text)
-        painter.restore()
-    
+        layout = self.layout(str(text), width, option.font)
+        size = layout.size()
+        y = rect.top() + (rect.height() - size.height()) / 2
+        alignment = model.data(index, Qt.ItemDataRole.TextAlignmentRole)
+        if alignment is not None and alignment & Qt.AlignmentFlag.AlignRight:
+            x = rect.left() + self.MARGIN + width - size.width()
+        else:
+            x = rect.left() + self.MARGIN
+        painter.drawStaticText(QPointF(x, y), layout)
+
     def createEditor(self, parent, option, index):
         """Create editor widget with better styling"""
         editor = QLineEdit(parent)
@@ -54,9 +136,8 @@ class CustomDelegate(QStyledItemDelegate):
         """Set editor data with full text for editing"""
         if isinstance(editor, QLineEdit):
             # Get full text for editing
-            source_index = index.model().mapToSource(index)
-            full_value = str(source_index.model().df.iloc[source_index.row(), source_index.column()])
-            editor.setText(full_value)
+            full_value = index.data(Qt.ItemDataRole.EditRole)
+            editor.setText("" if full_value is None else str(full_value))
             editor.selectAll()  # Select all text for convenience
     
     def setModelData(self, editor, model, index):
@@ -70,52 +151,268 @@ class CustomDelegate(QStyledItemDelegate):
             else:
                 model.setData(index, editor.text(), Qt.ItemDataRole.EditRole)
 
+def column_tooltip(meta):
+    text = f"Type: {meta['type']}, Nullable: {meta['nullable']}"
+    if meta.get('logical_type'):
+        text += f"\nLogical type: {meta['logical_type']}"
+    if meta.get('encodings'):
+        text += f"\nEncodings: {meta['encodings']}"
+    if meta.get('compression'):
+        text += f"\nCompression: {meta['compression']}"
+    if meta.get('compressed_size') is not None:
+        text += (f"\nSize: {format_bytes(meta['compressed_size'])} compressed, "
+                 f"{format_bytes(meta['uncompressed_size'])} uncompressed")
+    return text
+
 class DataFrameModel(QAbstractTableModel):
-    def __init__(self, df, main_df, main_window=None):
+    def __init__(self, df, main_df, main_window=None, page=None):
         super().__init__()
+        # df is None while the view is backed by a lazily decoded ParquetPage
         self.df = df
         self.main_df = main_df
         self.main_window = main_window
-
-    def rowCount(self, parent):
+        self.page = page
+        # View row -> row of df or page after a header sort; None while unsorted
+        self.order = None
+        self._view_rows = None
+        # Cell text is formatted a block of rows at a time, not once per paint
+        self.formatter = FormattedCellCache(self.fetch_block)
+        self._alignments = {}
+        # Per column, which rows of df contain the search text; None when nothing is highlighted
+        self.matches = None
+
+    def is_lazy(self):
+        return self.df is None and self.page is not None
+
+    def source_row(self, row):
+        return row if self.order is None else int(self.order[row])
+
+    def view_row(self, row):
+        if self.order is None:
+            return row
+        if self._view_rows is None:
+            self._view_rows = np.empty_like(self.order)
+            self._view_rows[self.order] = np.arange(len(self.order))
+        return int(self._view_rows[row])
+
+    def set_frame(self, df, main_df, page=None):
+        """Show other data (new page, search, query) with one model reset instead of a new model"""
+        self.beginResetModel()
+        self.df = df
+        self.main_df = main_df
+        self.page = page
+        self.order = None
+        self._view_rows = None
+        self.matches = None
+        self.formatter.clear()
+        self._alignments.clear()
+        self.endResetModel()
+
+    def set_matches(self, matches):
+        """Highlight search matches: one boolean array per column over the rows of df"""
+        self.matches = matches
+        if self.rowCount() and self.columnCount():
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, self.columnCount() - 1),
+                                  [SEARCH_MATCH_ROLE])
+
+    def insert_rows(self, position, count, df):
+        """Show df: the current frame with count rows inserted before row position
+
+        In a sorted view the rows are added at the bottom; re-sorting moves them into place.
+        """
+        view = position if self.order is None else len(self.order)
+        self.beginInsertRows(QModelIndex(), view, view + count - 1)
+        if self.order is not None:
+            shifted = np.where(self.order >= position, self.order + count, self.order)
+            self.order = np.concatenate([shifted, np.arange(position, position + count)])
+            self._view_rows = None
+        self.df = self.main_df = df
+        self.matches = None
+        self.formatter.clear()
+        self.endInsertRows()
+
+    def remove_rows(self, positions, df):
+        """Show df: the current frame without the rows at positions"""
+        views = sorted((self.view_row(position) for position in positions), reverse=True)
+        # One signal per contiguous block of view rows, bottom-up so earlier rows keep their numbers
+        runs = []
+        for view in views:
+            if runs and runs[-1][0] == view + 1:
+                runs[-1][0] = view
+            else:
+                runs.append([view, view])
+        for first, last in runs:
+            self.beginRemoveRows(QModelIndex(), first, last)
+            if self.order is None:
+                removed = np.arange(first, last + 1)
+            else:
+                removed = self.order[first:last + 1]
+                kept = np.delete(self.order, np.arange(first, last + 1))
+                self.order = kept - np.searchsorted(np.sort(removed), kept)
+                self._view_rows = None
+            keep = np.ones(len(self.df), dtype=bool)
+            keep[removed] = False
+            self.df = self.main_df = self.df[keep]
+            self.matches = None
+            self.formatter.clear()
+            self.endRemoveRows()
+        # Same rows as the step-by-step frame, with the caller's index
+        self.df = self.main_df = df
+
+    def insert_column(self, position, df):
+        """Show df: the current frame with one column inserted at position"""
+        self.beginInsertColumns(QModelIndex(), position, position)
+        self.df = self.main_df = df
+        self.matches = None
+        self.formatter.clear()
+        self._alignments.clear()
+        self.endInsertColumns()
+
+    def remove_column(self, position, df):
+        """Show df: the current frame without the column at position"""
+        self.beginRemoveColumns(QModelIndex(), position, position)
+        self.df = self.main_df = df
+        self.matches = None
+        self.formatter.clear()
+        self._alignments.clear()
+        self.endRemoveColumns()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """Sort the page by a column on its native type, as a permutation the model reads through"""
+        if column < 0 or column >= self.columnCount():
+            return
+        if self.is_lazy():
+            values = self.page.column(self.page.columns[column])
+        else:
+            values = self.df.iloc[:, column]
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        sources = [self.source_row(index.row()) for index in persistent]
+        self.order = sort_indices(values, descending=order == Qt.SortOrder.DescendingOrder)
+        self._view_rows = None
+        self.formatter.clear()
+        self.changePersistentIndexList(persistent, [self.index(self.view_row(row), index.column())
+                                                    for row, index in zip(sources, persistent)])
+        self.layoutChanged.emit()
+        if self.main_window:
+            self.main_window.page_sort = (self.column_name(column), order)
+
+    def rowCount(self, parent=QModelIndex()):
+        if self.is_lazy():
+            return self.page.num_rows
         return len(self.df)
 
-    def columnCount(self, parent):
+    def columnCount(self, parent=QModelIndex()):
+        if self.is_lazy():
+            return len(self.page.columns)
         return len(self.df.columns)
 
+    def column_name(self, section):
+        if self.is_lazy():
+            return self.page.columns[section]
+        return self.df.columns[section]
+
+    def fetch_block(self, col, start, stop):
+        if self.order is not None:
+            rows = self.order[start:stop]
+            if self.is_lazy():
+                return self.page.column(self.page.columns[col]).take(pa.array(rows))
+            return self.df.iloc[rows, col]
+        if self.is_lazy():
+            return self.page.column(self.page.columns[col]).slice(start, stop - start)
+        return self.df.iloc[start:stop, col]
+
+    def invalidate_cell(self, row, col):
+        self.formatter.invalidate_cell(row, col)
+
+    def column_type(self, col):
+        if self.is_lazy():
+            return self.page.schema.field(self.page.columns[col]).type
+        return self.df.dtypes.iloc[col]
+
+    def sample_texts(self, col):
+        """Display text of a sample of the column's rows, or None while it isn't decoded"""
+        rows = sample_rows(self.rowCount())
+        if self.is_lazy():
+            name = self.page.columns[col]
+            if not self.page.is_loaded(name):
+                return None
+            values = self.page.column(name).take(pa.array(rows))
+        else:
+            values = self.df.iloc[rows, col]
+        return [truncate(text) for text in format_values(values)]
+
+    def column_texts(self, col, rows):
+        """Full text of one column at view rows, formatted in one pass"""
+        positions = np.asarray(rows) if self.order is None else self.order[rows]
+        if self.is_lazy():
+            name = self.page.columns[col]
+            self.page.load([name])
+            return format_values(self.page.column(name).take(pa.array(positions)))
+        return format_values(self.df.iloc[positions, col])
+
+    def alignment(self, col):
+        # Numbers are right-aligned; decided once per column from its type, not per cell
+        alignment = self._alignments.get(col)
+        if alignment is None:
+            numeric = is_numeric(self.column_type(col))
+            horizontal = Qt.AlignmentFlag.AlignRight if numeric else Qt.AlignmentFlag.AlignLeft
+            alignment = self._alignments[col] = horizontal | Qt.AlignmentFlag.AlignVCenter
+        return alignment
+
     def data(self, index, role):
-        value = str(self.df.iloc[index.row(), index.column()])
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return self.alignment(index.column())
+        if role == SEARCH_MATCH_ROLE:
+            return self.matches is not None and bool(self.matches[index.column()][self.source_row(index.row())])
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+        if self.is_lazy() and not self.page.is_loaded(self.page.columns[index.column()]):
+            # Decoded once the column scrolls into view
+            return "…" if role == Qt.ItemDataRole.DisplayRole else None
         if role == Qt.ItemDataRole.DisplayRole:
-            if len(value) > 50:  # Truncate long text
-                return value[:47] + "..."
-            return value
-        elif role == Qt.ItemDataRole.EditRole:
+            return self.formatter.display_text(index.row(), index.column())  # Truncated long text
+        value = self.formatter.full_text(index.row(), index.column())
+        if role == Qt.ItemDataRole.EditRole:
             return value  # Return full text for editing
-        elif role == Qt.ItemDataRole.ToolTipRole:
-            if len(value) > 50:
-                return value  # Show full text in tooltip
-            return None
+        if len(value) > MAX_DISPLAY_CHARS:
+            return value  # Show full text in tooltip
+        return None
 
     def headerData(self, section, orientation, role):
+        if orientation == Qt.Orientation.Horizontal and section >= self.columnCount():
+            return None  # The header may still ask about the previous model's sections
         if role == Qt.ItemDataRole.DisplayRole:
             if orientation == Qt.Orientation.Horizontal:
-                return self.df.columns[section]
+                return self.column_name(section)
             return str(section + 1)
         elif role == Qt.ItemDataRole.ToolTipRole:
             if orientation == Qt.Orientation.Horizontal:
-                meta = get_metadata(self.df, section)
-                return f"Type: {meta['type']}, Nullable: {meta['nullable']}"
+                name = self.column_name(section)
+                meta = None
+                if self.main_window:
+                    # Built once per load; a hover never scans the column
+                    meta = self.main_window.schema_metadata.get(name, None if self.is_lazy() else self.df)
+                if meta is None:
+                    meta = get_field_metadata(self.page.schema, name) if self.is_lazy() else get_metadata(self.df, section)
+                return column_tooltip(meta)
 
     def setData(self, index, value, role):
         if role == Qt.ItemDataRole.EditRole:
+            if self.is_lazy():
+                # Editing needs every column of the page; this rebinds df and main_df
+                self.main_window.materialize_page()
             if self.main_window:
                 self.main_window._manual_dirty = True
 
-            row_idx = self.df.index[index.row()]
+            row_idx = self.df.index[self.source_row(index.row())]
             col = self.df.columns[index.column()]
             dtype = self.df[col].dtype # Use df dtype as fallback
             if self.main_df is not None and col in self.main_df.columns:
                  dtype = self.main_df[col].dtype
+            if isinstance(dtype, pd.CategoricalDtype):
+                # Coerce to the categories' type; unseen values become new categories
+                dtype = dtype.categories.dtype
 
             try:
                 if dtype == 'int64':
@@ -126,9 +423,10 @@ class DataFrameModel(QAbstractTableModel):
                     value = str(value)
                 
                 # Capture old value for undo
-                old_value = self.df.iloc[index.row(), index.column()]
+                old_value = self.df.iloc[self.source_row(index.row()), index.column()]
                 
-                if self.main_window and self.main_window.undo_stack:
+                # An empty QUndoStack is falsy, so compare with None
+                if self.main_window and self.main_window.undo_stack is not None:
                     command = EditCommand(self.main_window, index, old_value, value)
                     self.main_window.undo_stack.push(command)
                     self.main_window.update_window_title()
@@ -142,16 +440,247 @@ class DataFrameModel(QAbstractTableModel):
         return False
 
     def set_data_internal(self, index, value):
-        row_idx = self.df.index[index.row()]
+        row_idx = self.df.index[self.source_row(index.row())]
         col = self.df.columns[index.column()]
-        self.main_df.loc[row_idx, col] = value
-        self.df.loc[row_idx, col] = value
+        old_value = self.df.at[row_idx, col]
+        set_cell(self.main_df, row_idx, col, value)
+        set_cell(self.df, row_idx, col, value)
+        if self.main_window:
+            self.main_window.schema_metadata.record_value(col, value)
+            self.main_window.page_stats.replace(col, old_value, self.df.at[row_idx, col])
+        self.invalidate_cell(index.row(), index.column())
         self.dataChanged.emit(index, index)
         return True
 
     def flags(self, index):
         return Qt.ItemFlag.ItemIsEditable | Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
 
+class VirtualTableModel(QAbstractTableModel):
+    """Every row of a source, decoded a block at a time as it scrolls into view.
+
+    Qt views slow to a crawl past a few million rows, so the model exposes a
+    window of WINDOW_ROWS rows starting at window_start, which MainWindow moves
+    as the user scrolls. Blocks follow row groups and live in the shared
+    PageCache; rows whose block isn't decoded yet show a placeholder.
+    """
+    WINDOW_ROWS = 1000000
+
+    def __init__(self, source, page_cache, main_window=None):
+        super().__init__()
+        self.source = source
+        self.page_cache = page_cache
+        self.main_window = main_window
+        self.columns = list(source.columns)
+        self.bounds = block_bounds(source.row_group_offsets)
+        self.window_start = 0
+        self.formatter = FormattedCellCache(self.fetch_block, max_blocks=1024)
+        self.alignments = [(Qt.AlignmentFlag.AlignRight if is_numeric(source.schema.field(name).type)
+                            else Qt.AlignmentFlag.AlignLeft) | Qt.AlignmentFlag.AlignVCenter
+                           for name in self.columns]
+        # Pages are owned by the cache; once it evicts one the block reads as not loaded.
+        # The blocks under the viewport, plus the margin request_rows() loads, are also held
+        # here, so a trim on a worker thread never evicts the rows on screen.
+        self._pages = weakref.WeakValueDictionary()
+        self._pinned_blocks = range(0)
+        self._pinned_pages = {}
+        self.evicted = False
+        self.worker = None
+
+    def is_lazy(self):
+        return True
+
+    @property
+    def num_rows(self):
+        return self.source.num_rows
+
+    def rowCount(self, parent=QModelIndex()):
+        return min(self.num_rows, self.WINDOW_ROWS)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.columns)
+
+    def column_name(self, section):
+        return self.columns[section]
+
+    def column_type(self, col):
+        return self.source.schema.field(self.columns[col]).type
+
+    def sample_texts(self, col):
+        """Display text of a sample of the first decoded block of the column, or None before one is"""
+        name = self.columns[col]
+        for page in list(self._pages.values()):
+            if page.is_loaded(name):
+                values = page.column(name)
+                return [truncate(text) for text in format_values(values.take(pa.array(sample_rows(len(values)))))]
+        return None
+
+    def column_texts(self, col, rows):
+        """Full text of one column at window rows; decode their blocks first (see missing_blocks()),
+        as rows whose block isn't decoded are empty"""
+        rows = np.asarray(rows) + self.window_start
+        name = self.columns[col]
+        texts = [""] * len(rows)
+        blocks = np.searchsorted(self.bounds, rows, side='right') - 1
+        for block in np.unique(blocks):
+            page = self._pages.get(int(block))
+            if page is None or not page.is_loaded(name):
+                continue
+            where = np.flatnonzero(blocks == block)
+            values = page.column(name).take(pa.array(rows[where] - self.bounds[block]))
+            for i, text in zip(where, format_values(values)):
+                texts[i] = text
+        return texts
+
+    def missing_blocks(self, rows, names):
+        """Blocks holding any of the window rows where a column in names isn't decoded"""
+        blocks = np.unique(np.searchsorted(self.bounds, np.asarray(rows) + self.window_start, side='right') - 1)
+        return [int(block) for block in blocks
+                if not all(self.is_loaded(self.bounds[block], self.bounds[block + 1], name) for name in names)]
+
+    def decode_blocks(self, blocks, names, progress, cancel):
+        """Runs on a worker thread: decode names in every block, as {block: page}"""
+        pages = {}
+        for block in blocks:
+            if cancel.is_set():
+                raise Cancelled()
+            start, stop = self.bounds[block], self.bounds[block + 1]
+            page = self.page_cache.page(self.source, start, stop - start, count=False)
+            page.load(names, cancel=cancel)
+            pages[block] = page
+            progress(1, page.nbytes())
+        return pages
+
+    def add_pages(self, pages):
+        for block, page in pages.items():
+            self._pages[block] = page
+
+    def set_window_start(self, row):
+        row = max(0, min(row, self.num_rows - self.rowCount()))
+        if row != self.window_start:
+            self.beginResetModel()
+            self.window_start = row
+            self.endResetModel()
+
+    def block_of(self, row):
+        return bisect.bisect_right(self.bounds, row) - 1
+
+    def is_loaded(self, start, stop, name):
+        for block in range(self.block_of(start), self.block_of(stop - 1) + 1):
+            page = self._pages.get(block)
+            if page is None or not page.is_loaded(name):
+                return False
+        return True
+
+    def fetch_block(self, col, start, stop):
+        stop = min(stop, self.num_rows)
+        name = self.columns[col]
+        pieces = []
+        for block in range(self.block_of(start), self.block_of(stop - 1) + 1):
+            first, last = max(start, self.bounds[block]), min(stop, self.bounds[block + 1])
+            page = self._pages.get(block)
+            if page is None or not page.is_loaded(name):
+                # Evicted since is_loaded() was checked; show the placeholder until it is decoded again
+                self.evicted = True
+                return pa.array(["…"] * (stop - start))
+            pieces.append(page.column(name).slice(first - self.bounds[block], last - first))
+        return pieces[0] if len(pieces) == 1 else pa.chunked_array(pieces)
+
+    def data(self, index, role):
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return self.alignments[index.column()]
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+        row = self.window_start + index.row()
+        col = index.column()
+        if not self.formatter.has_block(row, col):
+            start = row - row % self.formatter.block_rows
+            if not self.is_loaded(start, min(start + self.formatter.block_rows, self.num_rows), self.columns[col]):
+                # Decoded once the scrolling stops here
+                return "…" if role == Qt.ItemDataRole.DisplayRole else None
+        self.evicted = False
+        text = (self.formatter.display_text if role == Qt.ItemDataRole.DisplayRole else self.formatter.full_text)(row, col)
+        if self.evicted:
+            # Don't keep the placeholder as the formatted text of the block
+            self.formatter.discard_block(row, col)
+            return text if role == Qt.ItemDataRole.DisplayRole else None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole) or len(text) > MAX_DISPLAY_CHARS:
+            return text
+        return None
+
+    def headerData(self, section, orientation, role):
+        if role == Qt.ItemDataRole.DisplayRole:
+            if orientation == Qt.Orientation.Horizontal:
+                return self.columns[section]
+            return str(self.window_start + section + 1)
+        elif role == Qt.ItemDataRole.ToolTipRole:
+            if orientation == Qt.Orientation.Horizontal:
+                name = self.columns[section]
+                meta = self.main_window.schema_metadata.get(name) if self.main_window else None
+                return column_tooltip(meta or get_field_metadata(self.source.schema, name))
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        # Sorting every row means an external sort of the whole source, on a worker
+        if self.main_window and 0 <= column < self.columnCount():
+            self.main_window.sort_whole_source(self.columns[column], order)
+
+    def flags(self, index):
+        # A read-only view of the file; edits happen page by page
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def request_rows(self, first, last, names):
+        """Decode names for the blocks covering rows first..last, plus one block either side"""
+        first_block = max(self.block_of(first) - 1, 0)
+        last_block = min(self.block_of(last) + 1, len(self.bounds) - 2)
+        # Pins follow the viewport; blocks left behind go back under the cache's budget
+        self._pinned_blocks = range(first_block, last_block + 1)
+        self._pinned_pages = {block: page for block, page in list(self._pages.items()) if block in self._pinned_blocks}
+        blocks = [block for block in range(first_block, last_block + 1)
+                  if not all(self.is_loaded(self.bounds[block], self.bounds[block + 1], name) for name in names)]
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+        if not blocks or not names:
+            return
+        self.worker = Worker(self.load_blocks, blocks, list(names))
+        self.worker.signals.progress.connect(self.on_block_loaded)
+        self.worker.signals.finished.connect(lambda _, worker=self.worker: self.end_load(worker))
+        self.worker.signals.cancelled.connect(lambda worker=self.worker: self.end_load(worker))
+        self.worker.signals.failed.connect(lambda error, worker=self.worker: self.end_load(worker, error))
+        self.worker.start()
+
+    def load_blocks(self, blocks, names, progress, cancel):
+        """Runs on a worker thread, nearest blocks first"""
+        for block in blocks:
+            if cancel.is_set():
+                raise Cancelled()
+            start, stop = self.bounds[block], self.bounds[block + 1]
+            page = self.page_cache.page(self.source, start, stop - start, count=False)
+            page.load(names, cancel=cancel)
+            progress(block, page)
+
+    def on_block_loaded(self, block, page):
+        self._pages[block] = page
+        if block in self._pinned_blocks:
+            self._pinned_pages[block] = page
+        self.page_cache.trim()
+        first = max(self.bounds[block] - self.window_start, 0)
+        last = min(self.bounds[block + 1] - self.window_start, self.rowCount()) - 1
+        if first <= last:
+            self.dataChanged.emit(self.index(first, 0), self.index(last, self.columnCount() - 1))
+        if self.main_window:
+            self.main_window.size_visible_columns()
+
+    def end_load(self, worker, error=None):
+        if worker is self.worker:
+            self.worker = None
+        if error is not None and self.main_window:
+            self.main_window.status_bar.showMessage(f"Failed to load rows: {error}", 5000)
+
+    def cancel(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+
 class MainWindow(QMainWindow):
     def __init__(self, file_path=None):
         super().__init__()
@@ -161,11 +690,46 @@ class MainWindow(QMainWindow):
         if os.path.exists(icon_path):
             self.setWindowIcon(QIcon(icon_path))
         self.setGeometry(100, 100, 1200, 800)
+        self.model = None
+        self.page = None
+        self.pinned_columns = set()
+        # Built on a worker on the first search of a page, dropped when the page changes
+        self.search_index = None
+        self.search_worker = None
+        # Whole-file find: the file's sidecar index, the rows found and the one shown
+        self.text_index = None
+        self.index_worker = None
+        self.find_text = ""
+        self.find_hits = None
+        self.find_hit = -1
+        # Whole-file profile: loaded from its sidecar with the file, or built on request
+        self.file_profile = None
+        self.profile_worker = None
         self.df = pd.DataFrame()
         self.filtered_df = self.df
         self.current_file_path = None
-        self.proxy = QSortFilterProxyModel()
-        self.original_df = None
+        self.session = None
+        self.session_column_info = {}
+        self.schema_metadata = SchemaMetadata()
+        # Running per-column statistics of the page, built on request and kept current by edits
+        self.page_stats = PageStatistics()
+        self.query_result = None
+        self.load_worker = None
+        # The load_worker running a query, while the Execute button offers to cancel it
+        self.query_worker = None
+        self.memory_map = False
+        self.read_dictionary = True
+        self.continuous_scroll = False
+        self._syncing_scroll = False
+        # Estimated column widths by (page, name, type), and the names sized since the last reset
+        self.column_widths = {}
+        self.sized_columns = set()
+        # (column name, Qt.SortOrder) of the header sort of the current page
+        self.page_sort = None
+        self.page_cache = PageCache()
+        self.prefetcher = PagePrefetcher(self.page_cache, depth=1)
+        # Query results by file version and query text, so repeating a query is instant
+        self.result_cache = ResultCache()
         self.undo_stack = QUndoStack(self)
         self.undo_stack.cleanChanged.connect(lambda _: self.update_window_title())
         self.undo_stack.indexChanged.connect(lambda _: self.update_window_title())
@@ -184,6 +748,13 @@ class MainWindow(QMainWindow):
         self.status_bar = self.statusBar()
         self.row_col_label = QLabel()
         self.status_bar.addPermanentWidget(self.row_col_label)
+        # Repaint cost of the table, shown from View > Paint Timing
+        self.paint_time_label = QLabel()
+        self.paint_time_label.setVisible(False)
+        self.status_bar.addPermanentWidget(self.paint_time_label)
+        self.paint_time_timer = QTimer(self)
+        self.paint_time_timer.setInterval(500)
+        self.paint_time_timer.timeout.connect(self.update_paint_time)
         
         # Compact Font Zoom Controls in Status Bar
         zoom_in_btn = QPushButton("A+")
@@ -217,7 +788,7 @@ class MainWindow(QMainWindow):
         self.total_rows = 0
         self.create_pagination_controls()
 
-        if file_path and os.path.exists(file_path):
+        if file_path and (os.path.exists(file_path) or is_dataset_path(file_path)):
             self.load_data(file_path)
         elif os.path.exists('sample.parquet'):
             self.load_data('sample.parquet')
@@ -225,6 +796,37 @@ class MainWindow(QMainWindow):
         self.apply_current_style()
         self.status_bar.showMessage("Ready")
 
+    @property
+    def df(self):
+        """The current page as a DataFrame; decodes all remaining page columns on first use"""
+        if self._df is None:
+            return self.materialize_page()
+        return self._df
+
+    @df.setter
+    def df(self, value):
+        self._df = value
+        self.invalidate_search()
+
+    @property
+    def filtered_df(self):
+        if self._filtered_df is None:
+            return self.df
+        return self._filtered_df
+
+    @filtered_df.setter
+    def filtered_df(self, value):
+        self._filtered_df = value
+
+    def materialize_page(self):
+        """Decode every column of the lazily loaded page for pandas-only features"""
+        if self._df is None:
+            self._df = self.page.to_pandas() if self.page is not None else pd.DataFrame()
+            if isinstance(self.model, DataFrameModel) and self.model.is_lazy():
+                self.model.df = self.model.main_df = self._df
+                self.model.formatter.clear()
+        return self._df
+
     def create_menu(self):
         menu_bar = self.menuBar()
         file_menu = menu_bar.addMenu("File")
@@ -232,6 +834,10 @@ class MainWindow(QMainWindow):
         open_action.setShortcut(QKeySequence.StandardKey.Open)
         open_action.triggered.connect(self.open_file)
         file_menu.addAction(open_action)
+        open_folder_action = QAction("Open Folder...", self)
+        open_folder_action.setToolTip("Open a directory of Parquet files, including Hive key=value partitions")
+        open_folder_action.triggered.connect(self.open_folder)
+        file_menu.addAction(open_folder_action)
         save_action = QAction("Save", self)
         save_action.setShortcut(QKeySequence.StandardKey.Save)
         save_action.triggered.connect(self.save_file)
@@ -243,6 +849,16 @@ class MainWindow(QMainWindow):
         export_action = QAction("Export", self)
         export_action.triggered.connect(self.export_file)
         file_menu.addAction(export_action)
+        file_menu.addSeparator()
+        mmap_action = QAction("Memory-Map Files", self, checkable=True)
+        mmap_action.setToolTip("Map opened Parquet files into memory instead of buffered reads")
+        mmap_action.toggled.connect(self.set_memory_map)
+        file_menu.addAction(mmap_action)
+        dictionary_action = QAction("Read Dictionary Columns as Categories", self, checkable=True)
+        dictionary_action.setChecked(self.read_dictionary)
+        dictionary_action.setToolTip("Keep low-cardinality dictionary-encoded string columns as categoricals")
+        dictionary_action.toggled.connect(self.set_read_dictionary)
+        file_menu.addAction(dictionary_action)
 
         edit_menu = menu_bar.addMenu("Edit")
         
@@ -260,11 +876,39 @@ class MainWindow(QMainWindow):
         copy_action.setShortcut(QKeySequence.StandardKey.Copy)
         copy_action.triggered.connect(self.copy_selection)
         edit_menu.addAction(copy_action)
+
+        paste_action = QAction("Paste", self)
+        paste_action.setShortcut(QKeySequence.StandardKey.Paste)
+        paste_action.triggered.connect(self.paste_selection)
+        edit_menu.addAction(paste_action)
         select_all_action = QAction("Select All", self)
         select_all_action.setShortcut(QKeySequence.StandardKey.SelectAll)
         select_all_action.triggered.connect(self.select_all)
         edit_menu.addAction(select_all_action)
 
+        edit_menu.addSeparator()
+
+        find_action = QAction("Find in File...", self)
+        find_action.setShortcut(QKeySequence("Ctrl+Shift+F"))
+        find_action.setToolTip("Find text in every row of the file using a search index saved for the file")
+        find_action.triggered.connect(self.find_in_file)
+        edit_menu.addAction(find_action)
+
+        find_next_action = QAction("Find Next", self)
+        find_next_action.setShortcut(QKeySequence.StandardKey.FindNext)
+        find_next_action.triggered.connect(lambda: self.go_to_hit(self.find_hit + 1))
+        edit_menu.addAction(find_next_action)
+
+        find_previous_action = QAction("Find Previous", self)
+        find_previous_action.setShortcut(QKeySequence.StandardKey.FindPrevious)
+        find_previous_action.triggered.connect(lambda: self.go_to_hit(self.find_hit - 1))
+        edit_menu.addAction(find_previous_action)
+
+        build_index_action = QAction("Build File Search Index", self)
+        build_index_action.setToolTip("Index the whole file in the background so Find in File is fast")
+        build_index_action.triggered.connect(lambda: self.run_text_index())
+        edit_menu.addAction(build_index_action)
+
         view_menu = menu_bar.addMenu("View")
         self.query_action = QAction("Query Panel", self)
         self.query_action.setCheckable(True)
@@ -277,6 +921,19 @@ class MainWindow(QMainWindow):
         self.stats_action.setChecked(True)
         self.stats_action.triggered.connect(lambda: self.stats_dock.setVisible(self.stats_action.isChecked()))
         view_menu.addAction(self.stats_action)
+        self.profile_action = QAction("Profile Entire File", self)
+        self.profile_action.setToolTip("Scan every row group once for distinct counts, quantiles and frequent values")
+        self.profile_action.triggered.connect(self.profile_file)
+        view_menu.addAction(self.profile_action)
+        continuous_action = QAction("Continuous Scrolling", self, checkable=True)
+        continuous_action.setChecked(self.continuous_scroll)
+        continuous_action.setToolTip("Scroll through every row of the file instead of one page at a time (read-only)")
+        continuous_action.toggled.connect(self.set_continuous_scroll)
+        view_menu.addAction(continuous_action)
+        paint_time_action = QAction("Paint Timing", self, checkable=True)
+        paint_time_action.setToolTip("Show how long the table takes to repaint")
+        paint_time_action.toggled.connect(self.set_paint_timing)
+        view_menu.addAction(paint_time_action)
         
         theme_menu = view_menu.addMenu("Theme")
         
@@ -313,23 +970,124 @@ class MainWindow(QMainWindow):
         else: # Auto
             # Default to dark theme for modern appearance
             app.setStyleSheet(get_dark_stylesheet(font_size=self.base_font_size))
+        # Layouts for the previous font are never drawn again; time the new style from scratch
+        self.table.itemDelegate().clear_cache()
+        self.table.frame_timer.reset()
+        # Widths were measured in the previous font
+        self.column_widths.clear()
+        self.sized_columns = set()
+        self.size_visible_columns()
+
+    def set_paint_timing(self, enabled):
+        self.paint_time_label.setVisible(enabled)
+        if enabled:
+            self.table.frame_timer.reset()
+            self.update_paint_time()
+            self.paint_time_timer.start()
+        else:
+            self.paint_time_timer.stop()
+
+    def update_paint_time(self):
+        stats = self.table.frame_timer.stats()
+        if stats is None:
+            self.paint_time_label.setText("Paint: -")
+        else:
+            self.paint_time_label.setText(f"Paint: {stats['last_ms']:.1f} ms (mean {stats['mean_ms']:.1f}, "
+                                          f"max {stats['max_ms']:.1f} over {stats['frames']} frames)")
+
+    def selected_block(self):
+        """Selected view rows and columns, and for each column a row mask when it isn't fully selected"""
+        ranges = self.table.selectionModel().selection()
+        if ranges.isEmpty():
+            return None, None, None
+        rows = np.unique(np.concatenate([np.arange(r.top(), r.bottom() + 1) for r in ranges]))
+        cols = sorted({col for r in ranges for col in range(r.left(), r.right() + 1)})
+        masks = {}
+        for col in cols:
+            mask = np.zeros(len(rows), dtype=bool)
+            for r in ranges:
+                if r.left() <= col <= r.right():
+                    mask |= (rows >= r.top()) & (rows <= r.bottom())
+            if not mask.all():
+                masks[col] = mask
+        return rows, cols, masks
 
     def copy_selection(self):
-        selection = self.table.selectionModel().selectedIndexes()
-        if not selection:
+        """Copy the selection as tab-separated text, formatting each selected column in one pass"""
+        rows, cols, masks = self.selected_block()
+        if rows is None:
             return
-        rows = sorted(set(index.row() for index in selection))
-        cols = sorted(set(index.column() for index in selection))
-        text = ""
-        for row in rows:
-            row_data = []
-            for col in range(len(self.filtered_df.columns)):
-                if any(index.row() == row and index.column() == col for index in selection):
-                    row_data.append(str(self.filtered_df.iloc[row, col]))
-                else:
-                    row_data.append("")
-            text += "\t".join(row_data) + "\n"
-        QApplication.clipboard().setText(text)
+        if isinstance(self.model, VirtualTableModel):
+            model, window_start = self.model, self.model.window_start
+            names = [model.column_name(col) for col in cols]
+            blocks = model.missing_blocks(rows, names)
+            if blocks:
+                if self.load_worker is not None:
+                    self.status_bar.showMessage("Wait for the current load to finish before copying", 5000)
+                    return
+
+                def finished(pages):
+                    if self.model is not model or model.window_start != window_start:
+                        self.status_bar.showMessage("The view changed while decoding; copy again", 5000)
+                        return
+                    # pages keeps the blocks alive until the text is built
+                    model.add_pages(pages)
+                    self.copy_rows(rows, cols, masks)
+
+                # Never copy cells that aren't decoded as empty; decode them first
+                self.start_load(lambda progress, cancel: model.decode_blocks(blocks, names, progress, cancel),
+                                finished, "Decoding rows to copy", total_row_groups=len(blocks))
+                return
+        self.copy_rows(rows, cols, masks)
+
+    def copy_rows(self, rows, cols, masks):
+        columns = []
+        for col in cols:
+            texts = self.model.column_texts(col, rows)
+            if col in masks:
+                # Cells between selected ones copy as empty, keeping the block rectangular
+                texts = [text if selected else "" for text, selected in zip(texts, masks[col])]
+            columns.append(texts)
+        QApplication.clipboard().setText(to_tsv(columns))
+        self.status_bar.showMessage(f"Copied {len(rows)} rows x {len(cols)} columns", 3000)
+
+    def paste_selection(self):
+        """Paste tab-separated text at the selection as one undoable edit
+
+        A single value fills the whole selection; a block starts at its top-left cell.
+        """
+        if not self.can_edit_page() or self.model is None:
+            return
+        block = parse_tsv(QApplication.clipboard().text())
+        rows, cols, _ = self.selected_block()
+        if not block or rows is None:
+            return
+        if len(block) == 1 and len(block[0]) == 1:
+            view_rows, view_cols = rows, cols
+            block = [[block[0][0]] * len(cols) for _ in rows]
+        else:
+            first_row, first_col = int(rows[0]), cols[0]
+            view_rows = np.arange(first_row, min(first_row + len(block), self.model.rowCount()))
+            view_cols = list(range(first_col, min(first_col + len(block[0]), self.model.columnCount())))
+            block = block[:len(view_rows)]
+        if self.model.is_lazy():
+            # Editing needs every column of the page
+            self.materialize_page()
+        positions = view_rows if self.model.order is None else self.model.order[view_rows]
+        row_labels = self.filtered_df.index[positions]
+        values = {}
+        for offset, col in enumerate(view_cols):
+            name = self.filtered_df.columns[col]
+            try:
+                values[name] = coerce_texts([row[offset] for row in block], self.df[name].dtype)
+            except (ValueError, TypeError) as e:
+                QMessageBox.warning(self, "Paste Error", f"Invalid value for column '{name}' ({self.df[name].dtype}): {e}")
+                return
+        self._manual_dirty = True
+        self.undo_stack.push(PasteCommand(self, row_labels, values))
+        self.update_window_title()
+        if len(block) > len(view_rows) or len(block[0]) > len(view_cols):
+            self.status_bar.showMessage("Pasted block was cut off at the edge of the table", 5000)
 
     def select_all(self):
         self.table.selectAll()
@@ -338,7 +1096,7 @@ class MainWindow(QMainWindow):
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
 
-        self.table = QTableView()
+        self.table = DataTableView()
         self.table.setAlternatingRowColors(True)
         self.table.setSortingEnabled(True)
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectItems)
@@ -346,6 +1104,7 @@ class MainWindow(QMainWindow):
         self.table.setShowGrid(True)
         self.table.setGridStyle(Qt.PenStyle.SolidLine)
         self.table.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self.table.setItemDelegate(CustomDelegate(self.table))
         
         # Improve margins and spacing
         self.table.verticalHeader().setDefaultSectionSize(32)
@@ -357,12 +1116,201 @@ class MainWindow(QMainWindow):
         self.visualization_widget = VisualizationWidget()
         self.visualization_widget.set_theme(self.current_theme)
 
-        self.tabs.addTab(self.table, "Data")
+        # Decode columns as they scroll into view, coalescing bursts of scroll events
+        self.column_load_timer = QTimer(self)
+        self.column_load_timer.setSingleShot(True)
+        self.column_load_timer.setInterval(30)
+        self.column_load_timer.timeout.connect(self.load_visible_columns)
+        # Through a lambda: connected directly, the scroll value would become start()'s interval
+        self.table.horizontalScrollBar().valueChanged.connect(lambda _: self.column_load_timer.start())
+        self.table.horizontalScrollBar().rangeChanged.connect(lambda *_: self.column_load_timer.start())
+
+        # Continuous scrolling: rows are decoded once the viewport settles, and this
+        # scrollbar spans the whole file when it has more rows than the model's window
+        self.row_load_timer = QTimer(self)
+        self.row_load_timer.setSingleShot(True)
+        self.row_load_timer.setInterval(30)
+        self.row_load_timer.timeout.connect(self.load_visible_rows)
+        self.row_scrollbar = QScrollBar(Qt.Orientation.Vertical)
+        self.row_scrollbar.valueChanged.connect(self.scroll_to_row)
+        self.row_scrollbar.hide()
+        self.table.verticalScrollBar().valueChanged.connect(self.on_table_scrolled)
+
+        data_view = QWidget()
+        data_layout = QHBoxLayout(data_view)
+        data_layout.setContentsMargins(0, 0, 0, 0)
+        data_layout.setSpacing(0)
+        data_layout.addWidget(self.table)
+        data_layout.addWidget(self.row_scrollbar)
+        self.tabs.addTab(data_view, "Data")
         self.tabs.addTab(self.visualization_widget, "Visualizations")
 
+    def visible_columns(self):
+        header = self.table.horizontalHeader()
+        if header.count() == 0:
+            return []
+        first = header.logicalIndexAt(0)
+        last = header.logicalIndexAt(header.viewport().width() - 1)
+        first = 0 if first < 0 else first
+        last = header.count() - 1 if last < 0 else last
+        return [header.logicalIndex(visual) for visual in range(header.visualIndex(first), header.visualIndex(last) + 1)]
+
+    def wanted_columns(self):
+        if isinstance(self.model, VirtualTableModel):
+            columns = self.model.columns
+        elif self.page is not None:
+            columns = self.page.columns
+        else:
+            return []
+        names = [columns[col] for col in self.visible_columns() if col < len(columns)]
+        return names + [name for name in columns if name in self.pinned_columns and name not in names]
+
+    def load_visible_columns(self):
+        """Decode the columns in the viewport plus pinned columns, if the page is still lazy"""
+        if isinstance(self.model, VirtualTableModel):
+            self.load_visible_rows()
+            return
+        if self.model is None or not self.model.is_lazy():
+            self.size_visible_columns()
+            return
+        loaded = self.page.load(self.wanted_columns())
+        for name in loaded:
+            col = self.page.columns.index(name)
+            self.model.dataChanged.emit(self.model.index(0, col), self.model.index(self.model.rowCount() - 1, col))
+        self.size_visible_columns()
+
+    def column_width(self, col):
+        """Width for a column from a sample of its formatted values and its header
+
+        Cached per page (or continuous source), column name and type, so filters and
+        resets of the same rows don't sample again.
+        """
+        name = self.model.column_name(col)
+        if isinstance(self.model, VirtualTableModel):
+            scope = self.model.source.version
+        else:
+            scope = self.page.key if self.page is not None else None
+        key = (scope, name, str(self.model.column_type(col)))
+        width = self.column_widths.get(key)
+        if width is None:
+            texts = self.model.sample_texts(col)
+            if texts is None:
+                return None
+            cells = QFontMetrics(self.table.font())
+            # Plus the grid line and a little slack, so sampled values aren't elided by rounding
+            content = max((cells.horizontalAdvance(text) for text in texts), default=0) + 2 * CustomDelegate.MARGIN + 4
+            # Room for the sort indicator next to the title
+            title = QFontMetrics(self.table.horizontalHeader().font()).horizontalAdvance(str(name)) + 24
+            width = self.column_widths[key] = max(MIN_COLUMN_WIDTH, min(max(content, title), MAX_COLUMN_WIDTH))
+        return width
+
+    def size_visible_columns(self):
+        """Size the columns in view that haven't been since the last reset; others wait until they scroll in"""
+        if self.model is None:
+            return
+        # Resizing can bring further columns into view
+        for _ in range(3):
+            pending = [col for col in self.visible_columns()
+                       if col < self.model.columnCount() and self.model.column_name(col) not in self.sized_columns]
+            resized = False
+            for col in pending:
+                width = self.column_width(col)
+                if width is not None:
+                    self.sized_columns.add(self.model.column_name(col))
+                    if width != self.table.columnWidth(col):
+                        self.table.setColumnWidth(col, width)
+                        resized = True
+            if not resized:
+                return
+
+    def visible_row_count(self):
+        return max(self.table.viewport().height() // self.table.verticalHeader().defaultSectionSize(), 1)
+
+    def load_visible_rows(self):
+        """Decode the wanted columns for the rows in the viewport of the continuous view"""
+        if not isinstance(self.model, VirtualTableModel):
+            return
+        first = max(self.table.rowAt(0), 0)
+        last = self.table.rowAt(self.table.viewport().height() - 1)
+        last = self.model.rowCount() - 1 if last < 0 else last
+        start = self.model.window_start
+        self.model.request_rows(start + first, start + last, self.wanted_columns())
+
+    def scroll_to_row(self, row):
+        """Show row at the top of the continuous view, moving the model's window if needed"""
+        if not isinstance(self.model, VirtualTableModel) or self._syncing_scroll:
+            return
+        model = self.model
+        visible = self.visible_row_count()
+        window_end = model.window_start + model.rowCount()
+        # Re-centre before the viewport reaches an edge of the window that isn't the file's
+        near_top = model.window_start > 0 and row < model.window_start + visible
+        near_bottom = window_end < model.num_rows and row + 2 * visible > window_end
+        if near_top or near_bottom or row < model.window_start or row > window_end:
+            model.set_window_start(row - model.rowCount() // 2)
+        self._syncing_scroll = True
+        self.table.verticalScrollBar().setValue(row - model.window_start)
+        self._syncing_scroll = False
+        self.row_load_timer.start()
+
+    def on_table_scrolled(self, value):
+        if not isinstance(self.model, VirtualTableModel):
+            return
+        self.row_load_timer.start()
+        if self._syncing_scroll or self.row_scrollbar.isHidden():
+            return
+        row = self.model.window_start + value
+        self._syncing_scroll = True
+        self.row_scrollbar.setValue(row)
+        self._syncing_scroll = False
+        # Wheel and keyboard scrolling can reach the window's edges
+        self.scroll_to_row(row)
+
+    def update_row_scrollbar(self):
+        """The whole-file scrollbar replaces the table's own when the model only holds a window"""
+        windowed = isinstance(self.model, VirtualTableModel) and self.model.num_rows > self.model.rowCount()
+        self.row_scrollbar.setVisible(windowed)
+        self.table.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff if windowed
+                                              else Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        if windowed:
+            visible = self.visible_row_count()
+            self._syncing_scroll = True
+            self.row_scrollbar.setRange(0, max(self.model.num_rows - visible, 0))
+            self.row_scrollbar.setPageStep(visible)
+            self.row_scrollbar.setValue(0)
+            self._syncing_scroll = False
+
+    def set_continuous_scroll(self, enabled):
+        self.continuous_scroll = enabled
+        for widget in (self.page_size_label, self.page_size_combo, self.prefetch_label, self.prefetch_combo,
+                       self.prev_btn, self.page_label, self.next_btn):
+            widget.setVisible(not enabled)
+        self.update_table()
+        self.load_visible_columns()
+
+    def can_edit_page(self):
+        """Edits and page filters work on one page; the continuous view is read-only"""
+        if self.continuous_scroll:
+            self.status_bar.showMessage("Turn off View > Continuous Scrolling to edit or filter the current page", 5000)
+            return False
+        return True
+
+    def toggle_pinned_columns(self, col_indices):
+        names = [self.model.column_name(i) for i in col_indices]
+        if all(name in self.pinned_columns for name in names):
+            self.pinned_columns.difference_update(names)
+        else:
+            self.pinned_columns.update(names)
+        self.load_visible_columns()
+
     def create_query_widget(self):
         self.query_edit = QLineEdit()
-        self.query_edit.setPlaceholderText("Example: age > 25 or city == 'NY'")
+        self.query_edit.setPlaceholderText("Example: age > 25 or city == 'NY', or SELECT city, count(*) FROM current GROUP BY city")
+        self.query_edit.setToolTip("Comparisons, and/or/not, in and isnull() filter the whole file; "
+                                   "other pandas expressions run on the current page.\n"
+                                   "Queries starting with SELECT, WITH or FROM (DuckDB's FROM-first syntax, "
+                                   "e.g. FROM current WHERE age > 25) are SQL run on the whole file, "
+                                   "which is called 'current' (needs the duckdb package).")
         self.query_button = QPushButton("Execute")
         self.query_button.clicked.connect(self.execute_query)
         self.query_button.setMinimumWidth(80)
@@ -370,11 +1318,16 @@ class MainWindow(QMainWindow):
         self.search_edit.setPlaceholderText("Search text...")
         self.search_edit.setMaximumWidth(150)
         self.search_edit.setMinimumWidth(100)
-        self.search_edit.textChanged.connect(self.filter_data)
+        # Search once typing pauses rather than on every keystroke
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.filter_data)
+        self.search_edit.textChanged.connect(lambda _: self.search_timer.start())
         layout = QHBoxLayout()
         layout.addWidget(QLabel("Search:"))
         layout.addWidget(self.search_edit)
-        layout.addWidget(QLabel("Pandas Query:"))
+        layout.addWidget(QLabel("Query:"))
         layout.addWidget(self.query_edit, 1)  # stretch
         layout.addWidget(self.query_button)
         self.reset_button = QPushButton("Clear")
@@ -391,8 +1344,24 @@ class MainWindow(QMainWindow):
     def create_stats_widget(self):
         self.stats_text = QTextEdit()
         self.stats_text.setReadOnly(True)
+        self.stats_source_combo = QComboBox()
+        self.stats_source_combo.addItems(["Whole file (metadata)", "Current page (exact)", "Whole file (profile)"])
+        self.stats_source_combo.setToolTip("Whole-file numbers come from the Parquet footer without scanning data; "
+                                           "the profile comes from View > Profile Entire File")
+        self.stats_source_combo.currentIndexChanged.connect(self.refresh_stats)
+        refresh_button = QPushButton("Refresh")
+        refresh_button.clicked.connect(self.refresh_stats)
+        controls = QHBoxLayout()
+        controls.addWidget(self.stats_source_combo, 1)
+        controls.addWidget(refresh_button)
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(controls)
+        layout.addWidget(self.stats_text)
+        widget = QWidget()
+        widget.setLayout(layout)
         self.stats_dock = QDockWidget("Statistics", self)
-        self.stats_dock.setWidget(self.stats_text)
+        self.stats_dock.setWidget(widget)
         # Fix the dock position - allow closing but not moving/floating
         self.stats_dock.setFeatures(QDockWidget.DockWidgetFeature.DockWidgetClosable)
         self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.stats_dock)
@@ -406,8 +1375,8 @@ class MainWindow(QMainWindow):
         layout.setSpacing(12)
         
         # Page Size Selector
-        size_label = QLabel("Page Size:")
-        layout.addWidget(size_label)
+        self.page_size_label = QLabel("Page Size:")
+        layout.addWidget(self.page_size_label)
         
         self.page_size_combo = QComboBox()
         self.page_size_combo.addItems(["100", "1000", "5000", "10000"])
@@ -415,6 +1384,17 @@ class MainWindow(QMainWindow):
         self.page_size_combo.currentTextChanged.connect(lambda text: self.set_page_size(int(text)))
         self.page_size_combo.setMinimumWidth(80)
         layout.addWidget(self.page_size_combo)
+
+        # How many pages on each side of the current one are decoded ahead
+        self.prefetch_label = QLabel("Prefetch:")
+        layout.addWidget(self.prefetch_label)
+
+        self.prefetch_combo = QComboBox()
+        self.prefetch_combo.addItems(["0", "1", "2", "3"])
+        self.prefetch_combo.setCurrentText(str(self.prefetcher.depth))
+        self.prefetch_combo.setToolTip("Pages decoded ahead on each side of the current page")
+        self.prefetch_combo.currentTextChanged.connect(lambda text: self.set_prefetch_depth(int(text)))
+        layout.addWidget(self.prefetch_combo)
         
         # Spacer
         layout.addSpacing(20)
@@ -435,21 +1415,38 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.prev_btn)
         layout.addWidget(self.page_label)
         layout.addWidget(self.next_btn)
+
+        # Only shown while a load runs in the background
+        self.cancel_load_btn = QPushButton("Cancel")
+        self.cancel_load_btn.setToolTip("Stop loading; the current data stays on screen")
+        self.cancel_load_btn.clicked.connect(self.cancel_load)
+        self.cancel_load_btn.hide()
+        layout.addWidget(self.cancel_load_btn)
         container.setLayout(layout)
         
         self.status_bar.addPermanentWidget(container)
         self.update_pagination_controls()
 
+    def set_memory_map(self, enabled):
+        # Takes effect the next time a file or page is loaded
+        self.memory_map = enabled
+
+    def set_read_dictionary(self, enabled):
+        # Takes effect the next time a file or page is loaded
+        self.read_dictionary = enabled
+
     def set_page_size(self, size):
         self.page_size = size
-        self.current_page = 1
-        if self.current_file_path:
-            self.load_data(self.current_file_path, reset_page=False)
+        if self.session is not None:
+            self.show_page(page_number=1)
+
+    def set_prefetch_depth(self, depth):
+        # Takes effect from the next page shown
+        self.prefetcher.depth = depth
 
     def change_page(self, delta):
-        self.current_page += delta
-        if self.current_file_path:
-            self.load_data(self.current_file_path, reset_page=False)
+        if self.session is not None:
+            self.show_page(page_number=self.current_page + delta)
 
     def update_pagination_controls(self):
         import math
@@ -460,18 +1457,171 @@ class MainWindow(QMainWindow):
         self.page_label.setText(f"Page {self.current_page} / {total_pages}")
 
     def filter_data(self):
-        text = self.search_edit.text().lower()
+        """Show the page rows containing the search text, searching on a worker
+
+        A search still running is cancelled. The page's search index is built by the
+        first search and reused by the next ones until the page changes.
+        """
+        if not self.can_edit_page():
+            return
+        self.cancel_search()
+        text = self.search_edit.text()
         if not text:
-            self.filtered_df = self.df
+            if self._filtered_df is not None:
+                self.show_rows(self.df)
+            if isinstance(self.model, DataFrameModel):
+                self.model.set_matches(None)
+            return
+        index = self.search_index
+        if index is None and self._df is None and self.page is None:
+            return
+        frame, page = (self._df, None) if self._df is not None else (None, self.page)
+
+        def search(progress, cancel):
+            built = index
+            if built is None:
+                built = SearchIndex.from_frame(frame, cancel) if frame is not None else SearchIndex.from_page(page, cancel)
+            return built, built.search(text, cancel)
+
+        worker = Worker(search)
+        self.search_worker = worker
+        worker.signals.finished.connect(lambda result: self.on_search_finished(worker, result))
+        worker.signals.failed.connect(lambda error: self.on_search_failed(worker, error))
+        worker.signals.cancelled.connect(lambda: self.on_search_failed(worker, None))
+        self.status_bar.showMessage(f"Searching for '{text}'...")
+        worker.start()
+
+    def on_search_finished(self, worker, result):
+        if worker is not self.search_worker:
+            return  # Superseded by a newer search or a change to the page
+        self.search_worker = None
+        self.search_index, (positions, masks) = result
+        self.show_rows(self.df.iloc[positions])
+        if isinstance(self.model, DataFrameModel):
+            self.model.set_matches([mask[positions] for mask in masks])
+        self.status_bar.showMessage(f"{len(positions)} of {len(self.df)} rows on this page match", 3000)
+
+    def on_search_failed(self, worker, error):
+        if worker is not self.search_worker:
+            return
+        self.search_worker = None
+        if error is not None:
+            self.status_bar.showMessage(f"Search failed: {error}", 5000)
+
+    def cancel_search(self):
+        if self.search_worker is not None:
+            self.search_worker.cancel()
+            self.search_worker = None
+
+    def invalidate_search(self):
+        """The page's rows or values changed: the index and any running search are stale"""
+        self.search_index = None
+        self.cancel_search()
+
+    def find_in_file(self):
+        """Find text in every row of the file through its sidecar index, and go to the first hit"""
+        if self.session is None:
+            return
+        text, ok = QInputDialog.getText(self, "Find in File", "Find rows containing:", text=self.find_text)
+        if ok and text:
+            self.find_text = text
+            self.run_text_index(find=text)
+
+    def run_text_index(self, find=None):
+        """Open the file's search index on a worker, building it if it is missing or stale, then find text"""
+        session = self.session
+        if session is None:
+            return
+        if self.index_worker is not None:
+            self.index_worker.cancel()
+        index = self.text_index if self.text_index is not None and self.text_index.is_current(session) else None
+
+        def work(progress, cancel):
+            built = index or open_index(session, build=True, progress=progress, cancel=cancel)
+            return built, None if find is None else built.find(session, find, cancel)
+
+        worker = Worker(work)
+        self.index_worker = worker
+
+        def progress(done, total):
+            if worker is self.index_worker:
+                self.status_bar.showMessage(f"Indexing file for find... {done / max(total, 1):.0%} "
+                                            f"({done:,} of {total:,} rows)")
+
+        worker.signals.progress.connect(progress)
+        worker.signals.finished.connect(lambda result: self.on_text_index_finished(worker, session, find, result))
+        worker.signals.failed.connect(lambda error: self.on_text_index_failed(worker, error))
+        worker.signals.cancelled.connect(lambda: self.on_text_index_failed(worker, None))
+        self.status_bar.showMessage("Finding..." if index is not None else "Opening file search index...")
+        worker.start()
+
+    def on_text_index_finished(self, worker, session, find, result):
+        if worker is not self.index_worker or session is not self.session:
+            return
+        self.index_worker = None
+        self.text_index, hits = result
+        size = f"search index {format_bytes(self.text_index.nbytes)}"
+        if find is None:
+            self.status_bar.showMessage(f"File indexed for find ({size})", 5000)
+            return
+        self.find_hits = hits
+        if not len(hits):
+            self.status_bar.showMessage(f"No rows contain '{find}' ({size})", 5000)
+            return
+        self.go_to_hit(0)
+
+    def on_text_index_failed(self, worker, error):
+        if worker is not self.index_worker:
+            return
+        self.index_worker = None
+        self.status_bar.showMessage("Find cancelled" if error is None else f"Find failed: {error}", 5000)
+
+    def go_to_hit(self, hit):
+        if self.find_hits is None or not len(self.find_hits):
+            return
+        self.find_hit = hit % len(self.find_hits)
+        row = int(self.find_hits[self.find_hit])
+        self.status_bar.showMessage(f"'{self.find_text}': row {row + 1:,} "
+                                    f"(hit {self.find_hit + 1:,} of {len(self.find_hits):,})")
+        self.go_to_row(row)
+
+    def go_to_row(self, row):
+        """Show and select a row of the file (counting from 0), loading its page if needed"""
+        if self.query_result is None:
+            if isinstance(self.model, VirtualTableModel):
+                self.select_file_row(row)
+                return
+            if self.page is not None and self.page.offset <= row < self.page.offset + self.page.num_rows:
+                self.select_file_row(row)
+                return
+        self.show_page(page_number=row // self.page_size + 1, source=self.session, select_row=row)
+
+    def select_file_row(self, row):
+        if isinstance(self.model, VirtualTableModel):
+            self.scroll_to_row(max(row - self.visible_row_count() // 2, 0))
+            view = row - self.model.window_start
         else:
-            self.filtered_df = self.df[self.df.apply(lambda row: text in str(row.values).lower(), axis=1)]
-        self.update_table()
+            if self._filtered_df is not None and self._filtered_df is not self._df:
+                # The row may be filtered out by a search; show the whole page again
+                self.search_edit.blockSignals(True)
+                self.search_edit.clear()
+                self.search_edit.blockSignals(False)
+                self.show_rows(self.df)
+            view = self.model.view_row(row - self.page.offset)
+        if 0 <= view < self.model.rowCount():
+            self.table.selectRow(view)
+            self.table.scrollTo(self.model.index(view, 0), QAbstractItemView.ScrollHint.PositionAtCenter)
 
     def open_file(self):
         file_name, _ = QFileDialog.getOpenFileName(self, "Open Parquet File", "", "Parquet Files (*.parquet)")
         if file_name:
             self.load_data(file_name)
 
+    def open_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Open Parquet Dataset Folder")
+        if folder:
+            self.load_data(folder)
+
     def create_plot_config_widget(self):
         self.plot_config_widget = PlotConfigWidget()
         self.plot_config_dock = QDockWidget("Plot Configuration", self)
@@ -486,6 +1636,7 @@ class MainWindow(QMainWindow):
     def on_tab_changed(self, index):
         # index 1 is Visualizations tab
         if index == 1:
+            self.visualization_widget.set_dataframe(self.filtered_df)
             self.plot_config_dock.show()
             self.stats_dock.hide()
         else:
@@ -493,52 +1644,230 @@ class MainWindow(QMainWindow):
             self.stats_dock.show()
 
     def load_data(self, file_name, reset_page=True):
-        self.status_bar.showMessage("Loading...")
-        try:
-            self.total_rows = get_row_count(file_name)
-            
-            if reset_page:
-                self.current_page = 1
-            
-            offset = (self.current_page - 1) * self.page_size
-            limit = self.page_size
-            
-            self.df = load_parquet(file_name, offset=offset, limit=limit)
-            self.original_df = self.df.copy()
-            self.filtered_df = self.df
+        """Open file_name and decode its first page on a worker; the current data stays usable meanwhile"""
+        page_number = 1 if reset_page else self.current_page
+        page_size = self.page_size
+        hint = self.column_hint()
+        pinned = set() if file_name != self.current_file_path else set(self.pinned_columns)
+
+        def open_and_read(progress, cancel):
+            # One open reader per file; page turns reuse its parsed footer
+            session = open_source(file_name, memory_map=self.memory_map, read_dictionary=self.read_dictionary)
+            # Header metadata comes from the footers, gathered here so hovering never has to
+            column_info = source_column_info(session)
+            # A profile saved by an earlier run shows straight away
+            profile = open_profile(session)
+            return session, column_info, profile, self.read_page(session, page_number, page_size, hint, pinned,
+                                                                 progress, cancel)
+
+        def finished(result):
+            session, column_info, profile, page = result
+            if file_name != self.current_file_path:
+                self.pinned_columns = set()
+            self.session = session
+            self.session_column_info = column_info
             self.current_file_path = file_name
-            self.undo_stack.clear() # Clear undo stack on new data load
-            self.undo_stack.setClean()
-            self._manual_dirty = False
-            self.update_table()
-            self.update_window_title()
-            self.update_pagination_controls()
-            
-            # Sync columns to plot config
-            self.plot_config_widget.set_columns(self.df.columns.tolist())
-            
-            self.status_bar.showMessage(f"Loaded {len(self.df)} rows (Total: {self.total_rows})")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to load file: {str(e)}")
-            self.status_bar.showMessage("Error loading file")
+            self.file_profile = profile
+            if profile is not None and self.stats_source_combo.currentIndex() == 0:
+                self.stats_source_combo.setCurrentIndex(2)
+            self.display_page(session, page, page_number)
+
+        self.start_load(open_and_read, finished, "Opening file")
+
+    def set_query_result(self, result):
+        # The previous result is closed unless the result cache keeps it
+        self.result_cache.use(result)
+        self.query_result = result
+
+    def current_source(self):
+        return self.query_result if self.query_result is not None else self.session
+
+    def show_page(self, page_number=None, source=None, select_row=None):
+        """Decode a page of source (by default the file, or the active query result) on a worker
+
+        select_row, a file row on that page, is selected once the page is on screen;
+        it is forgotten if the load fails, is cancelled or is superseded.
+        """
+        if source is None:
+            source = self.current_source()
+        page_number = self.current_page if page_number is None else page_number
+        page_size = self.page_size
+        hint = self.column_hint()
+        pinned = set(self.pinned_columns)
+
+        def read(progress, cancel):
+            return self.read_page(source, page_number, page_size, hint, pinned, progress, cancel)
+
+        # A new query result that never makes it to the screen must still release its spill file
+        is_new_result = source is not self.session and source is not self.query_result
+        self.start_load(read, lambda page: self.display_page(source, page, page_number, select_row), "Loading page",
+                        on_discarded=(lambda: self.result_cache.release(source)) if is_new_result else None)
+
+    def column_hint(self):
+        """Column positions worth decoding up front: those on screen now, or as many as fit"""
+        columns = self.visible_columns()
+        if not columns:
+            fit = self.table.viewport().width() // self.table.horizontalHeader().defaultSectionSize() + 1
+            columns = list(range(max(fit, 1)))
+        return columns
+
+    def read_page(self, source, page_number, page_size, column_hint, pinned, progress, cancel):
+        """Runs on a worker thread: get the page from the cache and decode the wanted columns"""
+        page = self.page_cache.page(source, (page_number - 1) * page_size, page_size)
+        names = [page.columns[col] for col in column_hint if col < len(page.columns)]
+        names += [name for name in page.columns if name in pinned]
+        page.load(names, progress=progress, cancel=cancel)
+        return page
+
+    def start_load(self, fn, on_finished, label, on_discarded=None, on_failed=None, total_row_groups=None):
+        """Run fn on the thread pool, replacing (and cancelling) any load already running
+
+        on_discarded is called instead of on_finished when the result is not used, and
+        on_failed, if given, reports an error in place of the generic message. With
+        total_row_groups the status bar counts row groups scanned out of that total.
+        """
+        if self.load_worker is not None:
+            self.load_worker.cancel()
+        worker = Worker(fn)
+        self.load_worker = worker
+        totals = {'row_groups': 0, 'bytes': 0}
+
+        def is_current():
+            return self.load_worker is worker
+
+        def progress(row_groups, nbytes):
+            totals['row_groups'] += row_groups
+            totals['bytes'] += nbytes
+            if not is_current():
+                return
+            if total_row_groups is None:
+                scanned = f"{totals['row_groups']} row groups"
+            else:
+                scanned = f"{min(totals['row_groups'], total_row_groups)} of {total_row_groups} row groups scanned"
+            self.status_bar.showMessage(f"{label}... {scanned}, {totals['bytes'] / 1024 / 1024:.1f} MB decoded")
+
+        def discard():
+            if on_discarded is not None:
+                on_discarded()
+
+        def finished(result):
+            if not is_current():
+                discard()
+                return
+            self.end_load()
+            try:
+                on_finished(result)
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to load file: {str(e)}")
+                self.status_bar.showMessage("Error loading file")
+
+        def failed(error):
+            discard()
+            if not is_current():
+                return
+            self.end_load()
+            if on_failed is not None:
+                on_failed(error)
+            else:
+                QMessageBox.critical(self, "Error", f"Failed to load file: {str(error)}")
+                self.status_bar.showMessage("Error loading file")
+
+        def cancelled():
+            discard()
+            if is_current():
+                self.end_load()
+                self.status_bar.showMessage("Loading cancelled", 3000)
+
+        worker.signals.progress.connect(progress)
+        worker.signals.finished.connect(finished)
+        worker.signals.failed.connect(failed)
+        worker.signals.cancelled.connect(cancelled)
+        self.status_bar.showMessage(f"{label}...")
+        self.cancel_load_btn.show()
+        worker.start()
+
+    def end_load(self):
+        self.load_worker = None
+        self.query_worker = None
+        self.cancel_load_btn.hide()
+        self.query_button.setText("Execute")
+
+    def cancel_load(self):
+        if self.load_worker is not None:
+            # Stops between row groups; the finished/cancelled signal cleans up
+            self.load_worker.cancel()
+            self.status_bar.showMessage("Cancelling...")
+
+    def display_page(self, source, page, page_number, select_row=None):
+        """Swap a decoded page into the table; runs on the UI thread"""
+        if source is not self.query_result:
+            self.set_query_result(None if source is self.session else source)
+        self.total_rows = source.num_rows
+        self.current_page = page_number
+        self.page = page
+        self.df = None
+        self.filtered_df = None
+        self.page_sort = None
+        self.schema_metadata = SchemaMetadata(self.session_column_info)
+        self.page_stats = PageStatistics()
+        self.undo_stack.clear() # Clear undo stack on new data load
+        self.undo_stack.setClean()
+        self._manual_dirty = False
+        self.update_table()
+        self.load_visible_columns()
+        self.update_window_title()
+        self.update_pagination_controls()
+        
+        # Sync columns to plot config
+        self.plot_config_widget.set_columns(list(self.page.columns))
+
+        # Warm up the neighbouring pages with the columns the user is looking at
+        if not self.continuous_scroll:
+            self.prefetcher.prefetch(source, page.offset, page.limit, self.wanted_columns())
+        
+        cache = self.page_cache.stats()
+        self.status_bar.showMessage(f"Loaded {self.page.num_rows} rows (Total: {self.total_rows}) | "
+                                    f"Page cache: {cache['hits']} hits, {cache['misses']} misses")
+        if select_row is not None and source is self.session:
+            self.select_file_row(select_row)
 
     def refresh_view_for_cell(self, row_idx, col_name):
         # row_idx is the DataFrame Index Label, not position
         # col_name is column name
+        self.invalidate_search()
+        self.page_stats_changed()
+        if isinstance(self.model, VirtualTableModel):
+            return  # Page edits aren't shown in the continuous view
         try:
             # Find the positional index in the CURRENT filtered_df
             if row_idx not in self.filtered_df.index:
                 return 
             
-            row_pos = self.filtered_df.index.get_loc(row_idx)
+            row_pos = self.model.view_row(self.filtered_df.index.get_loc(row_idx))
             col_pos = self.filtered_df.columns.get_loc(col_name)
             
             # Emit dataChanged for this cell in the source model
+            self.model.invalidate_cell(row_pos, col_pos)
             index = self.model.index(row_pos, col_pos)
             self.model.dataChanged.emit(index, index)
         except Exception as e:
             print(f"Error refreshing view: {e}")
 
+    def refresh_view_for_cells(self, row_labels, col_names):
+        """Repaint a block of edited cells; the page's formatted text is dropped once rather than per cell"""
+        self.invalidate_search()
+        self.page_stats_changed()
+        if isinstance(self.model, VirtualTableModel):
+            return  # Page edits aren't shown in the continuous view
+        positions = self.filtered_df.index.get_indexer(row_labels)
+        positions = positions[positions >= 0]
+        cols = [self.filtered_df.columns.get_loc(name) for name in col_names if name in self.filtered_df.columns]
+        if not len(positions) or not cols:
+            return
+        rows = [self.model.view_row(int(position)) for position in positions]
+        self.model.formatter.clear()
+        self.model.dataChanged.emit(self.model.index(min(rows), min(cols)), self.model.index(max(rows), max(cols)))
+
     def on_horizontal_header_clicked(self, logical_index):
         """Select entire column when header is clicked, supporting multi-selection"""
         modifiers = QApplication.keyboardModifiers()
@@ -566,52 +1895,311 @@ class MainWindow(QMainWindow):
             self.table.selectRow(logical_index)
 
     def update_table(self):
-        self.model = DataFrameModel(self.filtered_df, self.df, self)
-        self.proxy.setSourceModel(self.model)
-        self.table.setModel(self.proxy)
-        self.table.setItemDelegate(CustomDelegate())
-        # Set maximum column width to 250 pixels
-        max_col_width = 250
-        for col in range(len(self.filtered_df.columns)):
-            self.table.setColumnWidth(col, min(self.table.columnWidth(col), max_col_width))
-        self.row_col_label.setText(f"Rows: {len(self.filtered_df)}, Columns: {len(self.filtered_df.columns)}")
+        """Point the table at the current data; the page model is reset, not recreated"""
+        if isinstance(self.model, VirtualTableModel):
+            self.model.cancel()
+        if self.continuous_scroll and self.current_source() is not None:
+            self.model = VirtualTableModel(self.current_source(), self.page_cache, self)
+            self.table.setModel(self.model)
+        else:
+            lazy = self._df is None and self.page is not None
+            df, main_df = (None, None) if lazy else (self.filtered_df, self.df)
+            if isinstance(self.model, DataFrameModel):
+                self.model.set_frame(df, main_df, self.page if lazy else None)
+            else:
+                self.model = DataFrameModel(df, main_df, self, page=self.page if lazy else None)
+                # Header clicks call model.sort() directly, which sorts on native types
+                self.table.setModel(self.model)
+            self.apply_page_sort()
+        self.update_sort_indicator()
+        self.update_row_scrollbar()
+        # The reset gave every column the default width; the rest are sized as they scroll into view
+        self.sized_columns = set()
+        self.size_visible_columns()
         self.update_stats()
-        self.visualization_widget.set_dataframe(self.filtered_df)
+        self.update_table_summary()
+
+    def update_table_summary(self):
+        """Row and column counts, and the plot when it is on screen"""
+        rows = self.model.num_rows if isinstance(self.model, VirtualTableModel) else self.model.rowCount()
+        self.row_col_label.setText(f"Rows: {rows}, Columns: {self.model.columnCount()}")
+        # Plotting needs the full page; a lazy page is handed over when the tab is opened
+        if not self.model.is_lazy() or self.tabs.currentIndex() == 1:
+            self.visualization_widget.set_dataframe(self.filtered_df)
+
+    def apply_page_sort(self):
+        if self.page_sort is not None and self.page_sort[0] in self.model_columns():
+            # Filters and resets show new rows; keep them in the order the user chose
+            self.model.sort(self.model_columns().index(self.page_sort[0]), self.page_sort[1])
+
+    def is_page_model(self):
+        """True when the model shows the whole materialized page, so changes can be applied in place"""
+        return (isinstance(self.model, DataFrameModel) and not self.model.is_lazy()
+                and self.model.df is self.model.main_df is self._df)
+
+    def show_rows(self, filtered):
+        """Show a filtered view of the page (search, page query) on the same model"""
+        self.filtered_df = filtered
+        if not isinstance(self.model, DataFrameModel):
+            self.update_table()
+            return
+        self.model.set_frame(self.filtered_df, self.df)
+        self.apply_page_sort()
+        self.update_table_summary()
+
+    def rows_inserted(self, position, count, df):
+        """Show df, the page with count rows inserted at position"""
+        page_model = self.is_page_model()
+        self.df = self.filtered_df = df
+        if page_model:
+            self.model.insert_rows(position, count, df)
+            self.apply_page_sort()
+            self.update_table_summary()
+        else:
+            self.show_rows(df)
+        self.page_stats_changed()
+
+    def rows_removed(self, positions, df):
+        """Show df, the page without the rows at positions"""
+        page_model = self.is_page_model()
+        self.df = self.filtered_df = df
+        if page_model:
+            self.model.remove_rows(positions, df)
+            self.update_table_summary()
+        else:
+            self.show_rows(df)
+        self.page_stats_changed()
+
+    def column_inserted(self, position, df):
+        page_model = self.is_page_model()
+        self.df = self.filtered_df = df
+        if page_model:
+            self.model.insert_column(position, df)
+            self.update_table_summary()
+        else:
+            self.show_rows(df)
+        self.page_stats_changed()
+
+    def column_removed(self, position, df):
+        page_model = self.is_page_model()
+        self.df = self.filtered_df = df
+        if page_model:
+            self.model.remove_column(position, df)
+            self.update_table_summary()
+        else:
+            self.show_rows(df)
+        self.page_stats_changed()
+
+    def model_columns(self):
+        return [self.model.column_name(col) for col in range(self.model.columnCount())]
+
+    def update_sort_indicator(self):
+        """Show the page sort, or the whole-file sort of the current source, on the header"""
+        source = self.current_source()
+        if self.page_sort is not None and not isinstance(self.model, VirtualTableModel):
+            name, order = self.page_sort
+        elif isinstance(source, SortResult):
+            name = source.sort_column
+            order = Qt.SortOrder.DescendingOrder if source.descending else Qt.SortOrder.AscendingOrder
+        else:
+            name, order = None, Qt.SortOrder.AscendingOrder
+        columns = self.model_columns()
+        header = self.table.horizontalHeader()
+        # Setting the indicator would otherwise sort again
+        header.blockSignals(True)
+        header.setSortIndicator(columns.index(name) if name in columns else -1, order)
+        header.blockSignals(False)
+
+    def sort_whole_source(self, name, order):
+        """Sort every row of the file (or query result) by a column with an external merge sort"""
+        source = self.current_source()
+        if source is None or not self.confirm_discard_edits("Sorting the whole file"):
+            return
+        descending = order == Qt.SortOrder.DescendingOrder
+        page_size = self.page_size
+        hint = self.column_hint()
+        pinned = set(self.pinned_columns)
+        sorted_source = {}
+
+        def sort(progress, cancel):
+            sorted_source['result'] = sort_source(source, name, descending, progress=progress, cancel=cancel)
+            return self.read_page(sorted_source['result'], 1, page_size, hint, pinned, progress, cancel)
+
+        def discard():
+            if 'result' in sorted_source:
+                sorted_source['result'].close()
+
+        def finished(page):
+            self.display_page(sorted_source['result'], page, 1)
+            self.status_bar.showMessage(f"Sorted {self.total_rows} rows by {name}", 5000)
+
+        self.start_load(sort, finished, f"Sorting by {name}", on_discarded=discard)
+        # Until the sort finishes the header shows the order on screen
+        self.update_sort_indicator()
+
+    def refresh_stats(self):
+        if self.stats_source_combo.currentIndex() == 1:
+            self.describe_page()
+        else:
+            self.update_stats()
+
+    def page_stats_changed(self):
+        """Redraw the page statistics after an edit; only the columns it touched are recomputed"""
+        if self.stats_source_combo.currentIndex() == 1 and self.page_stats.built:
+            self.show_page_stats()
 
     def update_stats(self):
-        if self.df.empty:
-            self.stats_text.setPlainText("No data loaded.")
+        if self.stats_source_combo.currentIndex() == 1:
+            # Exact page numbers need a full scan, so they are only computed on request
+            if self.page_stats.built:
+                self.show_page_stats()
+            else:
+                self.stats_text.setPlainText("Press Refresh to describe the current page.")
+            return
+        if self.stats_source_combo.currentIndex() == 2:
+            self.show_file_profile()
+            return
+        if self.session is None:
+            self.stats_text.setPlainText("No file statistics available. Switch to the current page to describe it.")
+            return
+        stats = self.session.column_statistics()
+        text = f"File Statistics ({self.session.num_rows} rows, {self.session.num_row_groups} row groups):\n\n"
+        for col, entry in stats.items():
+            text += f"{col}:\n"
+            text += f"  Type: {self.session.schema.field(col).type}\n"
+            text += f"  Min: {'N/A' if entry['min'] is None else entry['min']}\n"
+            text += f"  Max: {'N/A' if entry['max'] is None else entry['max']}\n"
+            text += f"  Nulls: {'N/A' if entry['null_count'] is None else entry['null_count']}\n"
+            if entry['distinct_count'] is not None:
+                prefix = "" if entry['distinct_exact'] else "≤ "
+                text += f"  Distinct: {prefix}{entry['distinct_count']}\n"
+            text += "\n"
+        self.stats_text.setPlainText(text)
+
+    def profile_file(self):
+        """Profile every row group of the file on a worker, or cancel the profile being built"""
+        if self.profile_worker is not None:
+            self.profile_worker.cancel()
+            return
+        session = self.session
+        if session is None:
+            return
+
+        def work(progress, cancel):
+            return open_profile(session, build=True, progress=progress, cancel=cancel)
+
+        worker = Worker(work)
+        self.profile_worker = worker
+
+        def progress(done, total):
+            if worker is self.profile_worker:
+                self.status_bar.showMessage(f"Profiling file... {done / max(total, 1):.0%} "
+                                            f"({done:,} of {total:,} rows)")
+
+        worker.signals.progress.connect(progress)
+        worker.signals.finished.connect(lambda profile: self.on_profile_finished(worker, session, profile))
+        worker.signals.failed.connect(lambda error: self.on_profile_failed(worker, error))
+        worker.signals.cancelled.connect(lambda: self.on_profile_failed(worker, None))
+        self.profile_action.setText("Cancel Profiling")
+        self.status_bar.showMessage("Profiling file...")
+        worker.start()
+
+    def on_profile_finished(self, worker, session, profile):
+        if worker is not self.profile_worker:
+            return
+        self.profile_worker = None
+        self.profile_action.setText("Profile Entire File")
+        if session is not self.session:
             return
-        desc = self.df.describe(include='all')
-        text = "Column Statistics:\n\n"
-        for col in self.df.columns:
+        self.file_profile = profile
+        self.status_bar.showMessage(f"Profiled {session.num_rows:,} rows in {profile.meta['seconds']:.1f}s", 5000)
+        if self.stats_source_combo.currentIndex() == 2:
+            self.show_file_profile()
+        else:
+            self.stats_source_combo.setCurrentIndex(2)
+
+    def on_profile_failed(self, worker, error):
+        if worker is not self.profile_worker:
+            return
+        self.profile_worker = None
+        self.profile_action.setText("Profile Entire File")
+        self.status_bar.showMessage("Profiling cancelled" if error is None else f"Profiling failed: {error}", 5000)
+
+    def show_file_profile(self):
+        profile = self.file_profile
+        if self.session is None or profile is None or not profile.is_current(self.session):
+            self.stats_text.setPlainText("No profile of this file yet. Use View > Profile Entire File "
+                                         "to scan every row group once.")
+            return
+        text = f"File Profile ({profile.meta['num_rows']:,} rows, every row group scanned):\n\n"
+        for col, entry in profile.columns.items():
             text += f"{col}:\n"
-            if col in desc.columns:
-                col_desc = desc[col]
-                text += f"  Count: {col_desc['count']}\n"
-                if pd.api.types.is_numeric_dtype(self.df[col]):
-                    text += f"  Mean: {col_desc.get('mean', 'N/A')}\n"
-                    text += f"  Std: {col_desc.get('std', 'N/A')}\n"
-                    text += f"  Min: {col_desc.get('min', 'N/A')}\n"
-                    text += f"  25%: {col_desc.get('25%', 'N/A')}\n"
-                    text += f"  50%: {col_desc.get('50%', 'N/A')}\n"
-                    text += f"  75%: {col_desc.get('75%', 'N/A')}\n"
-                    text += f"  Max: {col_desc.get('max', 'N/A')}\n"
+            text += f"  Type: {entry['type']}\n"
+            text += f"  Count: {entry['count']:,}\n"
+            text += f"  Nulls: {entry['nulls']:,}\n"
+            text += f"  Min: {'N/A' if entry['min'] is None else entry['min']}\n"
+            text += f"  Max: {'N/A' if entry['max'] is None else entry['max']}\n"
+            if entry.get('mean') is not None:
+                text += f"  Mean: {entry['mean']}\n"
+            if 'distinct' in entry:
+                text += f"  Distinct: ≈ {entry['distinct']:,} (±{entry['distinct_error']:.1%})\n"
+            if 'quantiles' in entry:
+                text += f"  Quantiles (rank ±{entry['quantile_rank_error']:.1%}):\n"
+                for fraction, value in entry['quantiles'].items():
+                    text += f"    {float(fraction):.0%}: {'N/A' if value is None else value}\n"
+            if 'top' in entry:
+                # Below the error bound a count says nothing about how frequent a value is
+                top = [(value, count) for value, count in entry['top'] if count > entry['top_error']]
+                if top:
+                    text += f"  Frequent values (counts may be low by up to {entry['top_error']:,}):\n"
+                    for value, count in top:
+                        text += f"    {value}: {count:,}\n"
                 else:
-                    text += f"  Unique: {col_desc.get('unique', 'N/A')}\n"
-                    text += f"  Top: {col_desc.get('top', 'N/A')}\n"
-                    text += f"  Freq: {col_desc.get('freq', 'N/A')}\n"
+                    text += f"  Frequent values: none stands out (counts known to within {entry['top_error']:,})\n"
+            text += "\n"
+        self.stats_text.setPlainText(text)
+
+    def describe_page(self):
+        df = self.df
+        if df.empty:
+            self.stats_text.setPlainText("No data loaded.")
+            return
+        # One scan now; edits then update the numbers column by column
+        self.page_stats.build(df)
+        self.show_page_stats()
+
+    def show_page_stats(self):
+        df = self.df
+        text = "Column Statistics (current page):\n\n"
+        for col in df.columns:
+            text += f"{col}:\n"
+            entry = self.page_stats.summary(col, df[col])
+            if entry is not None:
+                text += f"  Count: {entry['count']}\n"
+                text += f"  Nulls: {entry['nulls']}\n"
+                if 'mean' in entry:
+                    text += f"  Mean: {entry['mean']}\n"
+                    text += f"  Std: {entry['std']}\n"
+                    text += f"  Min: {'N/A' if entry['min'] is None else entry['min']}\n"
+                    text += f"  Max: {'N/A' if entry['max'] is None else entry['max']}\n"
+                elif 'unique' in entry:
+                    text += f"  Unique: {entry['unique']}\n"
+                    text += f"  Top: {'N/A' if entry['top'] is None else entry['top']}\n"
+                    text += f"  Freq: {'N/A' if entry['freq'] is None else entry['freq']}\n"
             text += "\n"
         self.stats_text.setPlainText(text)
 
     def save_file(self):
         try:
-            if self.current_file_path:
+            # A folder or glob of files can't be overwritten in place, and a page of a query
+            # or sort result must not replace the file it came from; ask for a file instead
+            if self.current_file_path and not is_dataset_path(self.current_file_path) and self.query_result is None:
                 save_parquet(self.df, self.current_file_path)
                 self.undo_stack.setClean()
                 self._manual_dirty = False
                 self.status_bar.showMessage("Saved", 3000)
                 self.update_window_title()
+                self.reopen_saved(self.current_file_path)
                 return True
             else:
                 file_name, _ = QFileDialog.getSaveFileName(self, "Save Parquet File", "", "Parquet Files (*.parquet)")
@@ -621,11 +2209,32 @@ class MainWindow(QMainWindow):
                     self.undo_stack.setClean()
                     self.status_bar.showMessage("Saved", 3000)
                     self.update_window_title()
+                    self.reopen_saved(file_name)
                     return True
         except Exception as e:
             QMessageBox.critical(self, "Save Error", f"Failed to save file: {str(e)}")
         return False
 
+    def has_unsaved_edits(self):
+        return not self.undo_stack.isClean() or self._manual_dirty
+
+    def confirm_discard_edits(self, action):
+        """Whether to go ahead with an action that replaces the page, and with it any unsaved edits"""
+        if not self.has_unsaved_edits():
+            return True
+        confirm = QMessageBox.question(self, "Unsaved Changes",
+                                       f"{action} replaces the current page and discards its unsaved edits. Continue?",
+                                       QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                                       QMessageBox.StandardButton.No)
+        return confirm == QMessageBox.StandardButton.Yes
+
+    def reopen_saved(self, file_name):
+        """Show file_name as just written: the old session was closed by the save, and its
+        cached pages and query results describe rows that are no longer in the file"""
+        self.page_cache.drop_path(file_name)
+        self.result_cache.drop_path(file_name)
+        self.load_data(file_name)
+
     def update_window_title(self, *args):
         try:
             # Atomic safety check for C++ object destruction
@@ -654,7 +2263,12 @@ class MainWindow(QMainWindow):
 
     def new_file(self):
         self.df = pd.DataFrame()
-        self.original_df = None
+        self.page = None
+        self.session = None
+        self.session_column_info = {}
+        self.schema_metadata = SchemaMetadata()
+        self.page_stats = PageStatistics()
+        self.set_query_result(None)
         self.filtered_df = self.df
         self.current_file_path = None
         self.undo_stack.clear()
@@ -678,23 +2292,113 @@ class MainWindow(QMainWindow):
                 self.status_bar.showMessage("Exported")
 
     def execute_query(self):
+        if self.query_running():
+            # The Execute button turns into Cancel while a query runs
+            self.cancel_load()
+            return
         query = self.query_edit.text().strip()
         if not query:
             return
+        if is_sql(query):
+            self.execute_sql(query)
+            return
+        if self.session is not None:
+            session = self.session
+            try:
+                # Checked here so unsupported syntax falls back to the page straight away
+                to_arrow_filter(query, session.columns)
+            except UnsupportedQuery as e:
+                fallback_reason = str(e)
+            else:
+                # Filter the whole file with the query pushed down into the Parquet scan
+                self.run_source_query(lambda progress, cancel: run_query(session, query, progress=progress, cancel=cancel),
+                                      result_key(session, 'query', query), "Running query", self.query_failed)
+                return
+        if not self.can_edit_page():
+            return
         try:
             # Use pandas query method for filtering
             # Example: column_name > 100, column_name == 'value'
             result = self.df.query(query)
-            self.filtered_df = result
-            self.update_table()
-            self.status_bar.showMessage("Query executed")
+            self.show_rows(result)
+            if self.session is not None:
+                self.status_bar.showMessage(f"Query executed on the current page only ({fallback_reason})")
+            else:
+                self.status_bar.showMessage("Query executed")
         except Exception as e:
             QMessageBox.warning(self, "Query Error", f"Invalid pandas query: {str(e)}\n\nExample: column_name > 100 or column_name == 'value'")
 
+    def execute_sql(self, query):
+        """Run SQL against the whole file; the result is paged like a filter result"""
+        if self.session is None:
+            self.status_bar.showMessage("Open a file to run SQL against it", 5000)
+            return
+        session = self.session
+        self.run_source_query(lambda progress, cancel: run_sql(session, query, progress=progress, cancel=cancel),
+                              result_key(session, 'sql', query), "Running SQL", self.sql_failed)
+
+    def query_running(self):
+        return self.query_worker is not None and self.query_worker is self.load_worker
+
+    def run_source_query(self, run, key, label, on_failed):
+        """Run a whole-file query on a worker, then decode the first page of its result
+
+        A result cached under key is reused instead of running the query again.
+        The rows on screen stay until the page is ready; cancelling or starting
+        another load drops a new result instead.
+        """
+        if not self.confirm_discard_edits("Running the query on the whole file"):
+            return
+        page_size = self.page_size
+        hint = self.column_hint()
+        pinned = set(self.pinned_columns)
+        cached = self.result_cache.get(key)
+        query_result = {}
+
+        def query(progress, cancel):
+            query_result['result'] = cached if cached is not None else run(progress, cancel)
+            return self.read_page(query_result['result'], 1, page_size, hint, pinned, progress, cancel)
+
+        def discard():
+            if 'result' in query_result:
+                self.result_cache.release(query_result['result'])
+
+        def finished(page):
+            result = query_result['result']
+            self.result_cache.put(key, result)
+            self.display_page(result, page, 1)
+            cache = self.result_cache.stats()
+            origin = " (from the result cache)" if cached is not None else ""
+            self.status_bar.showMessage(f"Query matched {self.total_rows} rows{origin} | "
+                                        f"Result cache: {cache['hits']} hits, {cache['misses']} misses", 5000)
+
+        self.start_load(query, finished, label, on_discarded=discard, on_failed=on_failed,
+                        total_row_groups=len(self.session.row_group_offsets) - 1)
+        self.query_worker = self.load_worker
+        self.query_button.setText("Cancel")
+
+    def query_failed(self, error):
+        QMessageBox.warning(self, "Query Error", f"Query failed: {str(error)}")
+        self.status_bar.showMessage("Query failed", 5000)
+
+    def sql_failed(self, error):
+        if isinstance(error, SqlUnavailable):
+            QMessageBox.warning(self, "SQL Unavailable", str(error))
+            return
+        QMessageBox.warning(self, "SQL Error", f"Query failed: {str(error)}\n\nThe open file is the table 'current', "
+                                               "e.g. SELECT * FROM current LIMIT 10")
+        self.status_bar.showMessage("Query failed", 5000)
+
     def reset_data(self):
-        if self.original_df is not None:
-            self.df = self.original_df.copy()
+        if self.query_result is not None:
+            self.show_page(page_number=1, source=self.session)
+            self.search_edit.clear()
+            self.query_edit.clear()
+        elif self.page is not None:
+            # The page keeps its decoded columns untouched by edits
+            self.df = self.page.to_pandas()
             self.filtered_df = self.df
+            self.page_stats = PageStatistics()
             self.update_table()
             self.search_edit.clear()
             self.query_edit.clear()
@@ -723,22 +2427,42 @@ class MainWindow(QMainWindow):
         delete_col_act = QAction("Delete Selected Column(s)", self)
         delete_col_act.triggered.connect(self.delete_selected_columns)
         menu.addAction(delete_col_act)
+
+        if self.model is not None and self.model.columnCount() > 0:
+            col = self.table.horizontalHeader().logicalIndexAt(pos)
+            if col >= 0:
+                pinned = self.model.column_name(col) in self.pinned_columns
+                pin_col_act = QAction("Unpin Column" if pinned else "Pin Column", self)
+                pin_col_act.setToolTip("Pinned columns are always decoded, even when scrolled out of view")
+                pin_col_act.triggered.connect(lambda: self.toggle_pinned_columns([col]))
+                menu.addAction(pin_col_act)
+                name = self.model.column_name(col)
+                for label, order in (("Sort Whole File Ascending", Qt.SortOrder.AscendingOrder),
+                                     ("Sort Whole File Descending", Qt.SortOrder.DescendingOrder)):
+                    sort_act = QAction(label, self)
+                    sort_act.setToolTip("Sort every row, not just this page; large files are sorted on disk")
+                    sort_act.triggered.connect(lambda _, order=order: self.sort_whole_source(name, order))
+                    menu.addAction(sort_act)
         
         menu.exec(self.table.horizontalHeader().viewport().mapToGlobal(pos))
 
     def add_row(self):
+        if not self.can_edit_page():
+            return
         selection = self.table.selectionModel().selectedRows()
-        row_idx = selection[0].row() if selection else len(self.df)
+        row_idx = self.model.source_row(selection[0].row()) if selection else len(self.df)
         command = AddRowCommand(self, row_idx)
         self.undo_stack.push(command)
         self._manual_dirty = True
         self.update_window_title()
 
     def delete_selected_rows(self):
+        if not self.can_edit_page():
+            return
         selection = self.table.selectionModel().selectedRows()
         if not selection:
             return
-        row_indices = [idx.row() for idx in selection if idx.row() < len(self.df)]
+        row_indices = [self.model.source_row(idx.row()) for idx in selection if idx.row() < len(self.df)]
         if not row_indices:
             return
             
@@ -752,6 +2476,8 @@ class MainWindow(QMainWindow):
             self.update_window_title()
 
     def add_column(self):
+        if not self.can_edit_page():
+            return
         name, ok = QInputDialog.getText(self, "Add Column", "Column Name:")
         if ok and name:
             if name in self.df.columns:
@@ -767,6 +2493,8 @@ class MainWindow(QMainWindow):
                 self.update_window_title()
 
     def delete_selected_columns(self):
+        if not self.can_edit_page():
+            return
         selection = self.table.selectionModel().selectedColumns()
         if not selection:
             # Check if cells are selected and get columns from them
@@ -831,6 +2559,18 @@ class MainWindow(QMainWindow):
 
     def _safe_disconnect(self):
         """Safely disconnect signals before destruction"""
+        self.cancel_load()
+        self.cancel_search()
+        if self.index_worker is not None:
+            self.index_worker.cancel()
+        if self.profile_worker is not None:
+            self.profile_worker.cancel()
+        if isinstance(self.model, VirtualTableModel):
+            self.model.cancel()
+        self.prefetcher.shutdown()
+        # Query and sort results delete their spill files
+        self.set_query_result(None)
+        self.result_cache.clear()
         try:
             self.undo_stack.cleanChanged.disconnect()
             self.undo_stack.indexChanged.disconnect()
@@ -0,0 +1,47 @@
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from data.parquet_handler import Cancelled
+
+class WorkerSignals(QObject):
+    """Signals of a Worker; created on the UI thread so slots run there"""
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    cancelled = pyqtSignal()
+    progress = pyqtSignal(object, object)
+
+class Worker(QRunnable):
+    """Runs fn(*args, progress=..., cancel=...) on the global QThreadPool.
+
+    fn reports progress by calling progress(a, b) and should check the cancel
+    threading.Event between units of work, raising Cancelled when it is set.
+    """
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        # The caller keeps the worker alive until a result signal arrives
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self.cancel_event = threading.Event()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, progress=self.signals.progress.emit, cancel=self.cancel_event, **self.kwargs)
+        except Cancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(e)
+        else:
+            if self.cancel_event.is_set():
+                self.signals.cancelled.emit()
+            else:
+                self.signals.finished.emit(result)
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def start(self):
+        QThreadPool.globalInstance().start(self)
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+# Rows serialized per step when copying, so a large copy never holds one string per row
+CHUNK_ROWS = 65536
+# Pasted text that stands for a missing value in non-text columns; 'None' is how nulls are copied
+MISSING_TEXT = ('', 'None', 'nan', 'NaN', '<NA>', 'NaT')
+
+def to_tsv(columns, chunk_rows=CHUNK_ROWS):
+    """Tab-separated text of equally long columns of strings, built a chunk of rows at a time."""
+    num_rows = len(columns[0]) if columns else 0
+    chunks = []
+    for start in range(0, num_rows, chunk_rows):
+        rows = zip(*(column[start:start + chunk_rows] for column in columns))
+        chunks.append("".join("\t".join(row) + "\n" for row in rows))
+    return "".join(chunks)
+
+def parse_tsv(text):
+    """Rows of cells from tab-separated text; short rows are padded so the block is rectangular."""
+    lines = text.replace('\r\n', '\n').split('\n')
+    if lines and lines[-1] == '':
+        lines.pop()
+    rows = [line.split('\t') for line in lines]
+    width = max((len(row) for row in rows), default=0)
+    return [row + [''] * (width - len(row)) for row in rows]
+
+def coerce_texts(texts, dtype):
+    """Pasted text as values of a column's dtype, converted in one pass.
+
+    Raises ValueError when some text doesn't fit the dtype. Text columns keep the
+    text as it is; unseen values for a categorical column become new categories.
+    """
+    values = pd.Series(list(texts), dtype=object)
+    if isinstance(dtype, pd.CategoricalDtype):
+        dtype = dtype.categories.dtype
+    missing = values.isin(MISSING_TEXT)
+    if pd.api.types.is_bool_dtype(dtype):
+        lowered = values.str.lower()
+        if not lowered.isin(['true', 'false']).all():
+            raise ValueError(f"expected True or False, got {values[~lowered.isin(['true', 'false'])].iloc[0]!r}")
+        return (lowered == 'true').to_numpy()
+    if pd.api.types.is_integer_dtype(dtype):
+        numbers = pd.to_numeric(values.mask(missing, np.nan))
+        if isinstance(dtype, np.dtype) and missing.any():
+            raise ValueError("empty value in an integer column")
+        if (numbers.dropna() % 1 != 0).any():
+            raise ValueError("expected whole numbers")
+        return numbers.astype(dtype).to_numpy()
+    if pd.api.types.is_float_dtype(dtype):
+        return pd.to_numeric(values.mask(missing, np.nan)).astype(dtype).to_numpy()
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return pd.to_datetime(values.mask(missing, None)).to_numpy()
+    return values.to_numpy()
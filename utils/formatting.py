@@ -0,0 +1,118 @@
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Cells longer than this are truncated in the table and shown in full in the tooltip
+MAX_DISPLAY_CHARS = 50
+BLOCK_ROWS = 256
+# Rows whose formatted text decides a column's initial width
+WIDTH_SAMPLE_ROWS = 64
+
+def format_values(values):
+    """Full display text for a block of one column (Arrow array or pandas Series), in one pass."""
+    if isinstance(values, (pa.Array, pa.ChunkedArray)):
+        return _format_arrow(values)
+    return _format_series(values)
+
+def _format_arrow(values):
+    if pa.types.is_dictionary(values.type):
+        values = values.dictionary_decode() if isinstance(values, pa.Array) else pc.cast(values, values.type.value_type)
+    value_type = values.type
+    if pa.types.is_floating(value_type):
+        # numpy prints floats like Python does (3.0, 1e-07, nan); nulls become nan as in pandas
+        return values.to_numpy(zero_copy_only=False).astype(str).tolist()
+    if pa.types.is_boolean(value_type):
+        text = pc.if_else(values, 'True', 'False')
+    elif pa.types.is_string(value_type) or pa.types.is_large_string(value_type):
+        text = values
+    elif pa.types.is_integer(value_type) or pa.types.is_decimal(value_type):
+        text = pc.cast(values, pa.string())
+    else:
+        # Temporal, binary and nested values keep Python's formatting
+        return [str(value) for value in values.to_pylist()]
+    return pc.fill_null(text, 'None').to_pylist()
+
+def _format_series(values):
+    dtype = values.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in 'biuf':
+        return values.to_numpy().astype(str).tolist()
+    return [str(value) for value in values.tolist()]
+
+def is_numeric(dtype):
+    """Whether a column of this Arrow type or pandas dtype holds numbers (not booleans)."""
+    if isinstance(dtype, pa.DataType):
+        if pa.types.is_dictionary(dtype):
+            dtype = dtype.value_type
+        return pa.types.is_integer(dtype) or pa.types.is_floating(dtype) or pa.types.is_decimal(dtype)
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+def sample_rows(num_rows, size=WIDTH_SAMPLE_ROWS):
+    """Sorted positions of up to size rows spread at random over num_rows; the same on every call."""
+    if num_rows <= size:
+        return np.arange(num_rows)
+    return np.sort(np.random.default_rng(0).choice(num_rows, size, replace=False))
+
+def format_bytes(size):
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+def truncate(text, width=MAX_DISPLAY_CHARS):
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+class FormattedCellCache:
+    """Display text for table cells, formatted BLOCK_ROWS rows of one column at a time.
+
+    fetch(col, start, stop) returns the raw values of a block. Blocks are kept in
+    an LRU; an edit only drops the edited cell, which is re-formatted on its own.
+    """
+    def __init__(self, fetch, block_rows=BLOCK_ROWS, max_blocks=4096):
+        self.fetch = fetch
+        self.block_rows = block_rows
+        self.max_blocks = max_blocks
+        self._blocks = OrderedDict()
+
+    def _block(self, row, col):
+        key = (col, row // self.block_rows)
+        block = self._blocks.get(key)
+        if block is None:
+            start = key[1] * self.block_rows
+            full = format_values(self.fetch(col, start, start + self.block_rows))
+            block = (full, [truncate(text) for text in full])
+            self._blocks[key] = block
+            if len(self._blocks) > self.max_blocks:
+                self._blocks.popitem(last=False)
+        else:
+            self._blocks.move_to_end(key)
+        index = row % self.block_rows
+        if block[0][index] is None:
+            block[0][index] = format_values(self.fetch(col, row, row + 1))[0]
+            block[1][index] = truncate(block[0][index])
+        return block, index
+
+    def has_block(self, row, col):
+        return (col, row // self.block_rows) in self._blocks
+
+    def full_text(self, row, col):
+        block, index = self._block(row, col)
+        return block[0][index]
+
+    def display_text(self, row, col):
+        block, index = self._block(row, col)
+        return block[1][index]
+
+    def invalidate_cell(self, row, col):
+        block = self._blocks.get((col, row // self.block_rows))
+        if block is not None:
+            block[0][row % self.block_rows] = None
+
+    def discard_block(self, row, col):
+        self._blocks.pop((col, row // self.block_rows), None)
+
+    def clear(self):
+        self._blocks.clear()
@@ -0,0 +1,26 @@
+import time
+from collections import deque
+
+class FrameTimer:
+    """Rolling statistics of how long the last frames took to paint."""
+    def __init__(self, frames=120):
+        self.times = deque(maxlen=frames)
+        self._start = None
+
+    def start(self):
+        self._start = time.perf_counter()
+
+    def stop(self):
+        if self._start is not None:
+            self.times.append(time.perf_counter() - self._start)
+            self._start = None
+
+    def reset(self):
+        self.times.clear()
+
+    def stats(self):
+        """Last, mean and worst frame time in milliseconds, or None before the first frame."""
+        if not self.times:
+            return None
+        return {'frames': len(self.times), 'last_ms': self.times[-1] * 1000,
+                'mean_ms': sum(self.times) / len(self.times) * 1000, 'max_ms': max(self.times) * 1000}